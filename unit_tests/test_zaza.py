@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# import aiounittest
+import asyncio
 
 
 # Prior to Python 3.8 asyncio would raise a ``asyncio.futures.TimeoutError``
@@ -61,3 +61,117 @@ class TestModel(ut_utils.BaseTestCase):
             self.assertEqual(zaza.run(), None)
             self.assertEqual(zaza.run(num4), 4)
             self.assertEqual(zaza.run(num4()), 4)
+
+    def test_libjuju_thread_lifecycle(self):
+        zaza.clean_up_libjuju_thread()
+        thread = zaza.get_or_create_libjuju_thread()
+        self.assertTrue(thread.is_alive())
+        self.assertTrue(zaza._libjuju_loop.is_running())
+        self.assertIs(zaza.get_or_create_libjuju_thread(), thread)
+
+        async def _forever():
+            await asyncio.sleep(3600)
+
+        async def _spawn():
+            return asyncio.ensure_future(_forever())
+
+        # a task left pending on the loop is cancelled on shutdown
+        task = zaza.sync_wrapper(_spawn)()
+        loop = zaza._libjuju_loop
+        zaza.join_libjuju_thread()
+        self.assertTrue(loop.is_closed())
+        self.assertTrue(task.cancelled())
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(zaza._libjuju_thread)
+        zaza.clean_up_libjuju_thread()
+        self.assertIsNone(zaza._libjuju_loop)
+
+    def test_get_or_create_libjuju_thread_start_timeout(self):
+        zaza.clean_up_libjuju_thread()
+        with mock.patch.object(zaza, '_libjuju_loop_started') as started, \
+                mock.patch.object(zaza.threading, 'Thread') as thread:
+            started.wait.return_value = False
+            with self.assertRaises(RuntimeError):
+                zaza.get_or_create_libjuju_thread()
+            thread.return_value.start.assert_called_once_with()
+            started.wait.assert_called_once_with(zaza.LOOP_START_TIMEOUT)
+        zaza._libjuju_thread = None
+
+    def test_gather_sync(self):
+        async def value(v, delay=0):
+            await asyncio.sleep(delay)
+            return v
+
+        async def fail():
+            raise ValueError("boom")
+
+        async def three():
+            return 3
+
+        self.assertEqual(zaza.gather_sync(), [])
+        self.assertEqual(
+            zaza.gather_sync(value(1, 0.02), value(2), three),
+            [1, 2, 3])
+        with self.assertRaises(ValueError):
+            zaza.gather_sync(value(1), fail())
+        results = zaza.gather_sync(
+            value(1), fail(), value(2, 10), timeout=0.05,
+            return_exceptions=True)
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsInstance(results[2], AsyncTimeoutError)
+
+    def test_gather_sync_not_in_thread(self):
+        async def value(v):
+            return v
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            self.assertEqual(zaza.gather_sync(value(1), value(2)), [1, 2])
+
+    def test_sync_batch(self):
+        async def value(v, delay=0):
+            await asyncio.sleep(delay)
+            return v
+
+        with zaza.sync_batch(timeout=10, return_exceptions=True) as batch:
+            self.assertEqual(batch.add(value(1)), 0)
+            self.assertEqual(batch.add(value(2, 10), timeout=0.05), 1)
+            self.assertEqual(len(batch), 2)
+        self.assertIsInstance(batch.results[1], AsyncTimeoutError)
+        self.assertEqual(batch.results[0], 1)
+        with self.assertRaises(RuntimeError):
+            batch.add(value(3))
+
+    def test_sync_batch_raises(self):
+        async def value(v):
+            return v
+
+        with self.assertRaises(AsyncTimeoutError):
+            with zaza.sync_batch(timeout=0.05) as batch:
+                batch.add(asyncio.sleep(10))
+        # an exception in the body discards the calls without running them
+        call = value(1)
+        with self.assertRaises(KeyError):
+            with zaza.sync_batch() as batch:
+                batch.add(call)
+                raise KeyError()
+        self.assertIsNone(batch.results)
+        self.assertEqual(len(batch), 0)
+
+    def test_sync_wrapper_not_in_thread_reuses_loop(self):
+        async def get_loop():
+            return asyncio.get_event_loop()
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            loop = zaza.sync_wrapper(get_loop)()
+            self.assertIs(loop, zaza._libjuju_local_loop)
+            self.assertIs(asyncio.get_event_loop(), loop)
+            self.assertIs(zaza.sync_wrapper(get_loop)(), loop)
+            self.assertFalse(loop.is_closed())
+            zaza.clean_up_libjuju_thread()
+            self.assertTrue(loop.is_closed())
+            self.assertIsNone(zaza._libjuju_local_loop)
+            # a new loop is created if needed after cleaning up
+            new_loop = zaza.sync_wrapper(get_loop)()
+            self.assertIsNot(new_loop, loop)
+            zaza.clean_up_libjuju_thread()
@@ -331,8 +331,11 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
         self.TemporaryDirectory.return_value = enter_mock
         self.patch_object(lc_deploy, 'render_overlays')
         self.patch_object(lc_deploy.utils, 'check_output_logging')
+        self.check_output_logging.return_value = (
+            lc_deploy.utils.CommandOutputMetrics(duration=1.0, lines=2))
+        self.patch_object(lc_deploy.run_report, 'register_metric')
         self.render_overlays.return_value = []
-        lc_deploy.deploy_bundle(
+        metrics = lc_deploy.deploy_bundle(
             './tests/bundles/bionic.yaml',
             'newmodel',
             force=True)
@@ -340,7 +343,23 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
             './tests/bundles/bionic.yaml', '/tmp/mytmpdir', model_ctxt=None)
         self.check_output_logging.assert_called_once_with(
             ['juju', 'deploy', '-m', 'newmodel', '--force',
-             './tests/bundles/bionic.yaml'])
+             './tests/bundles/bionic.yaml'],
+            line_callback=mock.ANY)
+        self.assertEqual(metrics.lines, 2)
+        self.register_metric.assert_called_once_with(
+            'Deploy Bundle newmodel',
+            {'duration': 1.0, 'lines': 2})
+
+    def test__log_deploy_output_event(self):
+        self.patch_object(lc_deploy.zaza.events,
+                          'get_global_event_logger_instance')
+        events = mock.MagicMock()
+        self.get_global_event_logger_instance.return_value = events
+        lc_deploy._log_deploy_output_event('newmodel', 'Deploy of bundle')
+        events.log.assert_called_once_with(
+            lc_deploy.Events.COMMENT,
+            item='newmodel',
+            comment='Deploy of bundle')
 
     def test_deploy_bundle_with_trust(self):
         self.patch_object(lc_deploy.utils, 'get_charm_config')
@@ -351,6 +370,8 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
         self.TemporaryDirectory.return_value = enter_mock
         self.patch_object(lc_deploy, 'render_overlays')
         self.patch_object(lc_deploy.utils, 'check_output_logging')
+        self.check_output_logging.return_value = (
+            lc_deploy.utils.CommandOutputMetrics(duration=1.0, lines=2))
         self.render_overlays.return_value = []
         lc_deploy.deploy_bundle(
             './tests/bundles/bionic.yaml',
@@ -358,7 +379,8 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
             force=True, trust=True)
         self.check_output_logging.assert_called_once_with(
             ['juju', 'deploy', '-m', 'newmodel', '--force',
-             '--trust', './tests/bundles/bionic.yaml'])
+             '--trust', './tests/bundles/bionic.yaml'],
+            line_callback=mock.ANY)
 
     def test_deploy_bundle_template(self):
         self.patch_object(lc_deploy.utils, 'get_charm_config')
@@ -375,6 +397,8 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
         self.TemporaryDirectory.return_value = enter_mock
         self.patch_object(lc_deploy, 'render_overlays')
         self.patch_object(lc_deploy.utils, 'check_output_logging')
+        self.check_output_logging.return_value = (
+            lc_deploy.utils.CommandOutputMetrics(duration=1.0, lines=2))
         self.render_overlays.return_value = []
         lc_deploy.deploy_bundle(
             './tests/bundles/bionic.yaml',
@@ -384,7 +408,8 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
             '/tmp/mytmpdir/bionic.yaml', '/tmp/mytmpdir', model_ctxt=None)
         self.check_output_logging.assert_called_once_with(
             ['juju', 'deploy', '-m', 'newmodel', '--force',
-             '/tmp/mytmpdir/bionic.yaml'])
+             '/tmp/mytmpdir/bionic.yaml'],
+            line_callback=mock.ANY)
         self.get_template.assert_called_once_with(
             './tests/bundles/bionic.yaml',
             template_dir='./tests/bundles')
@@ -480,6 +505,27 @@ class TestCharmLifecycleDeploy(ut_utils.BaseTestCase):
             max_resolve_count=3,
             ignore_hard_errors=False)
 
+    def test_deploy_concurrent(self):
+        self.patch_object(lc_deploy.zaza.model, 'wait_for_application_states')
+        self.patch_object(lc_deploy.zaza.model, 'set_juju_model')
+        self.patch_object(lc_deploy.utils, 'get_charm_config')
+        self.get_charm_config.return_value = {}
+        self.patch_object(lc_deploy, 'deploy_bundle')
+        self.patch_object(lc_deploy.run_report, 'register_event_start')
+        self.patch_object(lc_deploy.run_report, 'register_event_finish')
+        lc_deploy.deploy('bun.yaml', 'newmodel', concurrent=True)
+        self.assertFalse(self.set_juju_model.called)
+        self.wait_for_application_states.assert_called_once_with(
+            'newmodel',
+            {},
+            timeout=3600,
+            max_resolve_count=0,
+            ignore_hard_errors=False)
+        events = [mock.call('Deploy Bundle newmodel'),
+                  mock.call('Wait for Deployment newmodel')]
+        self.register_event_start.assert_has_calls(events)
+        self.register_event_finish.assert_has_calls(events)
+
     def test_deploy_nowait(self):
         self.patch_object(lc_deploy.zaza.model, 'wait_for_application_states')
         self.patch_object(lc_deploy, 'deploy_bundle')
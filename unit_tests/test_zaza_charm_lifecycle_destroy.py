@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+
 import zaza.charm_lifecycle.destroy as lc_destroy
 import unit_tests.utils as ut_utils
 
@@ -27,6 +29,7 @@ class TestCharmLifecycleDestroy(ut_utils.BaseTestCase):
         self.patch("zaza.utilities.openstack_provider.clean_up_instances",
                    name='clean_up_instances')
         lc_destroy.destroy('doomed')
+        self.get_status.assert_called_once_with(model_name='doomed')
         self.destroy_model.assert_called_once_with('doomed')
         self.clean_up_instances.assert_not_called()
 
@@ -43,6 +46,30 @@ class TestCharmLifecycleDestroy(ut_utils.BaseTestCase):
         self.clean_up_instances.assert_called_once_with(
             'doomed', 'the-machines')
 
+    def test_destroy_models(self):
+        self.patch_object(lc_destroy, 'destroy')
+        lc_destroy.destroy_models(['m1', 'm2', 'm3'])
+        self.assertEqual(
+            sorted(c[0][0] for c in self.destroy.call_args_list),
+            ['m1', 'm2', 'm3'])
+
+    def test_destroy_models_failure(self):
+        def _destroy(model_name):
+            if model_name == 'm1':
+                raise Exception("boom")
+
+        self.patch_object(lc_destroy, 'destroy', side_effect=_destroy)
+        with self.assertRaises(Exception):
+            lc_destroy.destroy_models(['m1', 'm2'])
+        # all the models were still attempted
+        self.assertEqual(self.destroy.call_count, 2)
+
+    def test_destroy_models_not_in_thread(self):
+        self.patch_object(lc_destroy, 'destroy')
+        self.patch_object(lc_destroy.zaza, 'RUN_LIBJUJU_IN_THREAD', new=False)
+        lc_destroy.destroy_models(['m1', 'm2'])
+        self.destroy.assert_has_calls([mock.call('m1'), mock.call('m2')])
+
     def test_parser(self):
         args = lc_destroy.parse_args(['-m', 'doomed'])
         self.assertEqual(args.model_name, 'doomed')
@@ -47,6 +47,12 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
         self.assertEqual(args.bundles, ['mybundle', 'mybundle2'])
         args = lc_func_test_runner.parse_args(['--log', 'DEBUG'])
         self.assertEqual(args.loglevel, 'DEBUG')
+        self.assertFalse(lc_func_test_runner.parse_args([]).concurrent_models)
+        args = lc_func_test_runner.parse_args(['--concurrent-models'])
+        self.assertTrue(args.concurrent_models)
+        self.assertEqual(lc_func_test_runner.parse_args([]).jobs, 1)
+        args = lc_func_test_runner.parse_args(['--jobs', '4'])
+        self.assertEqual(args.jobs, 4)
         args = lc_func_test_runner.parse_args(['-f'])
         self.assertTrue(args.force)
         args = lc_func_test_runner.parse_args(['--force'])
@@ -86,11 +92,11 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
             mock.call(cwd + '/tests/bundles/bundle1.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'},
                       force=True, test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False),
+                      ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(cwd + '/tests/bundles/bundle2.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'},
                       force=True, test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False)]
+                      ignore_hard_deploy_errors=False, concurrent=False)]
         configure_calls = [
             mock.call('newmodel', [
                 'zaza.charm_tests.mycharm.setup.basic_setup'
@@ -166,23 +172,23 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
             mock.call(cwd + '/tests/bundles/bundle1.yaml', 'm1',
                       model_ctxt={'default_alias': 'm1'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False),
+                      ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(cwd + '/tests/bundles/bundle2.yaml', 'm2',
                       model_ctxt={'default_alias': 'm2'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False),
+                      ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(
                 cwd + '/tests/bundles/bundle5.yaml',
                 'm3',
                 model_ctxt={'model_alias_5': 'm3', 'model_alias_6': 'm4'},
                 force=False, test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False),
+                ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(
                 cwd + '/tests/bundles/bundle6.yaml',
                 'm4',
                 model_ctxt={'model_alias_5': 'm3', 'model_alias_6': 'm4'},
                 force=False, test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False)]
+                ignore_hard_deploy_errors=False, concurrent=False)]
         configure_calls = [
             mock.call('m1', [
                 'zaza.charm_tests.mycharm.setup.basic_setup',
@@ -258,11 +264,11 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
             mock.call(cwd + '/tests/bundles/bundle1.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False),
+                      ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(cwd + '/tests/bundles/bundle2.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False)]
+                      ignore_hard_deploy_errors=False, concurrent=False)]
         before_deploy_calls = [
             mock.call('newmodel', [
                 'zaza.charm_tests.prepare.first',
@@ -290,6 +296,160 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
         self.test.assert_has_calls(test_calls)
         self.destroy.assert_has_calls(destroy_calls)
 
+    def _run_env_deployment_mocks(self):
+        self.patch_object(lc_func_test_runner.utils, 'get_charm_config',
+                          return_value={})
+        self.patch_object(lc_func_test_runner.utils, 'run_concurrently',
+                          side_effect=lambda f, items: [f(i) for i in items])
+        self.patch_object(lc_func_test_runner.prepare, 'prepare')
+        self.patch_object(lc_func_test_runner.before_deploy, 'before_deploy')
+        self.patch_object(lc_func_test_runner.deploy, 'deploy')
+        self.patch_object(lc_func_test_runner.configure, 'configure')
+        self.patch_object(lc_func_test_runner.test, 'test')
+        self.patch_object(lc_func_test_runner.destroy, 'destroy')
+        self.patch_object(lc_func_test_runner.run_report,
+                          'register_event_start')
+        self.patch_object(lc_func_test_runner.run_report,
+                          'register_event_finish')
+        self.patch_object(
+            lc_func_test_runner.zaza.model,
+            'block_until_all_units_idle')
+
+    def test_run_env_deployment_concurrent_models(self):
+        self._run_env_deployment_mocks()
+        env_deployment = lc_func_test_runner.utils.EnvironmentDeploy(
+            'default1',
+            [lc_func_test_runner.utils.ModelDeploy('a1', 'm1', 'bundle1'),
+             lc_func_test_runner.utils.ModelDeploy('a2', 'm2', 'bundle2')],
+            True, unordered=True)
+        lc_func_test_runner.run_env_deployment(
+            env_deployment, concurrent_models=True)
+        # prepare, deploy, settle and destroy are run concurrently
+        self.assertEqual(self.run_concurrently.call_count, 4)
+        self.prepare.assert_has_calls([
+            mock.call('m1', 'a1', test_directory=None),
+            mock.call('m2', 'a2', test_directory=None)])
+        self.block_until_all_units_idle.assert_has_calls([
+            mock.call(ignore_hard_errors=False, model_name='m1'),
+            mock.call(ignore_hard_errors=False, model_name='m2')])
+        self.assertEqual(self.deploy.call_count, 2)
+        for call in self.deploy.call_args_list:
+            self.assertTrue(call[1]['concurrent'])
+        self.configure.assert_has_calls([
+            mock.call('m1', [], test_directory=None),
+            mock.call('m2', [], test_directory=None)])
+        phases = [mock.call('Prepare Models'), mock.call('Deploy Models'),
+                  mock.call('Settle Models')]
+        self.register_event_start.assert_has_calls(phases)
+        self.register_event_finish.assert_has_calls(phases)
+
+    def test_run_env_deployment_concurrent_models_ordered(self):
+        self._run_env_deployment_mocks()
+        env_deployment = lc_func_test_runner.utils.EnvironmentDeploy(
+            'env1',
+            [lc_func_test_runner.utils.ModelDeploy('a1', 'm1', 'bundle1'),
+             lc_func_test_runner.utils.ModelDeploy('a2', 'm2', 'bundle2')],
+            True)
+        lc_func_test_runner.run_env_deployment(
+            env_deployment, concurrent_models=True)
+        # only destroying the models is done concurrently
+        self.run_concurrently.assert_called_once_with(
+            self.destroy, mock.ANY)
+        self.assertEqual(self.deploy.call_count, 2)
+        for call in self.deploy.call_args_list:
+            self.assertFalse(call[1]['concurrent'])
+
+    def test_func_test_runner_jobs(self):
+        self.patch_object(lc_func_test_runner.utils, 'get_charm_config')
+        self.patch_object(lc_func_test_runner.utils, 'generate_model_name')
+        self.patch_object(lc_func_test_runner, 'run_env_deployment')
+        self.patch_object(lc_func_test_runner,
+                          'run_env_deployments_in_parallel')
+        self.generate_model_name.return_value = 'newmodel'
+        self.get_charm_config.return_value = {
+            'charm_name': 'mycharm',
+            'gate_bundles': ['bundle1', 'bundle2']}
+        lc_func_test_runner.func_test_runner(jobs=2, keep_last_model=True)
+        self.run_env_deployment.assert_not_called()
+        (env_deployments, jobs), kwargs = (
+            self.run_env_deployments_in_parallel.call_args)
+        self.assertEqual(jobs, 2)
+        self.assertEqual(
+            [(e.model_deploys[0].bundle, keep) for e, keep in env_deployments],
+            [('bundle1', lc_func_test_runner.DESTROY_MODEL),
+             ('bundle2', lc_func_test_runner.KEEP_MODEL)])
+        self.assertEqual(
+            kwargs,
+            {'test_directory': None, 'force': False, 'trust': False,
+             'concurrent_models': False})
+
+    def test_run_env_deployments_in_parallel(self):
+        self.patch_object(lc_func_test_runner.multiprocessing, 'get_context',
+                          return_value=mock.MagicMock())
+        self.patch_object(lc_func_test_runner.run_report, 'register_event')
+        self.patch_object(lc_func_test_runner.run_report, 'register_metric')
+        pool = self.get_context.return_value.Pool.return_value.__enter__\
+            .return_value
+        pool.starmap.return_value = [
+            {'name': 'env1', 'error': None,
+             'events': {'Deploy Models': {'Start': 1.0, 'Finish': 2.0}},
+             'metrics': {'Deploy Bundle m1': {'duration': 1.0, 'lines': 2}}},
+            {'name': 'env2', 'error': 'ModelTimeout: too slow',
+             'events': {}, 'metrics': {}}]
+        with self.assertRaises(
+                lc_func_test_runner.zaza_exceptions.EnvironmentDeploysFailed):
+            lc_func_test_runner.run_env_deployments_in_parallel(
+                [('env1', 0), ('env2', 1)], 2, test_directory='tests',
+                force=True)
+        self.get_context.assert_called_once_with('spawn')
+        self.get_context.return_value.Pool.assert_called_once_with(
+            processes=2, maxtasksperchild=1)
+        worker, args = pool.starmap.call_args[0]
+        self.assertEqual(worker,
+                         lc_func_test_runner._run_env_deployment_worker)
+        self.assertEqual(args[1][:3],
+                         ('env2', {'force': True, 'keep_model': 1}, 'tests'))
+        self.register_event.assert_has_calls([
+            mock.call('env1: Deploy Models', 'Start', timestamp=1.0),
+            mock.call('env1: Deploy Models', 'Finish', timestamp=2.0)])
+        self.register_metric.assert_called_once_with(
+            'env1: Deploy Bundle m1', {'duration': 1.0, 'lines': 2})
+
+    def test_run_env_deployment_worker(self):
+        self.patch_object(lc_func_test_runner.cli_utils, 'setup_logging')
+        self.patch_object(lc_func_test_runner.utils, 'set_base_test_dir')
+        self.patch_object(lc_func_test_runner.utils, 'get_charm_config')
+        self.patch_object(lc_func_test_runner.zaza.plugins,
+                          'find_and_configure_plugins')
+        self.patch_object(lc_func_test_runner, 'run_env_deployment')
+        self.patch_object(lc_func_test_runner.zaza, 'clean_up_libjuju_thread')
+        self.patch_object(lc_func_test_runner.run_report,
+                          'get_copy_of_events', return_value={})
+        self.patch_object(lc_func_test_runner.run_report,
+                          'get_copy_of_metrics',
+                          return_value={'Deploy Bundle m1': {'lines': 2}})
+        env_deployment = lc_func_test_runner.utils.EnvironmentDeploy(
+            'env1',
+            [lc_func_test_runner.utils.ModelDeploy('a1', 'm1', 'bundle1')],
+            False)
+        self.assertEqual(
+            lc_func_test_runner._run_env_deployment_worker(
+                env_deployment, {'keep_model': 0}, 'tests', 'DEBUG'),
+            {'name': 'env1', 'error': None, 'events': {},
+             'metrics': {'Deploy Bundle m1': {'lines': 2}}})
+        self.setup_logging.assert_called_once_with(
+            log_level='DEBUG', prefix='env1')
+        self.find_and_configure_plugins.assert_called_once_with(
+            [env_deployment])
+        self.run_env_deployment.assert_called_once_with(
+            env_deployment, test_directory='tests', keep_model=0)
+        self.clean_up_libjuju_thread.assert_called_once_with()
+
+        self.run_env_deployment.side_effect = ValueError('bad')
+        result = lc_func_test_runner._run_env_deployment_worker(
+            env_deployment, {'keep_model': 0}, 'tests', 'DEBUG')
+        self.assertEqual(result['error'], 'ValueError: bad')
+
     def test_func_test_runner_smoke(self):
         self.patch_object(lc_func_test_runner.utils, 'get_charm_config')
         self.patch_object(lc_func_test_runner.utils, 'generate_model_name')
@@ -321,7 +481,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                       model_ctxt={'default_alias': 'newmodel'},
                       force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False)]
+                      ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_func_test_runner_dev(self):
@@ -354,11 +514,11 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
             mock.call(cwd + '/tests/bundles/bundle3.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False),
+                      ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(cwd + '/tests/bundles/bundle4.yaml', 'newmodel',
                       model_ctxt={'default_alias': 'newmodel'}, force=False,
                       test_directory=None, trust=False,
-                      ignore_hard_deploy_errors=False)]
+                      ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_func_test_runner_specify_bundle(self):
@@ -394,7 +554,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                 model_ctxt={'default_alias': 'newmodel'},
                 force=False,
                 test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False)]
+                ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_func_test_runner_specify_bundle_with_alias(self):
@@ -431,7 +591,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                 model_ctxt={'alias': 'newmodel'},
                 force=False,
                 test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False)]
+                ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_func_test_runner_specify_bundle_with_implicit_alias(self):
@@ -461,7 +621,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                 model_ctxt={'alias': 'newmodel'},
                 force=False,
                 test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False)]
+                ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_func_test_runner_cmr_specify_bundle_with_alias(self):
@@ -500,7 +660,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                             'another_alias': 'newmodel2'},
                 force=False,
                 test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False),
+                ignore_hard_deploy_errors=False, concurrent=False),
             mock.call(
                 cwd + '/tests/bundles/maverick-things.yaml',
                 'newmodel2',
@@ -508,7 +668,7 @@ class TestCharmLifecycleFuncTestRunner(ut_utils.BaseTestCase):
                             'another_alias': 'newmodel2'},
                 force=False,
                 test_directory=None, trust=False,
-                ignore_hard_deploy_errors=False)]
+                ignore_hard_deploy_errors=False, concurrent=False)]
         self.deploy.assert_has_calls(deploy_calls)
 
     def test_main_smoke_dev_ambiguous(self):
@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import io
+import asyncio
 import mock
 import os
 import subprocess
+import threading
 import yaml
 
+import zaza
 import zaza.charm_lifecycle.utils as lc_utils
 import unit_tests.utils as ut_utils
 
@@ -162,6 +164,47 @@ class TestCharmLifecycleUtils(ut_utils.BaseTestCase):
                 {'alias': 'bundle'}),
             expect)
 
+    def test_get_environment_deploy_multi_unordered(self):
+        self.patch_object(
+            lc_utils,
+            'generate_model_name',
+            return_value='zaza-model-1')
+        self.patch_object(
+            lc_utils,
+            'get_default_env_deploy_name',
+            return_value='env-alias-1')
+        env_deploy = lc_utils.get_environment_deploy_multi_unordered(
+            {'alias1': 'bundle1', 'alias2': 'bundle2'})
+        self.assertEqual(
+            env_deploy.model_deploys,
+            [lc_utils.ModelDeploy('alias1', 'zaza-model-1', 'bundle1'),
+             lc_utils.ModelDeploy('alias2', 'zaza-model-1', 'bundle2')])
+        self.assertTrue(env_deploy.run_in_series)
+        self.assertTrue(env_deploy.unordered)
+        # the other environment deploys are ordered
+        self.assertFalse(
+            lc_utils.get_environment_deploy_multi_ordered(
+                {'env': [{'alias1': 'bundle1'}]}).unordered)
+
+    def test_run_concurrently(self):
+        self.assertEqual(
+            lc_utils.run_concurrently(lambda x: x * 2, [1, 2, 3]),
+            [2, 4, 6])
+        self.assertEqual(lc_utils.run_concurrently(str, []), [])
+
+    def test_run_concurrently_failure(self):
+        called = []
+
+        def _f(x):
+            called.append(x)
+            if x == 1:
+                raise ValueError(x)
+            return x
+
+        with self.assertRaises(ValueError):
+            lc_utils.run_concurrently(_f, [1, 2, 3])
+        self.assertEqual(sorted(called), [1, 2, 3])
+
     @mock.patch('zaza.utilities.deployment_env.get_setup_file_contents')
     def test_generate_model_name(self, get_setup_file_contents):
         get_setup_file_contents.return_value = {}
@@ -311,33 +354,86 @@ class TestCharmLifecycleUtils(ut_utils.BaseTestCase):
                                     'TestCharmLifecycleUtils')()),
             type(self))
 
+    def _mock_subprocess(self, output, returncode, limit=2 ** 16, eof=True):
+        self.patch_object(lc_utils.asyncio, 'create_subprocess_exec',
+                          new=mock.AsyncMock())
+        process_mock = mock.MagicMock()
+        process_mock.stdout = asyncio.StreamReader(limit=limit)
+        process_mock.stdout.feed_data(output)
+        if eof:
+            process_mock.stdout.feed_eof()
+        process_mock.wait = mock.AsyncMock(return_value=returncode)
+        self.create_subprocess_exec.return_value = process_mock
+        return process_mock
+
     def test_check_output_logging(self):
         self.patch_object(lc_utils.logging, 'info')
-        self.patch_object(lc_utils.subprocess, 'Popen')
-        popen_mock = mock.MagicMock()
-        popen_mock.stdout = io.StringIO("logline1\nlogline2\nlogline3\n")
-        poll_output = [0, 0, None, None, None]
-        popen_mock.poll.side_effect = poll_output.pop
-        popen_mock.returncode = 0
-        self.Popen.return_value = popen_mock
-        lc_utils.check_output_logging(['cmd', 'arg1', 'arg2'])
+        # The final line has no newline and is still in the pipe when the
+        # process exits; it must not be dropped.
+        self._mock_subprocess(b"logline1\nlogline2\nlogline3", 0)
+        lines = []
+        threads = set()
+
+        def _line_callback(line):
+            threads.add(threading.current_thread())
+            lines.append(line)
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            metrics = lc_utils.check_output_logging(
+                ['cmd', 'arg1', 'arg2'],
+                line_callback=_line_callback)
+        # the callback isn't run on the loop (here, this thread)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.create_subprocess_exec.assert_called_once_with(
+            'cmd', 'arg1', 'arg2',
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=lc_utils.COMMAND_OUTPUT_LINE_LIMIT)
         log_calls = [
             mock.call('logline1'),
             mock.call('logline2'),
             mock.call('logline3')]
         self.info.assert_has_calls(log_calls)
+        self.assertEqual(lines, ['logline1', 'logline2', 'logline3'])
+        self.assertEqual(metrics.lines, 3)
+        self.assertGreaterEqual(metrics.duration, 0)
 
     def test_check_output_logging_process_error(self):
         self.patch_object(lc_utils.logging, 'info')
-        self.patch_object(lc_utils.subprocess, 'Popen')
-        popen_mock = mock.MagicMock()
-        popen_mock.stdout = io.StringIO("logline1\n")
-        poll_output = [0, 0, None]
-        popen_mock.poll.side_effect = poll_output.pop
-        popen_mock.returncode = 1
-        self.Popen.return_value = popen_mock
-        with self.assertRaises(subprocess.CalledProcessError):
-            lc_utils.check_output_logging(['cmd', 'arg1', 'arg2'])
+        self._mock_subprocess(b"logline1\n", 1)
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            with self.assertRaises(subprocess.CalledProcessError):
+                lc_utils.check_output_logging(['cmd', 'arg1', 'arg2'])
+        self.info.assert_called_once_with('logline1')
+
+    def test_check_output_logging_long_line(self):
+        self.patch_object(lc_utils.logging, 'info')
+        self._mock_subprocess(b"short\n0123456789abcdef\nend\n", 0, limit=8)
+        lines = []
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            metrics = lc_utils.check_output_logging(
+                ['cmd'], line_callback=lines.append)
+        self.assertEqual(lines, ['short', '0123456789abcdef', 'end'])
+        self.assertEqual(metrics.lines, 3)
+
+    def test_check_output_logging_cancelled(self):
+        self.patch_object(lc_utils.logging, 'info')
+        process_mock = self._mock_subprocess(b"logline1\n", None, eof=False)
+        process_mock.returncode = None
+
+        async def _run():
+            task = asyncio.ensure_future(
+                lc_utils.async_check_output_logging(['cmd']))
+            while not self.info.called:
+                await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            zaza.sync_wrapper(_run)()
+        process_mock.kill.assert_called_once_with()
+        process_mock.wait.assert_awaited_once_with()
 
     def test_manipulate_base_test_dir(self):
         lc_utils.set_base_test_dir()
@@ -35,7 +35,7 @@ class TestController(ut_utils.BaseTestCase):
         async def _disconnect():
             return
 
-        async def _connect():
+        async def _connect(*args):
             return
 
         async def _list_models():
@@ -79,6 +79,11 @@ class TestController(ut_utils.BaseTestCase):
         self.Controller_mock.info.name = self.controller_name
         self.patch_object(controller, 'Controller')
         self.Controller.return_value = self.Controller_mock
+        self.patch_object(controller, 'ControllerRefs', new={})
+        self.patch_object(controller, 'ControllerRefCounts', new={})
+        self.patch_object(controller, '_controllers_to_remove', new=set())
+        self.patch_object(controller, 'is_controller_disconnected',
+                          return_value=False)
 
     @unittest.skip("Skipping unti libjuju issue 333 is resolved")
     def test_add_model(self):
@@ -101,6 +106,33 @@ class TestController(ut_utils.BaseTestCase):
             self.model1.info.name, destroy_storage=True,
             force=True, max_wait=600)
 
+    def test_destroy_model_backs_off(self):
+        self.patch_object(controller.asyncio, 'sleep', new=mock.AsyncMock())
+        models = list(self.models)
+        listings = [models, models, models, []]
+
+        async def _list_models():
+            return listings.pop(0)
+
+        self.Controller_mock.list_models.side_effect = _list_models
+        controller.destroy_model(self.model1.info.name)
+        self.sleep.assert_has_calls(
+            [mock.call(1.0), mock.call(2.0), mock.call(4.0)])
+
+    def test_destroy_model_fails(self):
+        self.patch_object(controller.asyncio, 'sleep', new=mock.AsyncMock())
+        self.patch_object(controller, 'DESTROY_MODEL_TIMEOUT', new=-1)
+        models = list(self.models)
+
+        async def _list_models():
+            return models
+
+        self.Controller_mock.list_models.side_effect = _list_models
+        with self.assertRaises(
+                zaza.utilities.exceptions.DestroyModelFailed):
+            controller.destroy_model(self.model1.info.name)
+        self.sleep.assert_not_called()
+
     def test_get_cloud(self):
         self.assertEqual(
             controller.get_cloud(),
@@ -113,6 +145,48 @@ class TestController(ut_utils.BaseTestCase):
             self.models)
         self.Controller_mock.list_models.assert_called_once()
 
+    def test_controller_connection_is_shared(self):
+        self.assertEqual(controller.list_models(), self.models)
+        self.assertEqual(controller.get_cloud(), self.cloud)
+        self.Controller.assert_called_once_with()
+        self.Controller_mock.connect.assert_called_once_with()
+        self.Controller_mock.disconnect.assert_not_called()
+        self.assertEqual(controller.ControllerRefs,
+                         {None: self.Controller_mock})
+        self.assertEqual(controller.ControllerRefCounts, {None: 0})
+        zaza.sync_wrapper(controller.remove_controllers_memo)()
+        self.Controller_mock.disconnect.assert_called_once_with()
+        self.assertEqual(controller.ControllerRefs, {})
+
+    def test_controller_connection_reconnects(self):
+        dropped = mock.MagicMock()
+        dropped.disconnect.side_effect = self.Controller_mock.disconnect\
+            .side_effect
+        controller.ControllerRefs[None] = dropped
+        self.is_controller_disconnected.side_effect = (
+            lambda c: c is dropped)
+        self.assertEqual(controller.list_models(), self.models)
+        dropped.disconnect.assert_called_once_with()
+        self.assertEqual(controller.ControllerRefs,
+                         {None: self.Controller_mock})
+
+    def test_controller_connection_named(self):
+        zaza.sync_wrapper(controller.get_controller_memo)('other')
+        self.Controller_mock.connect.assert_called_once_with('other')
+        self.assertEqual(controller.ControllerRefs,
+                         {'other': self.Controller_mock})
+
+    def test_remove_controller_memo_in_use(self):
+        async def _wrapper():
+            async with controller.controller_connection() as c:
+                await controller.remove_controller_memo()
+                self.assertEqual(controller.ControllerRefs, {None: c})
+                c.disconnect.assert_not_called()
+            c.disconnect.assert_called_once_with()
+            self.assertEqual(controller.ControllerRefs, {})
+
+        zaza.sync_wrapper(_wrapper)()
+
     def test_go_list_models(self):
         self.patch_object(controller, 'subprocess')
         controller.go_list_models()
@@ -32,9 +32,15 @@ import copy
 import collections
 import concurrent
 import datetime
+import json
 import mock
+import pathlib
 import pytest
 import yaml
+import juju.client.client
+import juju.delta
+import juju.errors
+import juju.model
 
 import unit_tests.utils as ut_utils
 
@@ -322,6 +328,7 @@ class TestModel(ut_utils.BaseTestCase):
         self.Model_mock.units = {
             'app/2': self.unit1,
             'app/4': self.unit2}
+        self.mymodel.units = self.Model_mock.units
         self.model_name = "testmodel"
         self.Model_mock.info.name = self.model_name
 
@@ -455,21 +462,181 @@ class TestModel(ut_utils.BaseTestCase):
         async def _connect(*args):
             return
 
-        Model_mock = mock.MagicMock()
-        Model_mock.connect.side_effect = _connect
+        self.mymodel.disconnect.side_effect = _connect
+        self.mymodel.connect_model.side_effect = _connect
         self.patch_object(model, 'ModelRefs', new={'modelname': self.mymodel})
         self.patch_object(model, 'is_model_disconnected', return_value=True)
         self.patch_object(model, 'Model')
-        self.Model.return_value = Model_mock
 
         async def _wrapper():
             return await model.get_model_memo('modelname')
 
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             mymodel = model.sync_wrapper(_wrapper)()
-            self.assertEqual(mymodel, Model_mock)
+            # the dropped connection is reconnected in place
+            self.assertEqual(mymodel, self.mymodel)
             self.mymodel.disconnect.assert_called_once_with()
-            self.assertEqual(self.ModelRefs['modelname'], Model_mock)
+            self.mymodel.connect_model.assert_called_once_with('modelname')
+            self.Model.assert_not_called()
+            self.assertEqual(self.ModelRefs['modelname'], self.mymodel)
+
+    def _mock_connecting_models(self, *models):
+        async def _connect(*args):
+            return
+
+        for m in models:
+            m.connect.side_effect = _connect
+            m.disconnect.side_effect = _connect
+        self.patch_object(model, 'Model')
+        self.Model.side_effect = list(models)
+        self.patch_object(model, 'ModelConnectionStats', new={})
+        self.patch_object(model, '_model_keepalive_handles', new={})
+        self.patch_object(model, '_model_status_views', new={})
+
+    def test_get_model_memo_connects_once(self):
+        Model_mock = mock.MagicMock()
+        self._mock_connecting_models(Model_mock)
+        self.patch_object(model, 'ModelRefs', new={})
+        self.patch_object(model, 'is_model_disconnected', return_value=False)
+
+        async def _wrapper():
+            return await asyncio.gather(
+                model.get_model_memo('modelname'),
+                model.get_model_memo('modelname'))
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            models = model.sync_wrapper(_wrapper)()
+            self.assertEqual(models, [Model_mock, Model_mock])
+            Model_mock.connect.assert_called_once_with('modelname')
+            # the keepalive is off by default
+            self.assertEqual(model._model_keepalive_handles, {})
+            stats = model.get_model_connection_stats('modelname')
+            self.assertEqual(stats['connects'], 1)
+            self.assertEqual(stats['reconnects'], 0)
+            view = mock.MagicMock()
+            model._model_status_views['modelname'] = view
+            model.sync_wrapper(model.remove_model_memo)('modelname')
+            self.assertEqual(model._model_keepalive_handles, {})
+            self.assertEqual(model._model_status_views, {})
+            view.close.assert_called_once_with()
+
+    def test_get_model_memo_reconnect_backoff(self):
+        self.patch_object(model, 'MODEL_RECONNECT_BACKOFF', new=0.001)
+        self._mock_connecting_models()
+        self.patch_object(model, 'ModelRefs', new={'modelname': self.mymodel})
+        connected = []
+        self.patch_object(model, 'is_model_disconnected',
+                          side_effect=lambda m: not connected)
+
+        async def _disconnect():
+            return
+
+        async def _connect_model(*args):
+            if self.mymodel.connect_model.call_count == 1:
+                raise Exception("no connection")
+            connected.append(True)
+
+        self.mymodel.disconnect.side_effect = _disconnect
+        self.mymodel.connect_model.side_effect = _connect_model
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            mymodel = model.sync_wrapper(model.get_model_memo)('modelname')
+            self.assertEqual(mymodel, self.mymodel)
+            self.assertEqual(model.ModelRefs['modelname'], self.mymodel)
+            self.assertEqual(self.mymodel.connect_model.call_count, 2)
+            stats = model.get_model_connection_stats()['modelname']
+            self.assertEqual(stats['failures'], 1)
+            self.assertEqual(stats['reconnects'], 1)
+            model.sync_wrapper(model.remove_models_memo)()
+
+    def test_get_model_memo_reconnect_keeps_model_state(self):
+        self.patch_object(model, 'MODEL_KEEPALIVE_INTERVAL', new=10)
+        self._mock_connecting_models()
+        self.patch_object(model, 'ModelRefs', new={'modelname': self.mymodel})
+        self.patch_object(model, '_model_change_subscriptions', new={})
+        self.patch_object(model, '_model_leader_indexes', new={})
+        disconnected = [self.mymodel]
+        self.patch_object(model, 'is_model_disconnected',
+                          side_effect=lambda m: m in disconnected)
+
+        async def _disconnect():
+            return
+
+        async def _connect_model(*args):
+            await asyncio.sleep(0)
+            disconnected.clear()
+
+        self.mymodel.disconnect.side_effect = _disconnect
+        self.mymodel.connect_model.side_effect = _connect_model
+        subscription = model.ModelChangeSubscription([('unit', None)])
+        model._model_change_subscriptions[self.mymodel] = {subscription}
+        index = model._get_leader_index(self.mymodel)
+
+        async def _wrapper():
+            # a waiter holding the model, and the keepalive, share the one
+            # reconnection.
+            await asyncio.gather(
+                model.ensure_model_connected(self.mymodel),
+                model.get_model_memo('modelname'))
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            model.sync_wrapper(_wrapper)()
+            self.mymodel.connect_model.assert_called_once_with('modelname')
+            self.assertEqual(model.ModelRefs, {'modelname': self.mymodel})
+            self.assertEqual(model._model_change_subscriptions,
+                             {self.mymodel: {subscription}})
+            self.assertIs(model._model_leader_indexes[self.mymodel], index)
+            self.assertIn('modelname', model._model_keepalive_handles)
+            model.sync_wrapper(model.remove_models_memo)()
+            self.assertEqual(model._model_keepalive_handles, {})
+            self.assertEqual(model._model_change_subscriptions, {})
+            self.assertEqual(model._model_leader_indexes, {})
+
+    def test_remove_model_memo_cancels_connect(self):
+        connecting = mock.MagicMock()
+        self._mock_connecting_models(connecting)
+        self.patch_object(model, 'ModelRefs', new={})
+        self.patch_object(model, '_model_connect_futures', new={})
+
+        async def _connect(*args):
+            await asyncio.sleep(60)
+
+        connecting.connect.side_effect = _connect
+
+        async def _wrapper():
+            waiter = asyncio.ensure_future(model.get_model_memo('modelname'))
+            while not connecting.connect.called:
+                await asyncio.sleep(0)
+            await model.remove_model_memo('modelname')
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            model.sync_wrapper(_wrapper)()
+            self.assertEqual(model.ModelRefs, {})
+            self.assertEqual(model._model_connect_futures, {})
+            connecting.disconnect.assert_called_once_with()
+
+    def test_model_keepalive(self):
+        self.patch_object(model, 'MODEL_KEEPALIVE_INTERVAL', new=10)
+        self.patch_object(model, 'ModelRefs', new={'modelname': self.mymodel})
+        self.patch_object(model, '_model_keepalive_handles', new={})
+        self.patch_object(model, 'get_model_memo', new=mock.AsyncMock())
+        self.patch_object(model, 'is_model_disconnected', return_value=False)
+
+        async def _wrapper(disconnected):
+            self.is_model_disconnected.return_value = disconnected
+            model._model_keepalive('modelname')
+            await asyncio.sleep(0)
+
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            model.sync_wrapper(_wrapper)(False)
+            self.get_model_memo.assert_not_called()
+            self.assertIn('modelname', model._model_keepalive_handles)
+            model._model_keepalive_handles.pop('modelname').cancel()
+            model.sync_wrapper(_wrapper)(True)
+            self.get_model_memo.assert_called_once_with('modelname')
+            self.assertEqual(model._model_keepalive_handles, {})
 
     def test_remove_model_memo_doesnt_exist(self):
         async def _wrapper():
@@ -542,8 +709,9 @@ class TestModel(ut_utils.BaseTestCase):
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             model.sync_wrapper(self._wrapper)()
         self.Model_mock.disconnect.assert_has_calls([mock.call()])
+        # the memoed model is reconnected by its memo name.
         self.Model_mock.connect_model.assert_has_calls(
-            [mock.call('testmodel')]
+            [mock.call('modelname')]
         )
 
     def test_block_until_auto_reconnect_model_disconnected_async(self):
@@ -557,8 +725,9 @@ class TestModel(ut_utils.BaseTestCase):
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             model.sync_wrapper(self._wrapper)()
         self.Model_mock.disconnect.assert_has_calls([mock.call()])
+        # the memoed model is reconnected by its memo name.
         self.Model_mock.connect_model.assert_has_calls(
-            [mock.call('testmodel')]
+            [mock.call('modelname')]
         )
 
     def test_block_until_auto_reconnect_model_blocks_till_true(self):
@@ -588,6 +757,58 @@ class TestModel(ut_utils.BaseTestCase):
         self.unit1.scp_to.assert_called_once_with(
             '/tmp/src', '/tmp/dest', proxy=False, scp_opts='', user='ubuntu')
 
+    def test_scp_to_unit_push_cache(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'ScpPushCache', new={})
+        self.patch_object(model, 'ScpPushCacheStats', new={})
+        self.patch_object(model, 'SCP_PUSH_CACHE', new=True)
+        self.patch_object(model, '_local_sha256', return_value='abc')
+        self.action.results = {
+            'return-code': '0', 'stderr': '', 'stdout': 'abc  /tmp/dest\n'}
+        # first push; nothing to check
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest',
+                          model_name='mname')
+        self.unit1.run.assert_not_called()
+        self.assertEqual(self.unit1.scp_to.call_count, 1)
+        # pushed before and the remote copy matches
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest',
+                          model_name='mname')
+        self.unit1.run.assert_called_once_with(
+            'sha256sum "$(if [ -d /tmp/dest ]; then echo /tmp/dest/src; '
+            'else echo /tmp/dest; fi)"', timeout=None, block=True)
+        self.assertEqual(self.unit1.scp_to.call_count, 1)
+        # pushed before but the remote copy has changed
+        self.action.results = {
+            'return-code': '0', 'stderr': '', 'stdout': 'def  /tmp/dest\n'}
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest',
+                          model_name='mname')
+        self.assertEqual(self.unit1.scp_to.call_count, 2)
+        # the same content pushed with different options isn't a hit
+        self.action.results = {
+            'return-code': '0', 'stderr': '', 'stdout': 'abc  /tmp/dest\n'}
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest',
+                          model_name='mname', scp_opts='-o Port=2222')
+        self.assertEqual(self.unit1.scp_to.call_count, 3)
+        self.assertEqual(model.get_scp_push_cache_stats('mname'),
+                         {'hits': 1, 'misses': 3})
+        self.assertEqual(model.get_scp_push_cache_stats(),
+                         {'mname': {'hits': 1, 'misses': 3}})
+        model.clear_scp_push_cache('mname')
+        self.assertEqual(model.ScpPushCache, {})
+
+    def test_scp_to_unit_push_cache_disabled(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, '_local_sha256', return_value='abc')
+        self.assertFalse(model.SCP_PUSH_CACHE)
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest')
+        model.scp_to_unit('app/2', '/tmp/src', '/tmp/dest')
+        self.unit1.run.assert_not_called()
+        self.assertEqual(self.unit1.scp_to.call_count, 2)
+
     def test_scp_to_all_units(self):
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'Model')
@@ -598,6 +819,64 @@ class TestModel(ut_utils.BaseTestCase):
         self.unit2.scp_to.assert_called_once_with(
             '/tmp/src', '/tmp/dest', proxy=False, scp_opts='', user='ubuntu')
 
+    def test_scp_to_all_units_retries(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.patch_object(model, 'SCP_RETRY_BACKOFF', new=0)
+        self.Model.return_value = self.Model_mock
+        attempts = collections.Counter()
+
+        def _scp_to(unit, failures):
+            async def _inner(*args, **kwargs):
+                attempts[unit] += 1
+                if attempts[unit] <= failures:
+                    raise juju.errors.JujuError('command failed')
+            return _inner
+
+        self.unit1.scp_to.side_effect = _scp_to('app/2', 1)
+        self.unit2.scp_to.side_effect = _scp_to('app/4', 3)
+        with self.assertRaises(juju.errors.JujuError):
+            model.scp_to_all_units('app', '/tmp/src', '/tmp/dest',
+                                   concurrency=1, retries=2)
+        self.assertEqual(attempts, {'app/2': 2, 'app/4': 3})
+        # by default a failed transfer isn't retried, and the original error
+        # is raised once the other units have been transferred to.
+        attempts.clear()
+        self.unit1.scp_to.side_effect = _scp_to('app/2', 1)
+        self.unit2.scp_to.side_effect = _scp_to('app/4', 0)
+        with self.assertRaises(juju.errors.JujuError):
+            model.scp_to_all_units('app', '/tmp/src', '/tmp/dest')
+        self.assertEqual(attempts, {'app/2': 1, 'app/4': 1})
+
+    def test_scp_to_all_units_skip_identical(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, '_local_sha256', return_value='abc')
+        self.action.results = {
+            'return-code': '0', 'stderr': '', 'stdout': 'abc  /tmp/dest\n'}
+        model.scp_to_all_units('app', '/tmp/src', '/tmp/dest',
+                               skip_identical=True)
+        self.unit1.scp_to.assert_not_called()
+        self.unit1.run.assert_called_once_with(
+            'sha256sum "$(if [ -d /tmp/dest ]; then echo /tmp/dest/src; '
+            'else echo /tmp/dest; fi)"', timeout=None, block=True)
+        self.action.results = {
+            'return-code': '0', 'stderr': '', 'stdout': 'def  /tmp/dest\n'}
+        model.scp_to_all_units('app', '/tmp/src', 'dest',
+                               skip_identical=True)
+        self.unit1.scp_to.assert_called_once_with(
+            '/tmp/src', 'dest', proxy=False, scp_opts='', user='ubuntu')
+        self.unit1.run.assert_called_with(
+            'sha256sum "$(if [ -d ~ubuntu/dest ]; then echo ~ubuntu/dest/src; '
+            'else echo ~ubuntu/dest; fi)"', timeout=None, block=True)
+        # a failing check doesn't stop the transfer
+        self.patch_object(model, '_async_remote_sha256',
+                          side_effect=juju.errors.JujuError('no unit'))
+        model.scp_to_all_units('app', '/tmp/src', 'dest',
+                               skip_identical=True)
+        self.assertEqual(self.unit1.scp_to.call_count, 2)
+
     def test_scp_from_unit(self):
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'Model')
@@ -692,9 +971,17 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_get_unit_public_address__fallback(self):
         self.patch_object(model, 'logging', name='mock_logging')
+        self.patch_object(model, '_public_address_tables', new={})
         sync_get_unit_public_address__fallback = model.sync_wrapper(
             model.async_get_unit_public_address__fallback)
 
+        # the API has no address for the units, so the CLI is used
+        async def mock_async_get_status(*args, **kwargs):
+            return juju.client.client.FullStatus(applications={})
+
+        self.patch_object(model, 'async_get_status')
+        self.async_get_status.side_effect = mock_async_get_status
+
         async def mock_async_get_juju_model():
             return 'a-model'
 
@@ -739,6 +1026,46 @@ class TestModel(ut_utils.BaseTestCase):
             "juju status --format=yaml -m a-model".split(), log_stderr=False,
             log_stdout=False)
 
+    def test_get_unit_public_address__fallback_api(self):
+        self.patch_object(model, '_public_address_tables', new={})
+        sync_get_unit_public_address__fallback = model.sync_wrapper(
+            model.async_get_unit_public_address__fallback)
+        status = juju.client.client.FullStatus.from_json({
+            'applications': {
+                'an-app': {
+                    'units': {
+                        'an-app/0': {
+                            'public-address': '2.3.4.5',
+                            'subordinates': {
+                                'sub/0': {'public-address': '2.3.4.5'}}},
+                        'an-app/1': {'public-address': '2.3.4.6'}}},
+                'no-units': {}}})
+
+        async def mock_async_get_status(*args, **kwargs):
+            return status
+
+        self.patch_object(model, 'async_get_status')
+        self.async_get_status.side_effect = mock_async_get_status
+        self.patch_object(
+            model.generic_utils, 'check_output', name='async_check_output')
+        units = {}
+        for name in ('an-app/0', 'an-app/1', 'sub/0'):
+            units[name] = mock.Mock()
+            units[name].name = name
+        self.assertEqual(
+            [sync_get_unit_public_address__fallback(
+                units[name], model_name='b-model')
+             for name in ('an-app/0', 'an-app/1', 'sub/0')],
+            ['2.3.4.5', '2.3.4.6', '2.3.4.5'])
+        # one fetch for all of the units
+        self.async_get_status.assert_called_once_with(
+            'b-model', refresh=False)
+        self.async_check_output.assert_not_called()
+        with mock.patch.object(model, 'PUBLIC_ADDRESS_TTL', new=-1):
+            sync_get_unit_public_address__fallback(
+                units['an-app/0'], model_name='b-model')
+        self.assertEqual(self.async_get_status.call_count, 2)
+
     def test_get_lead_unit_ip(self):
         async def mock_async_get_lead_unit(*args, **kwargs):
             return [self.unit2]
@@ -784,6 +1111,29 @@ class TestModel(ut_utils.BaseTestCase):
         with self.assertRaises(model.UnitNotFound):
             model.get_unit_from_name('bad_name', model_name='mname')
 
+    def test_get_unit_from_name_model_state(self):
+        model_mock = mock.MagicMock()
+        model_mock.state = juju.model.ModelState(model_mock)
+        for delta in [
+                ['application', 'change', {'name': 'app'}],
+                ['unit', 'change', {'name': 'app/0', 'application': 'app'}],
+                ['unit', 'change', {'name': 'app/1', 'application': 'app'}],
+                ['unit', 'remove', {'name': 'app/1', 'application': 'app'}]]:
+            model_mock.state.apply_delta(juju.delta.get_entity_delta(
+                juju.client.client.Delta.from_json(delta)))
+        model_mock.units = model_mock.state.units
+        model_mock.applications = model_mock.state.applications
+        unit = model.get_unit_from_name('app/0', model_mock)
+        self.assertEqual(unit.entity_id, 'app/0')
+        self.patch_object(model.logging, 'error')
+        with self.assertRaises(model.UnitNotFound):
+            model.get_unit_from_name('app/1', model_mock)
+        self.error.assert_not_called()
+        with self.assertRaises(model.UnitNotFound):
+            model.get_unit_from_name('other/0', model_mock)
+        self.error.assert_called_once_with(
+            'Application: other does not exist in current model')
+
     def test_get_app_ips(self):
         # self.patch_object(model, 'get_juju_model', return_value='mname')
 
@@ -848,6 +1198,29 @@ class TestModel(ut_utils.BaseTestCase):
             mock.call(cmd, timeout=None)])
         self.action.wait.assert_not_called()
 
+    def test_run_on_units(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        expected = {
+            'Code': '0',
+            'Stderr': '',
+            'Stdout': 'RESULT',
+            'stderr': '',
+            'stdout': 'RESULT'}
+        self.cmd = cmd = 'somecommand someargument'
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        outcomes = model.run_on_units(['app/2', 'app/4', 'app/9'], cmd,
+                                      concurrency=2)
+        self.assertEqual(list(outcomes.keys()), ['app/2', 'app/4', 'app/9'])
+        self.assertEqual(outcomes['app/2'].results, expected)
+        self.assertIsNone(outcomes['app/2'].error)
+        self.assertEqual(outcomes['app/4'].results, expected)
+        self.assertIsNone(outcomes['app/9'].results)
+        self.assertIsInstance(outcomes['app/9'].error,
+                              model.UnitNotFound)
+        self.unit1.run.assert_called_once_with(cmd, timeout=None, block=True)
+        self.unit2.run.assert_called_once_with(cmd, timeout=None, block=True)
+
     def test_run_on_unit_lc_keys(self):
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.action.results = {
@@ -948,6 +1321,30 @@ class TestModel(ut_utils.BaseTestCase):
         self.assertEqual(model.run_on_leader('app', cmd), expected)
         self.unit2.run.assert_called_once_with(cmd, timeout=None, block=True)
 
+    def test_run_on_leader_cached(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        model.run_on_leader('app', 'cmd1')
+        model.run_on_leader('app', 'cmd2')
+        # only the remembered leader is checked the second time
+        self.assertEqual(self.unit1.is_leader_from_status.call_count, 1)
+        self.assertEqual(self.unit2.is_leader_from_status.call_count, 2)
+        self.unit2.run.assert_has_calls([
+            mock.call('cmd1', timeout=None, block=True),
+            mock.call('cmd2', timeout=None, block=True)])
+        with mock.patch.object(model, 'LEADER_CACHE_TTL', new=-1):
+            self.assertEqual(model.get_lead_unit('app'), self.unit2)
+        self.assertEqual(self.unit1.is_leader_from_status.call_count, 2)
+        self.assertEqual(self.unit2.is_leader_from_status.call_count, 3)
+        # after a failover, the former leader isn't returned
+        self.unit1.is_leader_from_status.side_effect, \
+            self.unit2.is_leader_from_status.side_effect = (
+                self.unit2.is_leader_from_status.side_effect,
+                self.unit1.is_leader_from_status.side_effect)
+        self.assertEqual(model.get_lead_unit('app'), self.unit1)
+        self.assertEqual(self.unit2.is_leader_from_status.call_count, 4)
+
     def test_run_on_leader_juju2_x(self):
         del self.action.results
         self.juju_version = 2
@@ -1184,6 +1581,54 @@ class TestModel(ut_utils.BaseTestCase):
             'backup',
             backup_dir='/dev/null')
 
+    def test_run_action_on_units_results(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+
+        async def _fake_get_action_output(_):
+            return {'Code': '1', 'Stderr': 'ERR', 'Stdout': 'OUT'}
+        self.Model_mock.get_action_output = _fake_get_action_output
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'async_get_unit_from_name')
+        units = {
+            'app/1': self.unit1,
+            'app/2': self.unit2}
+
+        async def _async_get_unit_from_name(x, *args):
+            return units[x]
+
+        self.async_get_unit_from_name.side_effect = _async_get_unit_from_name
+        actions = {}
+        enqueued = []
+
+        def _make_run_action(unit_name, status):
+            async def _run_action(command, **params):
+                enqueued.append(unit_name)
+                action = mock.MagicMock()
+                action.id = unit_name
+                action.data = {'status': 'running'}
+
+                async def _complete():
+                    # both actions are enqueued before either completes
+                    while len(enqueued) < 2:
+                        await asyncio.sleep(0)
+                    action.data['status'] = status
+                asyncio.ensure_future(_complete())
+                actions[unit_name] = action
+                return action
+            return _run_action
+
+        self.unit1.run_action.side_effect = _make_run_action('app/1', 'failed')
+        self.unit2.run_action.side_effect = _make_run_action(
+            'app/2', 'completed')
+        with mock.patch.object(model, 'WAITER_FALLBACK_PERIOD', 0.01):
+            results = model.run_action_on_units(['app/1', 'app/2'], 'pause')
+        self.assertEqual(list(results.keys()), ['app/1', 'app/2'])
+        self.assertIs(results['app/1'].action, actions['app/1'])
+        self.assertIsInstance(results['app/1'].error, model.ActionFailed)
+        self.assertIs(results['app/2'].action, actions['app/2'])
+        self.assertIsNone(results['app/2'].error)
+
     def test_run_action_on_units_timeout(self):
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'Model')
@@ -1191,13 +1636,43 @@ class TestModel(ut_utils.BaseTestCase):
         self.patch_object(model, 'get_unit_from_name')
         self.get_unit_from_name.return_value = self.unit1
         self.run_action.data = {'status': 'running'}
+        results = model.run_action_on_units(
+            ['app/2'],
+            'backup',
+            action_params={'backup_dir': '/dev/null'},
+            timeout=0.1)
+        self.assertIs(results['app/2'].action, self.run_action)
+        self.assertIsInstance(results['app/2'].error, AsyncTimeoutError)
         with self.assertRaises(AsyncTimeoutError):
             model.run_action_on_units(
                 ['app/2'],
                 'backup',
+                raise_on_failure=True,
                 action_params={'backup_dir': '/dev/null'},
                 timeout=0.1)
 
+    def test_run_action_on_units_unit_not_found(self):
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'async_get_unit_from_name')
+
+        async def _async_get_unit_from_name(x, *args):
+            if x == 'app/2':
+                return self.unit1
+            raise model.UnitNotFound(x)
+
+        self.async_get_unit_from_name.side_effect = _async_get_unit_from_name
+        self.run_action.data = {'status': 'completed'}
+        results = model.run_action_on_units(['app/2', 'app/9'], 'backup')
+        self.assertIsNone(results['app/2'].error)
+        self.assertIsNone(results['app/9'].action)
+        self.assertIsInstance(results['app/9'].error, model.UnitNotFound)
+        self.unit1.run_action.assert_called_once_with('backup')
+        with self.assertRaises(model.UnitNotFound):
+            model.run_action_on_units(
+                ['app/2', 'app/9'], 'backup', raise_on_failure=True)
+
     def test_run_action_on_units_fail(self):
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'Model')
@@ -1220,7 +1695,7 @@ class TestModel(ut_utils.BaseTestCase):
         self.system_ready = True
         self._block_until_calls = 0
 
-        async def _block_until(f, timeout=0, model=None):
+        async def _block_until(f, timeout=0, model=None, **kwargs):
             # Mimic timeouts
             timeout = timeout + self._block_until_calls
             self._block_until_calls += 1
@@ -1238,6 +1713,8 @@ class TestModel(ut_utils.BaseTestCase):
         self.patch_object(model, 'Model')
         self.Model.return_value = self.Model_mock
         self.Model_mock.all_units_idle.return_value = _all_units_idle
+        self.unit1.application = 'app'
+        self.unit2.application = 'app'
         p_mock_ws = mock.PropertyMock(
             return_value=setup['workload-status'])
         wsmsg = setup.get('workload-status-message-prefix',
@@ -1257,6 +1734,8 @@ class TestModel(ut_utils.BaseTestCase):
         self.patch("asyncio.sleep",
                    name="mock_asyncio_sleep",
                    new=mock.AsyncMock())
+        self.patch_object(model.ModelChangeSubscription, 'wait',
+                          name='mock_changes_wait', new=mock.AsyncMock())
         self.patch_object(model.logging, 'info', name="mock_logging_info")
         self.patch_object(
             model.logging, 'warning', name="mock_logging_warning")
@@ -1400,6 +1879,58 @@ class TestModel(ut_utils.BaseTestCase):
                     self.unit1,
                     regex=r"my\sholiday.$"))
 
+    def test_workload_status_message_matches(self):
+        unit = mock.MagicMock(workload_status_message='Unit is ready (2)')
+        self.assertTrue(model.workload_status_message_matches(
+            unit, prefixes=['Readyish', 'Unit is ready']))
+        self.assertFalse(model.workload_status_message_matches(
+            unit, message='Unit is ready'))
+        self.assertTrue(model.workload_status_message_matches(
+            unit, regex=r'\(\d\)$'))
+        with self.assertRaises(ValueError):
+            model.workload_status_message_matches(unit)
+
+    def _snapshot_model(self):
+        machine_ok = mock.MagicMock(status='running')
+        machine_err = mock.MagicMock(status='provisioning error')
+        units = {
+            'app/0': mock.MagicMock(application='app',
+                                    workload_status='active',
+                                    data={'machine-id': '0'}),
+            'app/1': mock.MagicMock(application='app',
+                                    workload_status='error',
+                                    data={'machine-id': '1'}),
+            'other/0': mock.MagicMock(application='other',
+                                      workload_status='active',
+                                      data={'machine-id': '2'}),
+            'sub/0': mock.MagicMock(application='sub',
+                                    workload_status='active',
+                                    data={})}
+        for name, unit in units.items():
+            unit.entity_id = name
+        machine_err.entity_id = '2'
+        _model = mock.MagicMock(
+            units=units,
+            machines={'0': machine_ok, '1': machine_ok, '2': machine_err})
+        return _model, units, machine_err
+
+    def test_model_snapshot(self):
+        _model, units, machine_err = self._snapshot_model()
+        snapshot = model.ModelSnapshot(_model)
+        self.assertEqual(snapshot.units['app'],
+                         [units['app/0'], units['app/1']])
+        self.assertEqual(snapshot.units['sub'], [units['sub/0']])
+        self.assertEqual(snapshot.errored_units, [units['app/1']])
+        self.assertEqual(snapshot.errored_machines, [machine_err])
+        with self.assertRaises(model.UnitError):
+            snapshot.check_for_hard_errors()
+        snapshot.errored_units = []
+        with self.assertRaises(model.MachineError):
+            snapshot.check_for_hard_errors()
+        snapshot.errored_machines = []
+        # Test will fail if an Exception is raised
+        snapshot.check_for_hard_errors()
+
     def test_is_unit_errored_from_install_hook(self):
         self._application_states_setup({
             'workload-status': 'error',
@@ -1441,6 +1972,23 @@ class TestModel(ut_utils.BaseTestCase):
                 model.wait_for_application_states('modelname', timeout=1)
                 self.assertFalse(self.system_ready)
 
+    def test_wait_for_application_states_unit_goes_into_error(self):
+        self._application_states_setup({
+            'workload-status': 'maintenance',
+            'workload-status-message': 'Installing'})
+
+        async def _unit_errors(*args):
+            type(self.unit1).workload_status = 'error'
+            type(self.unit1).workload_status_message = (
+                'hook failed: "config-changed"')
+
+        self.mock_changes_wait.side_effect = _unit_errors
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            with self.assertRaises(model.UnitError) as e:
+                model.wait_for_application_states('modelname', timeout=100)
+        self.assertEqual(e.exception.units, [self.unit1])
+        self.mock_changes_wait.assert_called_once_with(mock.ANY)
+
     def test_wait_for_application_states_errored_unit_ignore(self):
         self._application_states_setup({
             'workload-status': 'error',
@@ -1456,19 +2004,10 @@ class TestModel(ut_utils.BaseTestCase):
                 self.assertFalse(self.system_ready)
 
     def test_wait_for_application_states_retries_no_success(self):
-        self.patch_object(model, 'check_model_for_hard_errors')
         self.patch_object(model, 'async_resolve_units')
         self.patch_object(model, 'async_block_until_unit_wl_status')
-        self.patch_object(model, 'check_unit_workload_status')
-
-        def unit_wl_status(_model, unit, states):
-            # There are two units. Only raise an error for the first unit
-            # so we can test scenarios where one unit is okay, the other
-            # unit is not okay.
-            if unit.name == 'app/2':
-                raise model.UnitError([unit])
-
-        self.check_unit_workload_status.side_effect = unit_wl_status
+        # There are two units. Only the first unit is in error so we can test
+        # scenarios where one unit is okay, the other unit is not okay.
         self._application_states_setup({
             'workload-status': 'error',
             'workload-status-message': 'hook failed: "install"'})
@@ -1482,19 +2021,10 @@ class TestModel(ut_utils.BaseTestCase):
             self.assertEqual(self.async_resolve_units.call_count, 3)
 
     def test_wait_for_application_states_retries_non_retryable(self):
-        self.patch_object(model, 'check_model_for_hard_errors')
         self.patch_object(model, 'async_resolve_units')
         self.patch_object(model, 'async_block_until_unit_wl_status')
-        self.patch_object(model, 'check_unit_workload_status')
-
-        def unit_wl_status(_model, unit, states):
-            # There are two units. Only raise an error for the first unit
-            # so we can test scenarios where one unit is okay, the other
-            # unit is not okay.
-            if unit.name == 'app/2':
-                raise model.UnitError([unit])
-
-        self.check_unit_workload_status.side_effect = unit_wl_status
+        # There are two units. Only the first unit is in error so we can test
+        # scenarios where one unit is okay, the other unit is not okay.
         self._application_states_setup({
             'workload-status': 'error',
             'workload-status-message': 'hook failed: "config-changed"'})
@@ -1509,26 +2039,20 @@ class TestModel(ut_utils.BaseTestCase):
         self.async_block_until_unit_wl_status.assert_not_called()
 
     def test_wait_for_application_states_retries_with_success(self):
-        self.patch_object(model, 'check_model_for_hard_errors')
         self.patch_object(model, 'async_block_until_unit_wl_status')
         self.patch_object(model, 'async_resolve_units')
-        self.patch_object(model, 'check_unit_workload_status')
         count = 0
 
-        def unit_wl_status(_model, unit, states):
+        async def resolve_units(*args, **kwargs):
             # After a couple of retries, we want to simulate the unit going
             # into the active state, so tweak the state.
-            if unit.name == 'app/2':
-                nonlocal count
-                count += 1
-                if count < 3:
-                    raise model.UnitError([unit])
-                # Mutate the state for the desired behavior :-/
-                type(unit).workload_status = 'active'
-                type(unit).workload_status_message = 'Unit is ready'
-            return True
+            nonlocal count
+            count += 1
+            if count == 2:
+                type(self.unit1).workload_status = 'active'
+                type(self.unit1).workload_status_message = 'Unit is ready'
 
-        self.check_unit_workload_status.side_effect = unit_wl_status
+        self.async_resolve_units.side_effect = resolve_units
         self._application_states_setup({
             'workload-status': 'error',
             'workload-status-message': 'hook failed: "install"'})
@@ -1614,12 +2138,25 @@ class TestModel(ut_utils.BaseTestCase):
         self.assertIn(mock.call("Applications left: %s", "app"),
                       self.mock_logging_info.mock_calls)
 
+    def test_wait_for_application_states_wait_capped_at_timeout(self):
+        self._application_states_setup({
+            'agent-status': 'executing',
+            'workload-status': 'blocked',
+            'workload-status-message': 'Sure, I could do something'})
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            with mock.patch.object(model, 'WAITER_FALLBACK_PERIOD', 30):
+                with self.assertRaises(model.ModelTimeout):
+                    model.wait_for_application_states('modelname', timeout=1)
+        waits = [c.args[0] for c in self.mock_changes_wait.call_args_list]
+        self.assertTrue(waits)
+        self.assertTrue(all(0 <= w <= 2 for w in waits))
+
     def test_wait_for_application_states_zero_units(self):
         self._application_states_setup({
             'workload-status': 'active',
             'workload-status-message': 'Unit is ready'})
         # override to zero units
-        self.mymodel.applications['app'].units = []
+        self.Model_mock.units = {}
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             model.wait_for_application_states(
                 'modelname',
@@ -1635,7 +2172,7 @@ class TestModel(ut_utils.BaseTestCase):
             'workload-status': 'active',
             'workload-status-message': 'Unit is ready'})
         # override to zero units
-        self.mymodel.applications['app'].units = []
+        self.Model_mock.units = {}
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             with self.assertRaises(model.ModelTimeout):
                 model.wait_for_application_states(
@@ -1652,13 +2189,85 @@ class TestModel(ut_utils.BaseTestCase):
             'workload-status': 'active',
             'workload-status-message': 'Unit is ready'})
         # override to zero units
-        self.mymodel.applications['app'].units = []
+        self.Model_mock.units = {}
         with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
             with self.assertRaises(model.ModelTimeout):
                 model.wait_for_application_states(
                     'modelname',
                     timeout=1)
 
+    def test_wait_for_application_states_unit_count_timeout(self):
+        self._application_states_setup({
+            'workload-status': 'active',
+            'workload-status-message': 'Unit is ready'})
+        with mock.patch.object(zaza, 'RUN_LIBJUJU_IN_THREAD', new=False):
+            with self.assertRaises(model.ModelTimeout):
+                model.wait_for_application_states(
+                    'modelname',
+                    states={'app': {'num-expected-units': 3}},
+                    timeout=-3)
+        self.assertIn(mock.call(
+            "Timed out waiting for 'app'. Expected 3 unit(s) but found 2"),
+            self.mock_logging_info.mock_calls)
+
+    def test_application_state_matcher(self):
+        unit = mock.MagicMock()
+        unit.workload_status = 'blocked'
+        unit.workload_status_message = 'Sure, I could do something'
+        matcher = model.ApplicationStateMatcher()
+        self.assertFalse(matcher.workload_status_matches(unit))
+        self.assertFalse(matcher.workload_status_message_matches(unit))
+        self.assertFalse(matcher.unit_count_matches([]))
+        self.assertTrue(matcher.unit_count_matches([unit]))
+        self.assertEqual(matcher.approved_messages,
+                         ['ready', 'Ready', 'Unit is ready'])
+        matcher = model.ApplicationStateMatcher({
+            'workload-status': 'blocked',
+            'workload-status-message-prefix': 'Sure',
+            'num-expected-units': 0})
+        self.assertTrue(matcher.workload_status_matches(unit))
+        self.assertTrue(matcher.workload_status_message_matches(unit))
+        self.assertTrue(matcher.unit_count_matches([]))
+        self.assertFalse(matcher.unit_count_matches([unit]))
+        self.assertFalse(matcher.uses_deprecated_message)
+        matcher = model.ApplicationStateMatcher({
+            'workload-status-message': 'Sure',
+            'workload-status-message-regex': '^Not sure$'})
+        self.assertTrue(matcher.uses_deprecated_message)
+        self.assertFalse(matcher.workload_status_message_matches(unit))
+        self.assertEqual(matcher.approved_messages, '^Not sure$')
+
+    def test_compile_application_states(self):
+        self.patch_object(model, '_APPLICATION_STATES',
+                          new=collections.OrderedDict())
+        states = model.compile_application_states(
+            {'app': {'workload-status': 'blocked'}, 'sub': None})
+        self.assertIs(
+            model.compile_application_states(
+                {'sub': None, 'app': {'workload-status': 'blocked'}}),
+            states)
+        self.assertIs(model.compile_application_states(states), states)
+        self.assertEqual(states.get('app').workload_statuses,
+                         ['active', 'blocked'])
+        self.assertEqual(states.get('sub').workload_statuses, ['active'])
+        self.assertIs(states.get('other'), states.default)
+        self.assertIsNot(model.compile_application_states(), states)
+
+    def test_compile_application_states_memo_bounded(self):
+        self.patch_object(model, '_APPLICATION_STATES',
+                          new=collections.OrderedDict())
+        self.patch_object(model, 'APPLICATION_STATES_MEMO_SIZE', new=2)
+        first = model.compile_application_states({'a': None})
+        model.compile_application_states({'b': None})
+        # using the first again keeps it over the second
+        self.assertIs(model.compile_application_states({'a': None}), first)
+        model.compile_application_states({'c': None})
+        self.assertEqual(len(model._APPLICATION_STATES), 2)
+        self.assertIs(model.compile_application_states({'a': None}), first)
+        self.assertEqual(
+            [list(v.states) for v in model._APPLICATION_STATES.values()],
+            [['c'], ['a']])
+
     def test_get_current_model(self):
         self.patch_object(model, 'Model')
         self.Model.return_value = self.Model_mock
@@ -1857,6 +2466,44 @@ class TestModel(ut_utils.BaseTestCase):
         self.unit1.run.assert_called_once_with(
             'cat /tmp/src/myfile.txt', timeout=None, block=True)
 
+    def test_block_until_file_ready_reprobes_outstanding_units(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'FILE_PROBE_INTERVAL', new=0.01)
+        self.action.results = {'stdout': "contents"}
+        check_function = mock.MagicMock(side_effect=[True, False, True])
+        model.block_until_file_ready(
+            'app',
+            '/tmp/src/myfile.txt',
+            check_function,
+            timeout=1)
+        self.unit1.run.assert_called_once_with(
+            'cat /tmp/src/myfile.txt', timeout=None, block=True)
+        self.assertEqual(self.unit2.run.call_count, 2)
+        check_function.assert_has_calls([mock.call('contents')] * 3)
+
+    def test_block_until_file_ready_probe_hash(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'FILE_PROBE_INTERVAL', new=0.01)
+        self.patch_object(model, 'FILE_PROBE_MAX_INTERVAL', new=0.01)
+        self.action.results = {'stdout': "contents"}
+        check_function = mock.MagicMock(return_value=False)
+        with self.assertRaises(AsyncTimeoutError):
+            model.block_until_file_ready(
+                'app',
+                '/tmp/src/myfile.txt',
+                check_function,
+                timeout=0.2,
+                probe_hash=True)
+        commands = [c[0][0] for c in self.unit1.run.call_args_list]
+        self.assertEqual(commands.count('cat /tmp/src/myfile.txt'), 1)
+        self.assertGreater(
+            commands.count('sha256sum /tmp/src/myfile.txt'), 1)
+        self.assertEqual(check_function.call_count, 2)
+
     def test_block_until_file_missing(self):
         self.patch_object(model, 'Model')
         self.Model.return_value = self.Model_mock
@@ -1897,6 +2544,81 @@ class TestModel(ut_utils.BaseTestCase):
                 '/tmp/src/myfile.txt',
                 timeout=0.1)
 
+    def test_block_until_file_missing_many_paths(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.action.results = {'stdout': "1\n1\n"}
+        model.block_until_file_missing(
+            'app',
+            ['/tmp/src/myfile.txt', '/tmp/src/other.txt'],
+            timeout=1)
+        self.unit1.run.assert_called_once_with(
+            'test -e "/tmp/src/myfile.txt"; echo $?; '
+            'test -e "/tmp/src/other.txt"; echo $?',
+            timeout=None, block=True)
+
+    def test_block_until_file_missing_many_paths_one_present(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.action.results = {'stdout': "1\n0\n"}
+        with self.assertRaises(AsyncTimeoutError):
+            model.block_until_file_missing(
+                'app',
+                ['/tmp/src/myfile.txt', '/tmp/src/other.txt'],
+                timeout=0.1)
+
+    def test_block_until_file_missing_on_machine(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        stdouts = {'0': "1\n1\n", '1': "0\n1\n"}
+
+        async def _run_on_machine(machine, command, model_name=None):
+            output = {'Stdout': stdouts[machine]}
+            stdouts[machine] = "1\n1\n"
+            return output
+        self.patch_object(model, 'async_run_on_machine')
+        self.async_run_on_machine.side_effect = _run_on_machine
+        model.block_until_file_missing_on_machine(
+            ['0', '1'],
+            ['/tmp/src/myfile.txt', '/tmp/src/other.txt'],
+            timeout=5)
+        command = ('test -e "/tmp/src/myfile.txt"; echo $?; '
+                   'test -e "/tmp/src/other.txt"; echo $?')
+        self.async_run_on_machine.assert_has_calls([
+            mock.call('0', command, None),
+            mock.call('1', command, None),
+            mock.call('1', command, None)])
+        self.assertEqual(self.async_run_on_machine.call_count, 3)
+
+    def test_block_until_file_missing_path(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.action.results = {'stdout': "1"}
+        model.block_until_file_missing(
+            'app',
+            pathlib.Path('/tmp/src/myfile.txt'),
+            timeout=1)
+        self.unit1.run.assert_called_once_with(
+            'test -e "/tmp/src/myfile.txt"; echo $?', timeout=None, block=True)
+
+    def test_block_until_file_missing_on_machine_int_machine(self):
+        self.patch_object(model, 'Model')
+        self.Model.return_value = self.Model_mock
+        self.patch_object(model, 'get_juju_model', return_value='mname')
+
+        async def _run_on_machine(machine, command, model_name=None):
+            return {'Stdout': "1\n"}
+        self.patch_object(model, 'async_run_on_machine')
+        self.async_run_on_machine.side_effect = _run_on_machine
+        model.block_until_file_missing_on_machine(
+            0, pathlib.Path('/tmp/src/myfile.txt'), timeout=1)
+        self.async_run_on_machine.assert_called_once_with(
+            0, 'test -e "/tmp/src/myfile.txt"; echo $?', None)
+
     def test_block_until_file_matches_re(self):
         self.action.results = {
             'return-code': '0',
@@ -1927,6 +2649,7 @@ class TestModel(ut_utils.BaseTestCase):
         self.patch_object(model, 'Model')
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
+        self.patch_object(model, 'FILE_PROBE_INTERVAL', new=0.01)
         model.block_until_file_matches_re(
             'app',
             '/tmp/src/myfile.txt',
@@ -1941,7 +2664,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_async_block_until_all_units_idle(self):
 
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
 
@@ -1957,7 +2680,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_async_block_until_all_units_idle_false(self):
 
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
 
@@ -1974,7 +2697,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_async_block_until_all_units_idle_errored_unit(self):
 
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
 
@@ -1994,7 +2717,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_block_until_unit_count(self):
 
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2005,8 +2728,8 @@ class TestModel(ut_utils.BaseTestCase):
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
-        self.patch_object(model, 'async_get_status')
-        self.async_get_status.side_effect = _get_status
+        self.patch_object(model, 'async_get_watched_status')
+        self.async_get_watched_status.side_effect = _get_status
         self.juju_status.applications[self.application]["units"] = [
             'app/1', 'app/2']
         model.block_until_unit_count('app', 2)
@@ -2017,7 +2740,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_block_until_charm_url(self):
 
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2028,8 +2751,8 @@ class TestModel(ut_utils.BaseTestCase):
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
-        self.patch_object(model, 'async_get_status')
-        self.async_get_status.side_effect = _get_status
+        self.patch_object(model, 'async_get_watched_status')
+        self.async_get_watched_status.side_effect = _get_status
         target_url = 'cs:openstack-charmers-next/app'
         self.juju_status.applications[self.application]['charm'] = target_url
         model.block_until_charm_url('app', target_url)
@@ -2038,7 +2761,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def test_block_until_charm_channel(self):
 
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2063,7 +2786,7 @@ class TestModel(ut_utils.BaseTestCase):
 
     def block_until_service_status_base(self, rou_return):
 
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2226,6 +2949,49 @@ class TestModel(ut_utils.BaseTestCase):
         with self.assertRaises(model.ServiceNotRunning):
             model.get_unit_service_start_time('app/2', 'mysvc1')
 
+    def test_parse_oslo_config(self):
+        self.patch_object(model, '_OSLO_CONFIG_SECTIONS',
+                          new=collections.OrderedDict())
+        file_contents = """
+[DEFAULT]
+debug = False
+transport_url = rabbit://a:b@10.0.0.1:5672/
+transport_url = rabbit://a:b@10.0.0.2:5672/
+
+[glance_store]
+stores = glance.store.filesystem.Store,
+    glance.store.http.Store
+"""
+        expected = {
+            'DEFAULT': {
+                'debug': ['False'],
+                'transport_url': [
+                    'rabbit://a:b@10.0.0.1:5672/',
+                    'rabbit://a:b@10.0.0.2:5672/']},
+            'glance_store': {
+                'stores': [
+                    'glance.store.filesystem.Store,\n'
+                    'glance.store.http.Store']}}
+        sections = model.parse_oslo_config(file_contents)
+        self.assertEqual(sections, expected)
+        self.assertIs(model.parse_oslo_config(file_contents), sections)
+        self.assertEqual(len(model._OSLO_CONFIG_SECTIONS), 1)
+
+    def test_parse_oslo_config_memo_bounded(self):
+        self.patch_object(model, '_OSLO_CONFIG_SECTIONS',
+                          new=collections.OrderedDict())
+        self.patch_object(model, 'OSLO_CONFIG_MEMO_SIZE', new=2)
+        first = model.parse_oslo_config('[a]\nx = 1\n')
+        model.parse_oslo_config('[b]\nx = 1\n')
+        # using the first again keeps it over the second
+        self.assertIs(model.parse_oslo_config('[a]\nx = 1\n'), first)
+        model.parse_oslo_config('[c]\nx = 1\n')
+        self.assertEqual(len(model._OSLO_CONFIG_SECTIONS), 2)
+        self.assertIs(model.parse_oslo_config('[a]\nx = 1\n'), first)
+        self.assertEqual(
+            [list(v) for v in model._OSLO_CONFIG_SECTIONS.values()],
+            [['c'], ['a']])
+
     def block_until_oslo_config_entries_match_base(self, file_contents,
                                                    expected_contents):
         self.action.results = {
@@ -2374,24 +3140,25 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
 
     def block_until_services_restarted_base(self, gu_return=None,
                                             gu_raise_exception=False):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
 
-        async def _async_get_unit_service_start_time(unit, svc, timeout=None,
-                                                     model_name=None,
-                                                     pgrep_full=False):
-            if gu_raise_exception:
-                raise model.ServiceNotRunning('sv1')
-            else:
-                return gu_return
+        async def _async_run_on_units(unit_names, command, model_name=None,
+                                      timeout=None):
+            start_times = json.dumps(
+                [None if gu_raise_exception else gu_return] *
+                command.count('stat -c %Y'))
+            return {
+                unit_name: model.UnitRunResult(
+                    {'Stdout': start_times + '\n'}, None, 0.1)
+                for unit_name in unit_names}
         self.patch_object(model, 'get_juju_model', return_value='mname')
-        self.patch_object(model, 'async_get_unit_service_start_time')
-        self.async_get_unit_service_start_time.side_effect = \
-            _async_get_unit_service_start_time
+        self.patch_object(model, 'async_run_on_units')
+        self.async_run_on_units.side_effect = _async_run_on_units
         self.patch_object(model, 'Model')
         self.Model.return_value = self.Model_mock
 
@@ -2401,6 +3168,11 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             'app',
             8,
             ['svc1', 'svc2'])
+        self.async_run_on_units.assert_called_once_with(
+            ['app/2', 'app/4'],
+            model._service_start_times_command(['svc1', 'svc2']),
+            model_name=None,
+            timeout=2700)
 
     def test_block_until_services_restarted_with_pgrep(self):
         self.block_until_services_restarted_base(gu_return=10)
@@ -2409,28 +3181,12 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             8,
             ['svc1', 'svc2'],
             pgrep_full=True)
-        self.async_get_unit_service_start_time.assert_has_calls([
-            mock.call('app/2',
-                      'svc1',
-                      model_name=None,
-                      pgrep_full=True,
-                      timeout=2700),
-            mock.call('app/2',
-                      'svc2',
-                      model_name=None,
-                      pgrep_full=True,
-                      timeout=2700),
-            mock.call('app/4',
-                      'svc1',
-                      model_name=None,
-                      pgrep_full=True,
-                      timeout=2700),
-            mock.call('app/4',
-                      'svc2',
-                      model_name=None,
-                      pgrep_full=True,
-                      timeout=2700),
-        ])
+        self.async_run_on_units.assert_called_once_with(
+            ['app/2', 'app/4'],
+            model._service_start_times_command(
+                ['svc1', 'svc2'], pgrep_full=True),
+            model_name=None,
+            timeout=2700)
 
     def test_block_until_services_restarted_fail(self):
         self.block_until_services_restarted_base(gu_return=10)
@@ -2448,8 +3204,41 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
                 12,
                 ['svc1', 'svc2'])
 
+    def test_block_until_services_restarted_bad_output(self):
+        self.block_until_services_restarted_base(gu_return=10)
+        outputs = {'app/2': ['not json\n', '[10]\n'], 'app/4': ['[10]\n']}
+
+        async def _block_until(f, timeout=None, **kwargs):
+            for _ in range(2):
+                if await f():
+                    return
+            raise AsyncTimeoutError
+
+        async def _async_run_on_units(unit_names, command, model_name=None,
+                                      timeout=None):
+            return {
+                unit_name: model.UnitRunResult(
+                    {'Stdout': outputs[unit_name].pop(0)}, None, 0.1)
+                for unit_name in unit_names}
+
+        self.async_block_until.side_effect = _block_until
+        self.async_run_on_units.side_effect = _async_run_on_units
+        model.block_until_services_restarted('app', 8, ['svc1'])
+        # the garbled output is re-polled; the restarted unit isn't.
+        self.assertEqual(
+            [c.args[0] for c in self.async_run_on_units.call_args_list],
+            [['app/2', 'app/4'], ['app/2']])
+
+    def test_service_start_times_command(self):
+        self.assertEqual(
+            model._service_start_times_command(['svc1', 'svc2'],
+                                               pgrep_full=True),
+            "s0=$(stat -c %Y /proc/$(pgrep -o -f 'svc1')); "
+            "s1=$(stat -c %Y /proc/$(pgrep -o -f 'svc2')); "
+            'echo "[${s0:-null}, ${s1:-null}]"')
+
     def test_block_until_unit_wl_status(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2461,8 +3250,8 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
-        self.async_get_status.side_effect = _get_status
+        self.patch_object(model, 'async_get_watched_status')
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_unit_wl_status(
@@ -2475,7 +3264,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             timeout=0.1)
 
     def test_block_until_unit_wl_status_fail(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2493,8 +3282,8 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
-        self.async_get_status.side_effect = _get_status
+        self.patch_object(model, 'async_get_watched_status')
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         with self.assertRaises(AsyncTimeoutError):
@@ -2509,7 +3298,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
                 timeout=0.1)
 
     def test_block_until_unit_wl_status_inverse(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2521,8 +3310,8 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
-        self.async_get_status.side_effect = _get_status
+        self.patch_object(model, 'async_get_watched_status')
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_unit_wl_status(
@@ -2537,7 +3326,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             timeout=0.1)
 
     def test_block_until_wl_status_info_starts_with(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2549,12 +3338,12 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
+        self.patch_object(model, 'async_get_watched_status')
         self.juju_status.applications['app']['units']['app/1'][
             'workload-status']['info'] = "match-me if you want"
         self.juju_status.applications['app']['units']['app/2'][
             'workload-status']['info'] = "match-me if you want"
-        self.async_get_status.side_effect = _get_status
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_wl_status_info_starts_with(
@@ -2562,7 +3351,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             'match-me')
 
     def test_block_until_wl_status_info_starts_with_negative(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2574,12 +3363,12 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
+        self.patch_object(model, 'async_get_watched_status')
         self.juju_status.applications['app']['units']['app/1'][
             'workload-status']['info'] = "match-me if you want"
         self.juju_status.applications['app']['units']['app/2'][
             'workload-status']['info'] = "match-me if you want"
-        self.async_get_status.side_effect = _get_status
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_wl_status_info_starts_with(
@@ -2588,7 +3377,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             negate_match=True)
 
     def test_block_until_unit_wl_message_match(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2600,13 +3389,13 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
+        self.patch_object(model, 'async_get_watched_status')
         self.patch_object(model, 'async_get_principle_unit', return_value=None)
         self.juju_status.applications['app']['units']['app/1'][
             'workload-status']['info'] = "match-me if you want"
         self.juju_status.applications['app']['units']['app/2'][
             'workload-status']['info'] = "match-me if you want"
-        self.async_get_status.side_effect = _get_status
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_unit_wl_message_match(
@@ -2614,7 +3403,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             '(m|p)atch-me.*')
 
     def test_block_until_unit_wl_message_match_negative(self):
-        async def _block_until(f, timeout=None):
+        async def _block_until(f, timeout=None, **kwargs):
             rc = await f()
             if not rc:
                 raise AsyncTimeoutError
@@ -2626,13 +3415,13 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.Model.return_value = self.Model_mock
         self.patch_object(model, 'get_juju_model', return_value='mname')
         self.patch_object(model, 'get_unit_from_name')
-        self.patch_object(model, 'async_get_status')
+        self.patch_object(model, 'async_get_watched_status')
         self.patch_object(model, 'async_get_principle_unit', return_value=None)
         self.juju_status.applications['app']['units']['app/1'][
             'workload-status']['info'] = "match-me if you want"
         self.juju_status.applications['app']['units']['app/2'][
             'workload-status']['info'] = "match-me if you want"
-        self.async_get_status.side_effect = _get_status
+        self.async_get_watched_status.side_effect = _get_status
         self.patch_object(model, 'async_block_until')
         self.async_block_until.side_effect = _block_until
         model.block_until_unit_wl_message_match(
@@ -2641,7 +3430,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
             negate_match=True)
 
     def resolve_units_mocks(self):
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
         self.patch_object(model, 'Model')
@@ -2684,7 +3473,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         self.assertFalse(self.check_output.called)
 
     def test_wait_for_agent_status(self):
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
         self.patch_object(model, 'get_juju_model', return_value='mname')
@@ -2697,7 +3486,7 @@ disk_formats = ami,ari,aki,vhd,vmdk,raw,qcow2,vdi,iso,root-tar
         model.wait_for_agent_status(timeout=0.1)
 
     def test_wait_for_agent_status_timeout(self):
-        async def _block_until(f, timeout=None, model=None):
+        async def _block_until(f, timeout=None, model=None, **kwargs):
             if not f():
                 raise AsyncTimeoutError
         self.patch_object(model, 'get_juju_model', return_value='mname')
@@ -2840,6 +3629,80 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
 
         await model.async_block_until(_f, _g, timeout=0.1)
 
+    def _delta(self, entity, entity_id):
+        delta = mock.MagicMock()
+        delta.entity = entity
+        delta.get_id.return_value = entity_id
+        return delta
+
+    async def test_model_change_subscription(self):
+        subscription = model.ModelChangeSubscription(
+            [('unit', 'app/0'), ('machine', None)])
+        subscription.notify(self._delta('unit', 'app/1'))
+        subscription.notify(self._delta('application', 'app'))
+        self.assertFalse(await subscription.wait(0.01))
+        subscription.notify(self._delta('unit', 'app/0'))
+        self.assertTrue(await subscription.wait(0.01))
+        # the change has been consumed
+        self.assertFalse(await subscription.wait(0.01))
+        subscription.notify(self._delta('machine', '3'))
+        self.assertTrue(await subscription.wait(0.01))
+
+    async def test_model_change_subscription_no_entities(self):
+        with mock.patch.object(model.asyncio, 'sleep') as mock_sleep:
+            subscription = model.ModelChangeSubscription()
+            self.assertFalse(await subscription.wait(0.5))
+            mock_sleep.assert_called_once_with(0.5)
+
+    async def test_subscribe_model_changes(self):
+        model_mock = mock.MagicMock()
+        with mock.patch.object(model, '_model_change_subscriptions', new={}):
+            with model.subscribe_model_changes(model_mock) as s:
+                model_mock.add_observer.assert_not_called()
+            with model.subscribe_model_changes(
+                    model_mock, [('unit', None)]) as s1:
+                with model.subscribe_model_changes(
+                        model_mock, [('machine', '0')]) as s2:
+                    model_mock.add_observer.assert_called_once()
+                    self.assertEqual(
+                        model._model_change_subscriptions[model_mock],
+                        {s1, s2})
+                    observer = model_mock.add_observer.call_args[0][0]
+                    await observer(self._delta('unit', 'app/0'), None, None,
+                                   model_mock)
+                    self.assertTrue(await s1.wait(0.01))
+                    self.assertFalse(await s2.wait(0.01))
+            self.assertEqual(
+                model._model_change_subscriptions[model_mock], set())
+            self.assertFalse(s.entities)
+
+    async def test_async_block_until_entities(self):
+        model_mock = mock.MagicMock()
+        results = [False, True]
+
+        async def _f():
+            return results.pop(0)
+
+        async def _change():
+            observer = model_mock.add_observer.call_args[0][0]
+            await observer(self._delta('unit', 'app/0'), None, None,
+                           model_mock)
+
+        with mock.patch.object(model, '_model_change_subscriptions', new={}), \
+                mock.patch.object(model, 'get_model',
+                                  return_value=model_mock) as get_model:
+            # with a fallback period longer than the timeout, only the delta
+            # can cause the condition to be re-evaluated in time.
+            waiter = asyncio.ensure_future(model.async_block_until(
+                _f, timeout=5, wait_period=60, model_name='m',
+                entities=[('unit', 'app/0')]))
+            while not model_mock.add_observer.called:
+                await asyncio.sleep(0)
+            await _change()
+            await waiter
+            get_model.assert_called_once_with('m')
+        self.assertEqual(results, [])
+
     async def test_update_unknown_action_status_invalid_params(self):
         """Test update unknown action status invalid params."""
         self.assertRaises(ValueError, model.update_unknown_action_status,
@@ -2917,7 +3780,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications.__getitem__.return_value = FAKE_STATUS
         with mock.patch.object(
             model,
-            'async_get_status',
+            'async_get_watched_status',
             return_value=model_mock
         ):
             idle = await model.async_get_agent_status('app', 'app/0')
@@ -2928,7 +3791,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications.__getitem__.return_value = FAKE_STATUS
         with mock.patch.object(
             model,
-            'async_get_status',
+            'async_get_watched_status',
             return_value=model_mock
         ):
             idle = await model.async_check_if_subordinates_idle('app', 'app/0')
@@ -2939,7 +3802,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications.__getitem__.return_value = EXECUTING_STATUS
         with mock.patch.object(
             model,
-            'async_get_status',
+            'async_get_watched_status',
             return_value=model_mock
         ):
             idle = await model.async_get_agent_status('app', 'app/0')
@@ -2950,7 +3813,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications.__getitem__.return_value = EXECUTING_STATUS
         with mock.patch.object(
             model,
-            'async_get_status',
+            'async_get_watched_status',
             return_value=model_mock
         ):
             idle = await model.async_check_if_subordinates_idle('app', 'app/0')
@@ -2963,7 +3826,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications.__getitem__.return_value = status
         with mock.patch.object(
             model,
-            'async_get_status',
+            'async_get_watched_status',
             return_value=model_mock
         ):
             idle = await model.async_check_if_subordinates_idle('app', 'app/0')
@@ -2974,7 +3837,7 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
         model_mock.applications = {
             'app': {
                 'units': FAKE_STATUS['units']}}
-        with mock.patch.object(model, 'async_get_status',
+        with mock.patch.object(model, 'async_get_watched_status',
                                return_value=model_mock):
             pmap = await model.async_get_principle_sub_map()
         self.assertEqual(
@@ -2991,13 +3854,214 @@ class AsyncModelTests(aiounittest.AsyncTestCase):
                 'units': FAKE_STATUS['units']},
             'dsql': {
                 'units': {}}}
-        with mock.patch.object(model, 'async_get_status',
+        with mock.patch.object(model, 'async_get_watched_status',
                                return_value=model_mock):
             unita = await model.async_get_principle_unit('app-hacluster/0')
             unitb = await model.async_get_principle_unit('absent-app/0')
         self.assertEqual(unita, 'app/0')
         self.assertIsNone(unitb)
 
+    def _fake_watched_model(self):
+        def _status(current, message=''):
+            return {'current': current, 'message': message, 'since': None,
+                    'version': ''}
+
+        model_mock = mock.MagicMock()
+        # the unit arrives before its application; the subordinate before its
+        # principal.
+        model_mock.state.state = {
+            'unit': {
+                'sub/0': [{
+                    'name': 'sub/0', 'application': 'sub',
+                    'principal': 'app/0', 'machine-id': '',
+                    'workload-status': _status('active', 'Unit is ready'),
+                    'agent-status': _status('idle')}],
+                'app/0': [{
+                    'name': 'app/0', 'application': 'app',
+                    'principal': '', 'machine-id': '0',
+                    'charm-url': 'cs:app-1',
+                    'workload-status': _status('waiting', 'Incomplete'),
+                    'agent-status': _status('executing')}],
+                'app/1': [None]},
+            'application': {
+                'app': [{'name': 'app', 'charm-url': 'cs:app-1',
+                         'subordinate': False,
+                         'status': _status('waiting')}],
+                'sub': [{'name': 'sub', 'charm-url': 'cs:sub-2',
+                         'subordinate': True,
+                         'status': _status('active')}]},
+            'relation': {
+                1: [{'id': 1, 'endpoints': [
+                    {'application-name': 'app',
+                     'relation': {'scope': 'container'}},
+                    {'application-name': 'sub',
+                     'relation': {'scope': 'container'}}]}]},
+            'machine': {
+                '0/lxd/0': [{'id': '0/lxd/0',
+                             'agent-status': _status('pending')}],
+                '0': [{'id': '0', 'instance-id': 'i-0',
+                       'addresses': [
+                           {'value': '10.0.0.1', 'scope': 'local-cloud'},
+                           {'value': '1.2.3.4', 'scope': 'public'}],
+                       'agent-status': _status('started')}]}}
+        return model_mock
+
+    async def test_model_status_view(self):
+        model_mock = self._fake_watched_model()
+        view = model.ModelStatusView(model_mock)
+        view.start()
+        model_mock.add_observer.assert_called_once_with(view._on_delta)
+        status = view.status
+        self.assertEqual(sorted(status.applications.keys()), ['app', 'sub'])
+        app = status.applications['app']
+        self.assertEqual(app['charm'], 'cs:app-1')
+        self.assertEqual(list(app['units'].keys()), ['app/0'])
+        unit = app['units']['app/0']
+        self.assertEqual(unit['workload-status']['status'], 'waiting')
+        self.assertEqual(unit['workload-status']['info'], 'Incomplete')
+        self.assertEqual(unit['agent-status']['status'], 'executing')
+        self.assertEqual(unit['machine'], '0')
+        self.assertEqual(
+            unit['subordinates']['sub/0'].workload_status.info,
+            'Unit is ready')
+        self.assertEqual(app['subordinate-to'], [])
+        self.assertEqual(status.applications['sub']['subordinate-to'],
+                         ['app'])
+        self.assertEqual(status.applications['sub']['units'], {})
+        self.assertEqual(list(status['machines'].keys()), ['0'])
+        machine = status['machines']['0']
+        self.assertEqual(machine.agent_status['status'], 'started')
+        self.assertEqual(machine['dns-name'], '1.2.3.4')
+        self.assertEqual(
+            machine['containers']['0/lxd/0'].agent_status.status, 'pending')
+
+        # deltas update the entities in place
+        delta = mock.MagicMock()
+        delta.entity = 'unit'
+        delta.type = 'change'
+        delta.get_id.return_value = 'app/0'
+        delta.data = dict(
+            model_mock.state.state['unit']['app/0'][0],
+            **{'workload-status': {'current': 'active'},
+               'agent-status': {'current': 'idle'}})
+        await view._on_delta(delta, None, None, model_mock)
+        self.assertIs(view.status, status)
+        unit = status.applications['app']['units']['app/0']
+        self.assertEqual(unit.workload_status.status, 'active')
+        self.assertEqual(unit.agent_status.status, 'idle')
+        self.assertIn('sub/0', unit.subordinates)
+        delta.entity = 'unit'
+        delta.type = 'remove'
+        delta.get_id.return_value = 'sub/0'
+        await view._on_delta(delta, None, None, model_mock)
+        self.assertEqual(unit.subordinates, {})
+        # not watched entity types are ignored
+        delta.entity = 'action'
+        delta.type = 'change'
+        await view._on_delta(delta, None, None, model_mock)
+        # nor once the view is closed, which removes its observer
+        model_mock._observers = {'observer': view._on_delta, 'other': None}
+        view.close()
+        self.assertEqual(model_mock._observers, {'other': None})
+        delta.entity = 'application'
+        delta.type = 'remove'
+        delta.get_id.return_value = 'app'
+        await view._on_delta(delta, None, None, model_mock)
+        self.assertIn('app', status.applications)
+
+    def test_get_watched_status_copies_view(self):
+        model_mock = self._fake_watched_model()
+        with mock.patch.object(model, '_model_status_views', new={}), \
+                mock.patch.object(model, 'get_model_memo',
+                                  return_value=model_mock):
+            status = model.get_watched_status('m1')
+            view = model._model_status_views['m1']
+            self.assertIsNot(status, view.status)
+            self.assertIsNot(status.applications, view.status.applications)
+            self.assertEqual(
+                status.applications['app']['units']['app/0'].machine, '0')
+
+    async def test_leader_index(self):
+        model_mock = mock.MagicMock()
+        model_mock._observers = {}
+        model_mock.add_observer.side_effect = (
+            lambda callable_: model_mock._observers.update(
+                {mock.sentinel.observer: callable_}))
+        index = model.LeaderIndex(model_mock)
+        index.start()
+        model_mock.add_observer.assert_called_once_with(index._on_delta)
+        self.assertIsNone(index.get('app'))
+        index.set('app', 'app/0')
+        index.set('other', 'other/1')
+        self.assertEqual(index.get('app'), 'app/0')
+        delta = self._delta('unit', 'app/1')
+        delta.type = 'change'
+        delta.data = {'application': 'app',
+                      'agent-status': {'current': 'executing',
+                                       'message': 'running update-status'}}
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertEqual(index.get('app'), 'app/0')
+        # a non leader unit going away doesn't change the leader
+        delta.type = 'remove'
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertEqual(index.get('app'), 'app/0')
+        # but running a leader hook may
+        delta.type = 'change'
+        delta.data['agent-status']['message'] = 'running leader-elected hook'
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertIsNone(index.get('app'))
+        self.assertEqual(index.get('other'), 'other/1')
+        # as does the leader going away
+        delta = self._delta('unit', 'other/1')
+        delta.type = 'remove'
+        delta.data = {'application': 'other'}
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertIsNone(index.get('other'))
+        # the unit's leader flag, if the delta has it, is used directly
+        delta = self._delta('unit', 'app/1')
+        delta.type = 'change'
+        delta.data = {'application': 'app', 'leader': True}
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertEqual(index.get('app'), 'app/1')
+        delta.data = {'application': 'app', 'leader': False}
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertIsNone(index.get('app'))
+        index.set('app', 'app/0')
+        with mock.patch.object(model, 'LEADER_CACHE_TTL', new=-1):
+            self.assertIsNone(index.get('app'))
+        index.set('app', 'app/0')
+        delta = self._delta('application', 'app')
+        delta.type = 'remove'
+        index.close()
+        self.assertEqual(model_mock._observers, {})
+        await index._on_delta(delta, None, None, model_mock)
+        self.assertEqual(index.get('app'), 'app/0')
+
+    async def test_async_get_watched_status(self):
+        model_mock = self._fake_watched_model()
+        with mock.patch.object(model, '_model_status_views', new={}), \
+                mock.patch.object(model, 'get_model_memo',
+                                  return_value=model_mock), \
+                mock.patch.object(model, 'async_get_status') as get_status:
+            status = await model.async_get_watched_status('m1')
+            self.assertEqual(
+                status.applications['app']['units']['app/0'].machine, '0')
+            self.assertIs(await model.async_get_watched_status('m1'), status)
+            model_mock.add_observer.assert_called_once()
+            view = model._model_status_views['m1']
+            # a replaced model gets a new view
+            with mock.patch.object(model, 'get_model_memo',
+                                   return_value=self._fake_watched_model()):
+                self.assertIsNot(
+                    await model.async_get_watched_status('m1'), status)
+            self.assertTrue(view.closed)
+            get_status.assert_not_called()
+            with mock.patch.object(model, 'MODEL_STATUS_FROM_WATCHER',
+                                   new=False):
+                await model.async_get_watched_status('m1')
+            get_status.assert_called_once_with(
+                'm1', interval=4.0, refresh=True)
+
     async def test_async_get_cloud_data(self):
         with mock.patch.object(
                 model.juju.client.jujudata, 'FileJujuData') as juju_data:
@@ -70,6 +70,13 @@ class TestCLIUtils(ut_utils.BaseTestCase):
         _consolehandler.setFormatter.assert_called_with(_logformatter)
         _logger.addHandler.assert_called_with(_consolehandler)
 
+    def test_setup_logging_prefix(self):
+        _, _, _ = self.setup_logging_mocks()
+        cli_utils.setup_logging(prefix='default1')
+        self.logging.Formatter.assert_called_with(
+            datefmt='%Y-%m-%d %H:%M:%S',
+            fmt='%(asctime)s [%(levelname)s] [default1] %(message)s')
+
     def test_setup_logging_existing_handler(self):
         _logger, _, _ = self.setup_logging_mocks(has_handlers=True)
         cli_utils.setup_logging()
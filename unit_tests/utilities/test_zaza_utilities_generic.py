@@ -464,13 +464,18 @@ class TestGenericUtils(ut_utils.BaseTestCase):
 
     def test_get_unit_process_ids(self):
         self.patch(
-            "zaza.utilities.generic.get_process_id_list",
+            "zaza.utilities.generic.model.run_on_units",
             new_callable=mock.MagicMock(),
-            name="_get_pids"
+            name="_run"
         )
 
-        pids = ["1", "2"]
-        self._get_pids.return_value = pids
+        def _run_on_units(unit_names, command):
+            return {
+                unit_name: zaza.model.UnitRunResult(
+                    {"Code": "0", "Stdout": "1 2", "Stderr": ""}, None, 0.1)
+                for unit_name in unit_names}
+
+        self._run.side_effect = _run_on_units
         unit_processes = {
             "ceph-osd/0": {
                 "ceph-osd": 2
@@ -491,6 +496,30 @@ class TestGenericUtils(ut_utils.BaseTestCase):
         }
         result = generic_utils.get_unit_process_ids(unit_processes)
         self.assertEqual(result, expected)
+        self._run.assert_has_calls([
+            mock.call(["ceph-osd/0"], 'pidof -x "ceph-osd"'),
+            mock.call(["unit/0"], 'pidof -x "pr1"'),
+            mock.call(["unit/0"], 'pidof -x "pr2"')])
+
+    def test_get_unit_process_ids_failed(self):
+        self.patch(
+            "zaza.utilities.generic.model.run_on_units",
+            new_callable=mock.MagicMock(),
+            name="_run"
+        )
+        self._run.return_value = {
+            "unit/0": zaza.model.UnitRunResult(
+                {"Code": "1", "Stdout": "", "Stderr": ""}, None, 0.1),
+            "unit/1": zaza.model.UnitRunResult(
+                {"Code": "0", "Stdout": "1", "Stderr": ""}, None, 0.1)}
+        with self.assertRaises(zaza_exceptions.ProcessIdsFailed):
+            generic_utils.get_unit_process_ids(
+                {"unit/0": ["pr1"], "unit/1": ["pr1"]})
+        self._run.return_value = {
+            "unit/0": zaza.model.UnitRunResult(
+                None, zaza_exceptions.UnitNotFound("unit/0"), 0.1)}
+        with self.assertRaises(zaza_exceptions.UnitNotFound):
+            generic_utils.get_unit_process_ids({"unit/0": ["pr1"]})
 
     def test_validate_unit_process_ids(self):
         expected = {
@@ -52,6 +52,14 @@ class TestUtilitiesRunReport(ut_utils.BaseTestCase):
                 'model_name': 'model2',
                 'target_bundle': 'precise-essex'})
 
+    def test_register_metric(self):
+        run_report.register_metric(
+            'Deploy Bundle model2',
+            {'duration': 10.0, 'lines': 20})
+        self.assertEqual(
+            run_report.get_copy_of_metrics(),
+            {'Deploy Bundle model2': {'duration': 10.0, 'lines': 20}})
+
     def test_get_events_start_stop_time(self):
         events = {
             'event1': {
@@ -31,9 +31,9 @@
 """Functions to support converting async function to a sync equivalent."""
 import asyncio
 import concurrent.futures
+import contextlib
 import inspect
 import logging
-import time
 import threading
 from pkgutil import extend_path
 from sys import version_info
@@ -41,14 +41,24 @@ from sys import version_info
 
 __path__ = extend_path(__path__, __name__)
 
-# This flag is for testing, but can be used to control whether libjuju runs in
-# a background thread or is simplified.
+# This flag controls whether libjuju runs in a background thread (the default)
+# or in the calling thread.  In the latter case, a single long-lived loop owned
+# by zaza is used for all sync calls (see get_or_create_libjuju_local_loop()).
 RUN_LIBJUJU_IN_THREAD = True
 
 # Hold the libjuju thread so we can interact with it.
 _libjuju_thread = None
 _libjuju_loop = None
 _libjuju_run = False
+# Set from inside the libjuju loop once it is running.
+_libjuju_loop_started = threading.Event()
+# Guards creating the libjuju thread.
+_libjuju_thread_lock = threading.Lock()
+# The loop used when RUN_LIBJUJU_IN_THREAD is False.
+_libjuju_local_loop = None
+
+# Timeout for the libjuju thread to start its loop.
+LOOP_START_TIMEOUT = 5.0
 
 # Timeout for loop to close.  This is set to 30 seconds.  If there is a non
 # async call in the async thread then it could stall the thread for more than
@@ -65,22 +75,25 @@ def get_or_create_libjuju_thread():
     :rtype: threading.Thread
     """
     global _libjuju_thread, _libjuju_run
-    if _libjuju_thread is None:
-        _libjuju_run = True
-        _libjuju_thread = threading.Thread(target=libjuju_thread_run)
-        _libjuju_thread.start()
-        # There's a race hazard for _libjuju_loop becoming available, so let's
-        # wait for that to happen.
-        now = time.time()
-        while True:
-            if (_libjuju_loop is not None and _libjuju_loop.is_running()):
-                break
-            time.sleep(.01)
-            # allow 5 seconds for thead to start
-            if time.time() > now + 5.0:
+    if _libjuju_thread is not None:
+        return _libjuju_thread
+    # sync functions may be called from several threads (e.g. when destroying
+    # models concurrently), so only let one of them create the thread.
+    with _libjuju_thread_lock:
+        if _libjuju_thread is None:
+            _libjuju_run = True
+            _libjuju_loop_started.clear()
+            thread = threading.Thread(target=libjuju_thread_run)
+            thread.start()
+            # There's a race hazard for _libjuju_loop becoming available, so
+            # wait for the loop to signal (from inside the loop) that it is
+            # running.  allow 5 seconds for thead to start
+            if not _libjuju_loop_started.wait(LOOP_START_TIMEOUT):
+                _libjuju_thread = thread
                 raise RuntimeError("Async thread didn't start!")
-        # enable async subprocess calls in the libjuju thread to work
-        asyncio.get_child_watcher().attach_loop(_libjuju_loop)
+            # enable async subprocess calls in the libjuju thread to work
+            asyncio.get_child_watcher().attach_loop(_libjuju_loop)
+            _libjuju_thread = thread
     return _libjuju_thread
 
 
@@ -95,6 +108,10 @@ def libjuju_thread_run():
     thread. `run_coroutine_threadsafe` is used to cross from sync to asyncio
     code in the background thread to enable access to the libjuju.
 
+    The loop runs with `run_forever()` and so only wakes up when there is
+    work to do; it is stopped by `join_libjuju_thread()` using
+    `call_soon_threadsafe(loop.stop)`.
+
     Note: it's very important that libjuju objects are not updated in the sync
     thread; it's advisable that they are copied into neutral objects and handed
     back.  e.g. always use unit_name, rather than handling a libjuju 'unit'
@@ -102,49 +119,49 @@ def libjuju_thread_run():
     """
     global _libjuju_loop
 
-    async def looper():
-        while _libjuju_run:
-            # short spinner to ensure that foreground tasks 'happen' so that
-            # background tasks can complete (e.g. during model disconnection).
-            # loop.run_forever() doesn't work as there is no foreground async
-            # task to make progress, and thus the background tasks do nothing.
-            await asyncio.sleep(0.1)
-
     _libjuju_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(_libjuju_loop)
+    # signal the starting thread from inside the loop so that it only
+    # proceeds once the loop is actually running.
+    _libjuju_loop.call_soon(_libjuju_loop_started.set)
     try:
-        _libjuju_loop.run_until_complete(_libjuju_loop.create_task(looper()))
+        _libjuju_loop.run_forever()
     finally:
-        while True:
-            # issue #445 - asyncio.Task.all_tasks() deprecated in 3.7
-            if version_info.major == 3 and version_info.minor >= 7:
-                try:
-                    tasklist = asyncio.all_tasks()
-                except RuntimeError:
-                    # no running event loop
-                    break
-            else:
-                tasklist = asyncio.Task.all_tasks()
-            pending_tasks = [p for p in tasklist if not p.done()]
-            if pending_tasks:
-                logging.info(
-                    "async -> sync. cleaning up pending tasks: len: {}"
-                    .format(len(pending_tasks)))
-                for pending_task in pending_tasks:
-                    pending_task.cancel()
-                    try:
-                        _libjuju_loop.run_until_complete(pending_task)
-                    except asyncio.CancelledError:
-                        pass
-                    except Exception as e:
-                        logging.error(
-                            "A pending task caused an exception: {}"
-                            .format(str(e)))
-            else:
-                break
+        _cancel_pending_tasks(_libjuju_loop)
     _libjuju_loop.close()
 
 
+def _cancel_pending_tasks(loop):
+    """Cancel and then drain any pending tasks on a loop that isn't running.
+
+    :param loop: the loop to clean up.
+    :type loop: asyncio.AbstractEventLoop
+    """
+    while True:
+        # issue #445 - asyncio.Task.all_tasks() deprecated in 3.7
+        if version_info.major == 3 and version_info.minor >= 7:
+            tasklist = asyncio.all_tasks(loop)
+        else:
+            tasklist = asyncio.Task.all_tasks(loop=loop)
+        pending_tasks = [p for p in tasklist if not p.done()]
+        if pending_tasks:
+            logging.info(
+                "async -> sync. cleaning up pending tasks: len: {}"
+                .format(len(pending_tasks)))
+            for pending_task in pending_tasks:
+                pending_task.cancel()
+                try:
+                    loop.run_until_complete(pending_task)
+                except asyncio.CancelledError:
+                    pass
+                except Exception as e:
+                    logging.error(
+                        "A pending task caused an exception: {}"
+                        .format(str(e)))
+        else:
+            break
+
+
 def join_libjuju_thread():
     """Stop and cleanup the asyncio tasks on the loop, and then join it."""
     global _libjuju_thread, _libjuju_run
@@ -154,34 +171,65 @@ def join_libjuju_thread():
         # dropping the thread.
         asyncio.get_child_watcher().attach_loop(None)
         _libjuju_run = False
-        # wait up to 30 seconds for loop to close.
-        now = time.time()
-        while not _libjuju_loop.is_closed():
-            logging.debug("Closing ...")
-            time.sleep(.1)
-            if time.time() > now + LOOP_CLOSE_TIMEOUT:
-                raise RuntimeError(
-                    "Exceeded {} seconds for loop to close"
-                    .format(LOOP_CLOSE_TIMEOUT))
+        if not _libjuju_loop.is_closed():
+            _libjuju_loop.call_soon_threadsafe(_libjuju_loop.stop)
+        # wait up to LOOP_CLOSE_TIMEOUT seconds for loop to close; the thread
+        # finishes as soon as the loop has been closed.
         logging.debug("joining the loop")
-        _libjuju_thread.join(timeout=30.0)
+        _libjuju_thread.join(timeout=LOOP_CLOSE_TIMEOUT)
         if _libjuju_thread.is_alive():
             logging.error("The thread didn't die")
             raise RuntimeError(
-                "libjuju async thread didn't finish after 30seconds")
+                "Exceeded {} seconds for loop to close"
+                .format(LOOP_CLOSE_TIMEOUT))
         _libjuju_thread = None
 
 
+def get_or_create_libjuju_local_loop():
+    """Get (or Create) the loop that libjuju runs in when not in a thread.
+
+    When RUN_LIBJUJU_IN_THREAD is False, the async functions are run in the
+    calling thread using this loop.  The loop is owned by zaza and is reused
+    for every call so that the models in `zaza.model.ModelRefs` stay
+    connected between sync calls.  It is also set as the calling thread's
+    current event loop.
+
+    :returns: the loop to run libjuju in.
+    :rtype: asyncio.AbstractEventLoop
+    """
+    global _libjuju_local_loop
+    if _libjuju_local_loop is None or _libjuju_local_loop.is_closed():
+        _libjuju_local_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_libjuju_local_loop)
+    return _libjuju_local_loop
+
+
 def clean_up_libjuju_thread():
-    """Clean up the libjuju thread and any models that are still running."""
-    global _libjuju_loop, _libjuju_run
+    """Clean up the libjuju thread and any models that are still running.
+
+    Any memoed controller connections are also disconnected.
+
+    This also closes the loop that is used when RUN_LIBJUJU_IN_THREAD is
+    False.
+    """
+    global _libjuju_loop, _libjuju_run, _libjuju_local_loop
     if _libjuju_loop is not None:
         # circular import; tricky to remove
-        from . import model
+        from . import controller, model
         sync_wrapper(model.remove_models_memo)()
+        sync_wrapper(controller.remove_controllers_memo)()
         join_libjuju_thread()
         _libjuju_run = False
         _libjuju_loop = None
+    if _libjuju_local_loop is not None:
+        if not _libjuju_local_loop.is_closed():
+            from . import controller, model
+            _libjuju_local_loop.run_until_complete(model.remove_models_memo())
+            _libjuju_local_loop.run_until_complete(
+                controller.remove_controllers_memo())
+            _cancel_pending_tasks(_libjuju_local_loop)
+            _libjuju_local_loop.close()
+        _libjuju_local_loop = None
 
 
 def sync_wrapper(f, timeout=None):
@@ -207,13 +255,10 @@ def sync_wrapper(f, timeout=None):
             return await f(*args, **kwargs)
 
         if not RUN_LIBJUJU_IN_THREAD:
-            # run it in this thread's event loop:
-            loop = asyncio.get_event_loop()
-            # create a new loop if the existing one is closed
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            return loop.run_until_complete(_runner())
+            # run it in this thread using the zaza owned loop, so that model
+            # connections survive between calls.
+            return get_or_create_libjuju_local_loop().run_until_complete(
+                _runner())
 
         # ensure that the thread is created
         get_or_create_libjuju_thread()
@@ -233,6 +278,171 @@ def sync_wrapper(f, timeout=None):
     return _wrapper
 
 
+def gather_sync(*calls, timeout=None, return_exceptions=False):
+    """Run several async calls concurrently from sync code.
+
+    This is only to be called from sync code.  Each call is either a
+    co-routine (e.g. ``model.async_get_status()``) or an async function that
+    takes no arguments.  All of the calls are submitted to the async libjuju
+    thread in a single hop and run concurrently with `asyncio.gather`.
+
+    e.g.
+
+        results = zaza.gather_sync(
+            *[model.async_run_on_unit(u, 'uptime') for u in unit_names],
+            timeout=60)
+
+    :param calls: The co-routines or async functions to run.
+    :type calls: List[Union[Coroutine, function]]
+    :param timeout: The timeout to apply to each call, None for no timeout
+    :type timeout: Optional[float]
+    :param return_exceptions: If True then an exception raised by a call
+        (including a timeout) is returned in place of its result, otherwise
+        the first exception (in call order) is raised once all of the calls
+        have finished.
+    :type return_exceptions: bool
+    :returns: The results of the calls, in the same order as the calls.
+    :rtype: List[Any]
+    """
+    return _gather_sync([(call, timeout) for call in calls],
+                        return_exceptions=return_exceptions)
+
+
+def _gather_sync(calls, return_exceptions=False):
+    """Run the (call, timeout) pairs concurrently in the async thread.
+
+    :param calls: The co-routines or async functions, with their timeouts.
+    :type calls: List[Tuple[Union[Coroutine, function], Optional[float]]]
+    :param return_exceptions: See `gather_sync()`
+    :type return_exceptions: bool
+    :returns: The results of the calls, in the same order as the calls.
+    :rtype: List[Any]
+    """
+    if not calls:
+        return []
+
+    async def _call(call, timeout):
+        if inspect.iscoroutinefunction(call):
+            call = call()
+        if timeout is None:
+            return await call
+        return await asyncio.wait_for(call, timeout)
+
+    async def _runner():
+        return await asyncio.gather(
+            *[_call(call, timeout) for call, timeout in calls],
+            return_exceptions=True)
+
+    try:
+        results = sync_wrapper(_runner)()
+    except BaseException:
+        _close_calls(calls)
+        raise
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    return results
+
+
+def _close_calls(calls):
+    """Close any co-routines in calls that were never awaited.
+
+    :param calls: The co-routines or async functions, with their timeouts.
+    :type calls: List[Tuple[Union[Coroutine, function], Optional[float]]]
+    """
+    for call, _ in calls:
+        if inspect.iscoroutine(call) and inspect.getcoroutinestate(
+                call) == inspect.CORO_CREATED:
+            call.close()
+
+
+class SyncBatch(object):
+    """A batch of async calls that are run together with `gather_sync()`.
+
+    Use `sync_batch()` to create one; the results are available as
+    ``results`` once the ``with`` block has finished.
+    """
+
+    def __init__(self, timeout=None):
+        """Initialise the batch.
+
+        :param timeout: The default per-call timeout, None for no timeout
+        :type timeout: Optional[float]
+        """
+        self.timeout = timeout
+        self.results = None
+        self._calls = []
+
+    def __len__(self):
+        """Return the number of calls in the batch."""
+        return len(self._calls)
+
+    def add(self, call, timeout=None):
+        """Add a call to the batch.
+
+        :param call: The co-routine or async function to run.
+        :type call: Union[Coroutine, function]
+        :param timeout: The timeout for this call; defaults to the batch
+            timeout.
+        :type timeout: Optional[float]
+        :returns: The index of the call's result in ``results``
+        :rtype: int
+        """
+        if self.results is not None:
+            raise RuntimeError("The batch has already been run.")
+        self._calls.append(
+            (call, self.timeout if timeout is None else timeout))
+        return len(self._calls) - 1
+
+    def run(self, return_exceptions=False):
+        """Run all of the calls in the batch concurrently.
+
+        :param return_exceptions: See `gather_sync()`
+        :type return_exceptions: bool
+        :returns: The results of the calls, in the order they were added.
+        :rtype: List[Any]
+        """
+        calls, self._calls = self._calls, []
+        self.results = _gather_sync(calls,
+                                    return_exceptions=return_exceptions)
+        return self.results
+
+    def close(self):
+        """Discard the calls in the batch without running them."""
+        calls, self._calls = self._calls, []
+        _close_calls(calls)
+
+
+@contextlib.contextmanager
+def sync_batch(timeout=None, return_exceptions=False):
+    """Collect async calls from sync code and run them together on exit.
+
+    e.g.
+
+        with zaza.sync_batch(timeout=60) as batch:
+            for unit_name in unit_names:
+                batch.add(model.async_run_on_unit(unit_name, 'uptime'))
+        results = batch.results
+
+    If the body of the ``with`` block raises then none of the calls are run.
+
+    :param timeout: The default per-call timeout, None for no timeout
+    :type timeout: Optional[float]
+    :param return_exceptions: See `gather_sync()`
+    :type return_exceptions: bool
+    :returns: context manager yielding the batch
+    :rtype: Iterator[SyncBatch]
+    """
+    batch = SyncBatch(timeout=timeout)
+    try:
+        yield batch
+    except BaseException:
+        batch.close()
+        raise
+    batch.run(return_exceptions=return_exceptions)
+
+
 def run(*steps):
     """Run the given steps in an asyncio loop.
 
@@ -15,6 +15,7 @@
 """Run deploy phase."""
 import asyncio
 import argparse
+import functools
 import jinja2
 import logging
 import os
@@ -24,6 +25,8 @@ import tenacity
 import yaml
 
 import zaza.controller
+import zaza.events
+from zaza.events.types import Events
 import zaza.model
 import zaza.charm_lifecycle.utils as utils
 from zaza.notifications import (
@@ -366,11 +369,36 @@ def deploy_bundle(bundle, model, model_ctxt=None, force=False, trust=False):
             wait=tenacity.wait_exponential(
                 multiplier=1, min=2, max=10)):
             with attempt:
-                utils.check_output_logging(cmd)
+                metrics = utils.check_output_logging(
+                    cmd,
+                    line_callback=functools.partial(
+                        _log_deploy_output_event, model))
+    logging.info("Deployed bundle '{}' on to '{}' model in {:.1f}s ({} lines "
+                 "of output)".format(bundle, model, metrics.duration,
+                                     metrics.lines))
+    run_report.register_metric(
+        'Deploy Bundle {}'.format(model),
+        dict(metrics._asdict()))
+    return metrics
+
+
+def _log_deploy_output_event(model, line):
+    """Forward a line of juju deploy output to the events subsystem.
+
+    :param model: Name of model the bundle is being deployed in
+    :type model: str
+    :param line: The line of output
+    :type line: str
+    """
+    zaza.events.get_global_event_logger_instance().log(
+        Events.COMMENT,
+        item=model,
+        comment=line)
 
 
 def deploy(bundle, model, wait=True, model_ctxt=None, force=False,
-           test_directory=None, trust=False, ignore_hard_deploy_errors=False):
+           test_directory=None, trust=False, ignore_hard_deploy_errors=False,
+           concurrent=False):
     """Run all steps to complete deployment.
 
     :param bundle: Path to bundle file
@@ -389,19 +417,28 @@ def deploy(bundle, model, wait=True, model_ctxt=None, force=False,
     :param ignore_hard_deploy_error: Whether to ignore chrms going into an
                                      error state during deployment.
     :type ignore_hard_deploy_error: Boolean
+    :param concurrent: Whether other models are being deployed at the same
+                       time, in other threads.  If so the current model isn't
+                       set (the model is always passed explicitly) and the
+                       run_report events are named for the model.
+    :type concurrent: Boolean
     """
+    def _event(name):
+        return '{} {}'.format(name, model) if concurrent else name
+
     utils.set_base_test_dir(test_dir=test_directory)
-    run_report.register_event_start('Deploy Bundle')
+    run_report.register_event_start(_event('Deploy Bundle'))
     with notify_around(NotifyEvents.DEPLOY_BUNDLE, bundle=bundle, model=model,
                        model_ctxt=model_ctxt, force=force, trust=trust):
         deploy_bundle(bundle, model, model_ctxt=model_ctxt, force=force,
                       trust=trust)
-    run_report.register_event_finish('Deploy Bundle')
+    run_report.register_event_finish(_event('Deploy Bundle'))
     if wait:
-        run_report.register_event_start('Wait for Deployment')
+        run_report.register_event_start(_event('Wait for Deployment'))
         test_config = utils.get_charm_config()
         logging.info("Waiting for environment to settle")
-        zaza.model.set_juju_model(model)
+        if not concurrent:
+            zaza.model.set_juju_model(model)
         deploy_ctxt = deployment_env.get_deployment_context()
         timeout = int(deploy_ctxt.get('TEST_DEPLOY_TIMEOUT', '3600'))
         max_resolve_count = int(deploy_ctxt.get('TEST_MAX_RESOLVE_COUNT', 0))
@@ -416,7 +453,7 @@ def deploy(bundle, model, wait=True, model_ctxt=None, force=False,
                 timeout=timeout,
                 max_resolve_count=max_resolve_count,
                 ignore_hard_errors=ignore_hard_deploy_errors)
-        run_report.register_event_finish('Wait for Deployment')
+        run_report.register_event_finish(_event('Wait for Deployment'))
 
 
 def parse_args(args):
@@ -17,6 +17,7 @@ import argparse
 import asyncio
 import sys
 
+import zaza.charm_lifecycle.utils as utils
 import zaza.controller
 import zaza.utilities.cli as cli_utils
 import zaza.utilities.juju as juju_utils
@@ -34,7 +35,7 @@ def destroy(model_name):
     :param model: Name of model to remove
     :type bundle: str
     """
-    machines = model.get_status()["machines"]
+    machines = model.get_status(model_name=model_name)["machines"]
     zaza.controller.destroy_model(model_name)
     if juju_utils.get_provider_type() == "openstack":
         # only import openstack_provider if it's needed.  This avoids forcing
@@ -43,6 +44,19 @@ def destroy(model_name):
         op.clean_up_instances(model_name, machines)
 
 
+def destroy_models(model_names):
+    """Destroy several models concurrently.
+
+    Each model is destroyed with `destroy()` in its own worker thread; all of
+    the models are attempted even if one of them fails, and then the first
+    failure is raised.
+
+    :param model_names: Names of the models to remove
+    :type model_names: List[str]
+    """
+    utils.run_concurrently(destroy, model_names)
+
+
 def parse_args(args):
     """Parse command line arguments.
 
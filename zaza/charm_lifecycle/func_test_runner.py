@@ -16,6 +16,7 @@
 import argparse
 import asyncio
 import logging
+import multiprocessing
 import os
 import sys
 import yaml
@@ -32,6 +33,7 @@ import zaza.model
 from zaza.notifications import notify_around, NotifyEvents
 import zaza.plugins
 import zaza.utilities.cli as cli_utils
+import zaza.utilities.exceptions as zaza_exceptions
 import zaza.utilities.run_report as run_report
 
 # Default: destroy any model after being used
@@ -96,7 +98,8 @@ def failure_report(model_aliases, show_juju_status=False):
 
 def run_env_deployment(env_deployment, keep_model=DESTROY_MODEL, force=False,
                        test_directory=None, trust=False,
-                       ignore_hard_deploy_errors=False):
+                       ignore_hard_deploy_errors=False,
+                       concurrent_models=False):
     """Run the environment deployment.
 
     :param env_deployment: Environment Deploy to execute.
@@ -112,6 +115,11 @@ def run_env_deployment(env_deployment, keep_model=DESTROY_MODEL, force=False,
     :param ignore_hard_deploy_error: Whether to ignore chrms going into an
                                      error state during deployment.
     :type ignore_hard_deploy_error: Boolean
+    :param concurrent_models: Whether to prepare, deploy and settle the models
+                              of an unordered environment deployment
+                              concurrently.  Configure and test steps are
+                              always run in turn.
+    :type concurrent_models: Boolean
     """
     config_steps = utils.get_config_steps()
     test_steps = utils.get_test_steps()
@@ -121,12 +129,23 @@ def run_env_deployment(env_deployment, keep_model=DESTROY_MODEL, force=False,
                      for model_deploy in env_deployment.model_deploys}
     zaza.model.set_juju_model_aliases(model_aliases)
 
-    for deployment in env_deployment.model_deploys:
+    concurrent = concurrent_models and env_deployment.unordered
+    if concurrent:
+        for_each_model = utils.run_concurrently
+    else:
+        def for_each_model(f, model_deploys):
+            return [f(model_deploy) for model_deploy in model_deploys]
+
+    def _prepare(deployment):
         prepare.prepare(
             deployment.model_name,
             deployment.model_alias,
             test_directory=test_directory)
 
+    run_report.register_event_start('Prepare Models')
+    for_each_model(_prepare, env_deployment.model_deploys)
+    run_report.register_event_finish('Prepare Models')
+
     for deployment in env_deployment.model_deploys:
         # Before deploy
         before_deploy.before_deploy(
@@ -134,40 +153,51 @@ def run_env_deployment(env_deployment, keep_model=DESTROY_MODEL, force=False,
             before_deploy_steps.get(deployment.model_alias, []),
             test_directory=test_directory)
 
+    def _deploy(deployment):
+        force_ = force or utils.is_config_deploy_forced_for_bundle(
+            deployment.bundle)
+        trust_ = trust or utils.is_config_deploy_trusted_for_bundle(
+            deployment.bundle)
+        errors_ = (ignore_hard_deploy_errors or
+                   utils.ignore_hard_deploy_errors(deployment.bundle))
+        # The current model is process wide, so it can't be set by the
+        # deploys running concurrently in threads.
+        deploy.deploy(
+            os.path.join(
+                utils.get_bundle_dir(),
+                '{}.yaml'.format(deployment.bundle)),
+            deployment.model_name,
+            model_ctxt=model_aliases,
+            force=force_,
+            trust=trust_,
+            test_directory=test_directory,
+            ignore_hard_deploy_errors=errors_,
+            concurrent=concurrent)
+
+    def _settle(deployment):
+        logging.info("Waiting for {} to settle".format(
+            deployment.model_name))
+        errors_ = (ignore_hard_deploy_errors or
+                   utils.ignore_hard_deploy_errors(deployment.bundle))
+        with notify_around(NotifyEvents.WAIT_MODEL_SETTLE,
+                           model_name=deployment.model_name):
+            zaza.model.block_until_all_units_idle(
+                ignore_hard_errors=errors_,
+                model_name=deployment.model_name)
+        logging.info("Model {} has settled".format(
+            deployment.model_name))
+
     try:
-        for deployment in env_deployment.model_deploys:
-            force_ = force or utils.is_config_deploy_forced_for_bundle(
-                deployment.bundle)
-            trust_ = trust or utils.is_config_deploy_trusted_for_bundle(
-                deployment.bundle)
-            errors_ = (ignore_hard_deploy_errors or
-                       utils.ignore_hard_deploy_errors(deployment.bundle))
-            deploy.deploy(
-                os.path.join(
-                    utils.get_bundle_dir(),
-                    '{}.yaml'.format(deployment.bundle)),
-                deployment.model_name,
-                model_ctxt=model_aliases,
-                force=force_,
-                trust=trust_,
-                test_directory=test_directory,
-                ignore_hard_deploy_errors=errors_)
+        run_report.register_event_start('Deploy Models')
+        for_each_model(_deploy, env_deployment.model_deploys)
+        run_report.register_event_finish('Deploy Models')
 
         # When deploying bundles with cross model relations, hooks may be
         # triggered in already deployedi models so wait for all models to
         # settle.
-        for deployment in env_deployment.model_deploys:
-            logging.info("Waiting for {} to settle".format(
-                deployment.model_name))
-            errors_ = (ignore_hard_deploy_errors or
-                       utils.ignore_hard_deploy_errors(deployment.bundle))
-            with notify_around(NotifyEvents.WAIT_MODEL_SETTLE,
-                               model_name=deployment.model_name):
-                zaza.model.block_until_all_units_idle(
-                    ignore_hard_errors=errors_,
-                    model_name=deployment.model_name)
-            logging.info("Model {} has settled".format(
-                deployment.model_name))
+        run_report.register_event_start('Settle Models')
+        for_each_model(_settle, env_deployment.model_deploys)
+        run_report.register_event_finish('Settle Models')
 
         for deployment in env_deployment.model_deploys:
             logging.info("configuring {}".format(deployment.model_name))
@@ -209,20 +239,121 @@ def run_env_deployment(env_deployment, keep_model=DESTROY_MODEL, force=False,
 
 
 def destroy_models(model_aliases, destroy):
-    """Destroy models created during integration tests."""
+    """Destroy models created during integration tests.
+
+    The models for all of the aliases are destroyed concurrently.
+    """
     # Destroy
     # Keep the model from the last run if keep_model is true, this is to
     # maintain compat with osci and should change when the zaza collect
     # functions take over from osci for artifact collection.
-    for model_name in model_aliases.values():
-        destroy.destroy(model_name)
+    destroy.destroy_models(model_aliases.values())
     zaza.model.unset_juju_model_aliases()
 
 
+def _run_env_deployment_worker(env_deployment, run_kwargs, test_directory,
+                               log_level):
+    """Run an environment deploy in a worker process.
+
+    This is the entry point of the worker processes used by
+    `func_test_runner()` when jobs > 1.  Each worker process runs exactly one
+    environment deploy, so that the module globals (e.g. CURRENT_MODEL and
+    MODEL_ALIASES) are isolated from the other environment deploys.
+
+    :param env_deployment: Environment Deploy to execute.
+    :type env_deployment: utils.EnvironmentDeploy
+    :param run_kwargs: The keyword arguments for `run_env_deployment()`
+    :type run_kwargs: Dict[str, Any]
+    :param test_directory: Set the directory containing tests.yaml and bundles.
+    :type test_directory: str
+    :param log_level: The log level to use in the worker.
+    :type log_level: str
+    :returns: the name of the environment deploy, the error (None on success)
+              and the run_report events and metrics of the worker.
+    :rtype: Dict[str, Any]
+    """
+    cli_utils.setup_logging(log_level=log_level, prefix=env_deployment.name)
+    utils.set_base_test_dir(test_dir=test_directory)
+    # Load the tests.yaml, and with it the tests_options, in this process.
+    utils.get_charm_config()
+    error = None
+    try:
+        zaza.plugins.find_and_configure_plugins([env_deployment])
+        with notify_around(NotifyEvents.BUNDLE, env_deployment=env_deployment):
+            run_env_deployment(env_deployment, test_directory=test_directory,
+                               **run_kwargs)
+    except Exception as e:
+        logging.exception("Environment deploy {} failed"
+                          .format(env_deployment.name))
+        error = "{}: {}".format(e.__class__.__name__, str(e))
+    finally:
+        zaza.clean_up_libjuju_thread()
+    return {
+        'name': env_deployment.name,
+        'error': error,
+        'events': run_report.get_copy_of_events(),
+        'metrics': run_report.get_copy_of_metrics()}
+
+
+def run_env_deployments_in_parallel(env_deployments, jobs, test_directory=None,
+                                    **run_kwargs):
+    """Run environment deploys concurrently in worker processes.
+
+    Up to jobs environment deploys are run at the same time, each in its own
+    (spawned) worker process with its own log prefix.  The results are
+    summarised once they have all finished, and their run_report events and
+    metrics are added to this process's run report, prefixed with the
+    environment deploy name.
+
+    :param env_deployments: The Environment Deploys to execute, together with
+                            the keep_model value for each.
+    :type env_deployments: List[Tuple[utils.EnvironmentDeploy, int]]
+    :param jobs: The maximum number of concurrent worker processes.
+    :type jobs: int
+    :param test_directory: Set the directory containing tests.yaml and bundles.
+    :type test_directory: str
+    :param run_kwargs: Other keyword arguments for `run_env_deployment()`
+    :type run_kwargs: Dict[str, Any]
+    :raises: zaza_exceptions.EnvironmentDeploysFailed if any of the
+             environment deploys failed.
+    """
+    log_level = logging.getLevelName(logging.getLogger().getEffectiveLevel())
+    worker_args = []
+    for env_deployment, keep_model in env_deployments:
+        kwargs = dict(run_kwargs, keep_model=keep_model)
+        worker_args.append(
+            (env_deployment, kwargs, test_directory, log_level))
+    # spawn rather than fork, as the parent may already have a libjuju thread
+    # and connections that must not be shared with the workers.
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(processes=jobs, maxtasksperchild=1) as pool:
+        results = pool.starmap(_run_env_deployment_worker, worker_args)
+    failed = []
+    logging.info("Summary of environment deploys:")
+    for result in results:
+        for event_name, event in result['events'].items():
+            for state, timestamp in event.items():
+                run_report.register_event(
+                    "{}: {}".format(result['name'], event_name),
+                    state, timestamp=timestamp)
+        for metric_name, value in result['metrics'].items():
+            run_report.register_metric(
+                "{}: {}".format(result['name'], metric_name), value)
+        if result['error'] is None:
+            logging.info("  {}: PASSED".format(result['name']))
+        else:
+            logging.error("  {}: FAILED ({})".format(
+                result['name'], result['error']))
+            failed.append(result['name'])
+    if failed:
+        raise zaza_exceptions.EnvironmentDeploysFailed(
+            "Environment deploys failed: {}".format(', '.join(failed)))
+
+
 def func_test_runner(keep_last_model=False, keep_all_models=False,
                      keep_faulty_model=False, smoke=False, dev=False,
                      bundles=None, force=False, test_directory=None,
-                     trust=False):
+                     trust=False, concurrent_models=False, jobs=1):
     """Deploy bundles and run the tests as defined by the charms tests.yaml.
 
     :param keep_last_model: Whether to destroy last model at end of run
@@ -249,6 +380,13 @@ def func_test_runner(keep_last_model=False, keep_all_models=False,
     :type trust: Boolean
     :param test_directory: Set the directory containing tests.yaml and bundles.
     :type test_directory: str
+    :param concurrent_models: Whether to prepare, deploy and settle the models
+                              of unordered environment deployments
+                              concurrently.
+    :type concurrent_models: Boolean
+    :param jobs: The number of environment deploys to run concurrently, each
+                 in a separate worker process.
+    :type jobs: int
     """
     utils.set_base_test_dir(test_dir=test_directory)
     if bundles is not None:
@@ -299,6 +437,7 @@ def func_test_runner(keep_last_model=False, keep_all_models=False,
 
     # Now run the deploys
     last_test = environment_deploys[-1].name
+    env_deployments = []
     for env_deployment in environment_deploys:
         preserve_model = DESTROY_MODEL
         if (
@@ -308,11 +447,20 @@ def func_test_runner(keep_last_model=False, keep_all_models=False,
             preserve_model = KEEP_MODEL
         elif keep_faulty_model:
             preserve_model = KEEP_FAULTY_MODEL
+        env_deployments.append((env_deployment, preserve_model))
+
+    if jobs > 1 and len(env_deployments) > 1:
+        run_env_deployments_in_parallel(
+            env_deployments, jobs, test_directory=test_directory,
+            force=force, trust=trust, concurrent_models=concurrent_models)
+        return
 
+    for env_deployment, preserve_model in env_deployments:
         with notify_around(NotifyEvents.BUNDLE, env_deployment=env_deployment):
             run_env_deployment(env_deployment, keep_model=preserve_model,
                                force=force, test_directory=test_directory,
-                               trust=trust)
+                               trust=trust,
+                               concurrent_models=concurrent_models)
 
 
 def parse_args(args):
@@ -359,6 +507,13 @@ def parse_args(args):
     parser.add_argument('-t', '--trust', dest='trust',
                         help='Pass --trust to the juju deploy command',
                         action='store_true')
+    parser.add_argument('--concurrent-models', dest='concurrent_models',
+                        help=('Prepare, deploy and settle the models of '
+                              'multi-model (unordered) bundles concurrently'),
+                        action='store_true')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int,
+                        help=('Run up to JOBS bundles concurrently, each in '
+                              'a separate worker process'))
     parser.add_argument('--log', dest='loglevel',
                         help='Loglevel [DEBUG|INFO|WARN|ERROR|CRITICAL]')
     cli_utils.add_test_directory_argument(parser)
@@ -367,6 +522,8 @@ def parse_args(args):
                         keep_faulty_model=False,
                         smoke=False,
                         dev=False,
+                        concurrent_models=False,
+                        jobs=1,
                         loglevel='INFO')
     return parser.parse_args(args)
 
@@ -398,6 +555,9 @@ def main():
         raise ValueError('Ambiguous arguments: --bundle and '
                          '--smoke cannot be used together')
 
+    if args.jobs < 1:
+        raise ValueError('--jobs must be at least 1')
+
     if args.force:
         logging.warn("Using the --force argument for 'juju deploy'. Note "
                      "that this disables juju checks for compatibility.")
@@ -411,7 +571,9 @@ def main():
             bundles=args.bundles,
             force=args.force,
             trust=args.trust,
-            test_directory=args.test_directory)
+            test_directory=args.test_directory,
+            concurrent_models=args.concurrent_models,
+            jobs=args.jobs)
         run_report.output_event_report()
     finally:
         zaza.clean_up_libjuju_thread()
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 """Utilities to support running lifecycle phases."""
+import asyncio
 import collections
+import concurrent.futures
 import copy
 import importlib
 import logging
@@ -26,6 +28,7 @@ import yaml
 
 from string import Template
 
+import zaza
 import zaza.global_options
 import zaza.utilities.deployment_env as deployment_env
 
@@ -43,6 +46,9 @@ SINGLE_ALIASED = "single-aliased"
 MUTLI_UNORDERED = "multi-unordered"
 MUTLI_ORDERED = "multi-ordered"
 
+# Longest line of command output that can be read; juju can emit long lines.
+COMMAND_OUTPUT_LINE_LIMIT = 1024 * 1024
+
 """
   A ModelDeploy represents a deployment of one bundle to one model. An
   EnvironmentDeploy consists of ModelDeploys. Some tests, such as cross model
@@ -62,7 +68,14 @@ MUTLI_ORDERED = "multi-ordered"
 ModelDeploy = collections.namedtuple(
     'ModelDeploy', ['model_alias', 'model_name', 'bundle'])
 EnvironmentDeploy = collections.namedtuple(
-    'EnvironmentDeploy', ['name', 'model_deploys', 'run_in_series'])
+    'EnvironmentDeploy',
+    ['name', 'model_deploys', 'run_in_series', 'unordered'])
+# unordered is True if the models don't depend on each other, so they may be
+# deployed concurrently (see func_test_runner's concurrent_models); it
+# defaults to False.
+EnvironmentDeploy.__new__.__defaults__ = (False,)
+CommandOutputMetrics = collections.namedtuple(
+    'CommandOutputMetrics', ['duration', 'lines'])
 
 default_deploy_number = 0
 
@@ -228,7 +241,7 @@ def get_environment_deploy_multi_unordered(deployment_directive):
                 alias,
                 generate_model_name(),
                 bundle))
-    return EnvironmentDeploy(env_alias, model_deploys, True)
+    return EnvironmentDeploy(env_alias, model_deploys, True, unordered=True)
 
 
 def get_environment_deploy_single_aliased(deployment_directive):
@@ -558,26 +571,118 @@ def generate_model_name():
     return tpl.safe_substitute({"UUID": str(uuid.uuid4())[-12:]})
 
 
-def check_output_logging(cmd):
+def run_concurrently(f, items):
+    """Call f(item) for each of the items concurrently, in worker threads.
+
+    All of the calls are made even if some of them fail, and then the first
+    failure (in the order of the items) is raised.  When libjuju isn't run in
+    a background thread (zaza.RUN_LIBJUJU_IN_THREAD is False) the calls are
+    made in turn, as the loop can't be shared between threads.
+
+    :param f: the function to call with each item
+    :type f: Callable[[Any], Any]
+    :param items: the items to call f with
+    :type items: Iterable[Any]
+    :returns: the results of the calls, in the order of the items
+    :rtype: List[Any]
+    """
+    items = list(items)
+    if len(items) < 2 or not zaza.RUN_LIBJUJU_IN_THREAD:
+        return [f(item) for item in items]
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(items)) as executor:
+        futures = [executor.submit(f, item) for item in items]
+    return [future.result() for future in futures]
+
+
+async def _async_read_output_line(stream):
+    """Read a line of command output from stream.
+
+    A line longer than the stream's limit is returned in pieces, rather than
+    raising, as StreamReader.readline() would.
+
+    :param stream: the stream to read from
+    :type stream: asyncio.StreamReader
+    :returns: the line, or b'' at EOF
+    :rtype: bytes
+    """
+    try:
+        return await stream.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        # EOF; the last line may not have a newline.
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        # e.consumed is where the newline is, if it has been read; take it
+        # too so that it isn't read as an empty line.
+        return await stream.read(e.consumed + 1)
+
+
+async def async_check_output_logging(cmd, line_callback=None):
+    """Run command, logging its output as it is produced.
+
+    Output is read until the pipe reaches EOF, rather than until the process
+    exits, so that lines still buffered when the command finishes are not
+    lost.  As this is a co-routine, several commands can be driven
+    concurrently from the one event loop.  If it is cancelled, the command is
+    killed.
+
+    line_callback is called in the loop's default executor, rather than on
+    the loop, so that a slow callback (e.g. one doing file I/O) doesn't hold
+    up the other co-routines.  The lines are still passed to it in order.
+
+    :param cmd: Shell command to run
+    :type cmd: List
+    :param line_callback: Optional function called with each line of output.
+    :type line_callback: Optional[Callable[[str], None]]
+    :returns: The duration and the number of lines output by the command.
+    :rtype: CommandOutputMetrics
+    :raises: subprocess.CalledProcessError
+    """
+    loop = asyncio.get_event_loop()
+    start = time.time()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        limit=COMMAND_OUTPUT_LINE_LIMIT)
+    lines = 0
+    try:
+        while True:
+            line = await _async_read_output_line(process.stdout)
+            if not line:
+                break
+            line = line.decode('utf-8', errors='replace').strip()
+            lines += 1
+            logging.info(line)
+            if line_callback:
+                await loop.run_in_executor(None, line_callback, line)
+        returncode = await process.wait()
+    finally:
+        if process.returncode is None:
+            # e.g. cancelled; don't leave the command running.
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return CommandOutputMetrics(
+        duration=time.time() - start,
+        lines=lines)
+
+
+def check_output_logging(cmd, line_callback=None):
     """Run command and log output.
 
     :param cmd: Shell command to run
     :type cmd: List
+    :param line_callback: Optional function called with each line of output.
+    :type line_callback: Optional[Callable[[str], None]]
+    :returns: The duration and the number of lines output by the command.
+    :rtype: CommandOutputMetrics
     :raises: subprocess.CalledProcessError
     """
-    popen = subprocess.Popen(
+    return zaza.sync_wrapper(async_check_output_logging)(
         cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        universal_newlines=True)
-    for line in iter(popen.stdout.readline, ""):
-        # popen.poll checks if child process has terminated. If it has it
-        # returns the returncode. If it has not it returns None.
-        if popen.poll() is not None:
-            break
-        logging.info(line.strip())
-    popen.stdout.close()
-    while popen.poll() is None:
-        time.sleep(0.5)
-    if popen.returncode:
-        raise subprocess.CalledProcessError(popen.returncode, cmd)
+        line_callback=line_callback)
@@ -15,8 +15,10 @@
 """Module for interacting with a juju controller."""
 
 import asyncio
+from async_generator import async_generator, yield_, asynccontextmanager
 import logging
 import subprocess
+import time
 
 from juju.controller import Controller
 
@@ -24,6 +26,154 @@ from zaza import sync_wrapper
 import zaza.utilities.exceptions
 
 
+# A collection of controller name -> libjuju controller associations, so that
+# a single connection is shared by all the controller operations.  The current
+# controller is stored under the name None.
+ControllerRefs = {}
+
+# The number of users of each memoed controller connection, and the
+# controllers that should be disconnected once their last user is done.
+ControllerRefCounts = {}
+_controllers_to_remove = set()
+
+# In flight connections, so that concurrent callers share a connection.
+_controller_connect_futures = {}
+
+# Polling of list_models() while waiting for a destroyed model to go away.  The
+# interval starts short and doubles up to the maximum.
+DESTROY_MODEL_POLL_INTERVAL = 1.0
+DESTROY_MODEL_POLL_MAX_INTERVAL = 10.0
+DESTROY_MODEL_TIMEOUT = 200.0
+
+
+def is_controller_disconnected(controller):
+    """Return True if the controller is disconnected.
+
+    :param controller: the controller to check
+    :type controller: :class:'juju.controller.Controller'
+    :returns: True if disconnected
+    :rtype: bool
+    """
+    return not (controller.is_connected() and controller.connection().is_open)
+
+
+async def _async_connect_controller(controller_name):
+    """Replace the memoed controller with a new connection.
+
+    :param controller_name: the controller to connect to; None for current.
+    :type controller_name: Optional[str]
+    :returns: the connected controller
+    :rtype: :class:'juju.controller.Controller'
+    """
+    old_controller = ControllerRefs.pop(controller_name, None)
+    if old_controller is not None:
+        logging.warning("Controller connection dropped; reconnecting.")
+        try:
+            await old_controller.disconnect()
+        except Exception:
+            pass
+    start = time.time()
+    controller = Controller()
+    if controller_name is None:
+        await controller.connect()
+    else:
+        await controller.connect(controller_name)
+    logging.debug("Connected to controller {} in {:.3f}s"
+                  .format(controller_name or "(current)",
+                          time.time() - start))
+    ControllerRefs[controller_name] = controller
+    return controller
+
+
+async def get_controller_memo(controller_name=None):
+    """Get the (connected) libjuju Controller object for a name.
+
+    This is memoed so that all of the controller operations share a single
+    connection for the duration of the run.  If the connection has dropped
+    then it is reconnected.  Use `controller_connection()` to hold a
+    reference to the connection while using it.
+
+    :param controller_name: the controller to connect to; None for current.
+    :type controller_name: Optional[str]
+    :returns: the connected controller
+    :rtype: :class:'juju.controller.Controller'
+    """
+    controller = ControllerRefs.get(controller_name)
+    if controller is not None and not is_controller_disconnected(controller):
+        return controller
+    future = _controller_connect_futures.get(controller_name)
+    if future is None or future.done():
+        future = asyncio.ensure_future(
+            _async_connect_controller(controller_name))
+        _controller_connect_futures[controller_name] = future
+
+        def _done(f):
+            if _controller_connect_futures.get(controller_name) is f:
+                del _controller_connect_futures[controller_name]
+
+        future.add_done_callback(_done)
+    return await asyncio.shield(future)
+
+
+@asynccontextmanager
+@async_generator
+async def controller_connection(controller_name=None):
+    """Context manager for using the memoed controller connection.
+
+    The connection is reference counted, so that `remove_controller_memo()`
+    only disconnects it once it is no longer in use.
+
+       Example:
+           async with controller_connection() as controller:
+               await controller.list_models()
+
+    :param controller_name: the controller to connect to; None for current.
+    :type controller_name: Optional[str]
+    :returns: the connected controller
+    :rtype: Iterator[:class:'juju.controller.Controller']
+    """
+    controller = await get_controller_memo(controller_name)
+    ControllerRefCounts[controller_name] = (
+        ControllerRefCounts.get(controller_name, 0) + 1)
+    try:
+        await yield_(controller)
+    finally:
+        ControllerRefCounts[controller_name] -= 1
+        if (not ControllerRefCounts[controller_name] and
+                controller_name in _controllers_to_remove):
+            await remove_controller_memo(controller_name)
+
+
+async def remove_controller_memo(controller_name=None):
+    """Remove/disconnect a memoed controller connection.
+
+    If the connection is still in use, then it is disconnected when the last
+    user has finished with it.
+
+    :param controller_name: the controller to remove; None for current.
+    :type controller_name: Optional[str]
+    """
+    if ControllerRefCounts.get(controller_name):
+        _controllers_to_remove.add(controller_name)
+        return
+    _controllers_to_remove.discard(controller_name)
+    ControllerRefCounts.pop(controller_name, None)
+    try:
+        controller = ControllerRefs.pop(controller_name)
+        await controller.disconnect()
+    except KeyError:
+        pass
+    except Exception as e:
+        logging.error("Couldn't disconnect from controller: {}"
+                      .format(str(e)))
+
+
+async def remove_controllers_memo():
+    """Remove all the controller connections that are memoed."""
+    for controller_name in list(ControllerRefs.keys()):
+        await remove_controller_memo(controller_name)
+
+
 async def async_add_model(
     model_name, config=None, cloud_name=None, credential_name=None, region=None
 ):
@@ -36,20 +186,18 @@ async def async_add_model(
     :param region: Region in which to create the model.
     :type region: str
     """
-    controller = Controller()
-    await controller.connect()
-    logging.debug("Adding model {}".format(model_name))
-    model = await controller.add_model(
-        model_name,
-        config=config,
-        cloud_name=cloud_name,
-        credential_name=credential_name,
-        region=region,
-    )
+    async with controller_connection() as controller:
+        logging.debug("Adding model {}".format(model_name))
+        model = await controller.add_model(
+            model_name,
+            config=config,
+            cloud_name=cloud_name,
+            credential_name=credential_name,
+            region=region,
+        )
     # issue/135 It is necessary to disconnect the model here or async spews
     # tracebacks even during a successful run.
     await model.disconnect()
-    await controller.disconnect()
 
 add_model = sync_wrapper(async_add_model)
 
@@ -60,9 +208,7 @@ async def async_destroy_model(model_name):
     :param model_name: Name of model to remove
     :type model_name: str
     """
-    controller = Controller()
-    try:
-        await controller.connect()
+    async with controller_connection() as controller:
         logging.info("Destroying model {}".format(model_name))
         await controller.destroy_model(model_name,
                                        destroy_storage=True,
@@ -70,8 +216,10 @@ async def async_destroy_model(model_name):
                                        max_wait=600)
         # The model ought to be destroyed by now.  Let's make sure, and if not,
         # raise an error.  Even if the model has been destroyed, it's still
-        # hangs around in the .list_models() for a little while; retry until it
-        # goes away, or that fails.
+        # hangs around in the .list_models() for a little while; retry, backing
+        # off, until it goes away, or that fails.
+        interval = DESTROY_MODEL_POLL_INTERVAL
+        deadline = time.time() + DESTROY_MODEL_TIMEOUT
         attempt = 1
         while True:
             logging.info("Waiting for model to be fully destroyed: "
@@ -79,18 +227,14 @@ async def async_destroy_model(model_name):
             remaining_models = await controller.list_models()
             if model_name not in remaining_models:
                 break
-            await asyncio.sleep(10)
-            attempt += 1
-            if attempt > 20:
+            if time.time() > deadline:
                 raise zaza.utilities.exceptions.DestroyModelFailed(
                     "Destroying model {} failed." .format(model_name))
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, DESTROY_MODEL_POLL_MAX_INTERVAL)
+            attempt += 1
 
         logging.info("Model {} destroyed.".format(model_name))
-    finally:
-        try:
-            await controller.disconnect()
-        except Exception as e:
-            logging.error("Couldn't disconnect from model: {}".format(str(e)))
 
 destroy_model = sync_wrapper(async_destroy_model)
 
@@ -104,11 +248,8 @@ async def async_cloud(name=None):
     :returns: Information on all clouds in the controller.
     :rtype: CloudResult
     """
-    controller = Controller()
-    await controller.connect()
-    cloud = await controller.cloud(name=name)
-    await controller.disconnect()
-    return cloud
+    async with controller_connection() as controller:
+        return await controller.cloud(name=name)
 
 cloud = sync_wrapper(async_cloud)
 
@@ -132,11 +273,8 @@ async def async_get_cloud():
     :returns: Name of cloud
     :rtype: str
     """
-    controller = Controller()
-    await controller.connect()
-    cloud = await controller.get_cloud()
-    await controller.disconnect()
-    return cloud
+    async with controller_connection() as controller:
+        return await controller.get_cloud()
 
 get_cloud = sync_wrapper(async_get_cloud)
 
@@ -147,11 +285,8 @@ async def async_list_models():
     :returns: List of models
     :rtype: list
     """
-    controller = Controller()
-    await controller.connect()
-    models = await controller.list_models()
-    await controller.disconnect()
-    return models
+    async with controller_connection() as controller:
+        return await controller.list_models()
 
 list_models = sync_wrapper(async_list_models)
 
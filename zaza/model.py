@@ -22,15 +22,20 @@ mostly via libjuju. Async function also provice a non-async alternative via
 import asyncio
 from async_generator import async_generator, yield_, asynccontextmanager
 import collections
+import contextlib
+import copy
 import datetime
+import hashlib
 import inspect
+import json
 import logging
 import os
 import re
+import shlex
 import subprocess
-import tempfile
 import yaml
 from oslo_config import cfg
+from oslo_config import iniparser
 import concurrent
 import time
 
@@ -163,6 +168,9 @@ sync_deployed = sync_wrapper(deployed)
 async def async_get_unit_from_name(unit_name, model=None, model_name=None):
     """Return the units that corresponds to the name in the given model.
 
+    The unit is looked up by name in model.units, rather than by scanning the
+    units of its application.
+
     :param unit_name: Name of unit to match
     :type unit_name: str
     :param model: Model to perform lookup in
@@ -174,21 +182,14 @@ async def async_get_unit_from_name(unit_name, model=None, model_name=None):
     :raises: UnitNotFound
     """
     app = unit_name.split('/')[0]
-    unit = None
-    try:
-        if model is None:
-            model = await get_model(model_name)
-        units = model.applications[app].units
-    except KeyError:
-        msg = ('Application: {} does not exist in current model'.
-               format(app))
-        logging.error(msg)
-        raise UnitNotFound(unit_name)
-    for u in units:
-        if u.entity_id == unit_name:
-            unit = u
-            break
-    else:
+    if model is None:
+        model = await get_model(model_name)
+    unit = model.units.get(unit_name)
+    if unit is None:
+        if app not in model.applications:
+            msg = ('Application: {} does not exist in current model'.
+                   format(app))
+            logging.error(msg)
         raise UnitNotFound(unit_name)
     return unit
 
@@ -199,39 +200,242 @@ get_unit_from_name = sync_wrapper(async_get_unit_from_name)
 # instantiate or handout a model, or start a new one.
 ModelRefs = {}
 
+# Connect and reconnect counts and latencies, keyed by model name.  See
+# get_model_connection_stats().
+ModelConnectionStats = {}
 
-async def get_model_memo(model_name):
-    """Get the libjuju Model object for a name.
+# How often (seconds) to check the health of the memoed model connections so
+# that they can be reconnected in the background; 0 (the default) disables
+# this, as it wakes the libjuju loop on a timer.  Note that libjuju itself
+# pings the controller to keep the connection open.
+MODEL_KEEPALIVE_INTERVAL = 0
 
-    This is memoed as the model is maintained as running in a separate
-    background thread.  Thus, essentially this is a singleton for each of
-    the model names.
+# Reconnection attempts and the exponential backoff between them.
+MODEL_RECONNECT_ATTEMPTS = 5
+MODEL_RECONNECT_BACKOFF = 1.0
+MODEL_RECONNECT_BACKOFF_MAX = 30.0
 
-    :param model_name: the model name to get a Model for.
+# In flight (re)connections, so that concurrent waiters share a connection.
+_model_connect_futures = {}
+# Keepalive (asyncio.TimerHandle) for the memoed models.
+_model_keepalive_handles = {}
+
+
+def _model_connection_stats(model_name):
+    """Return (creating if needed) the ModelConnectionStats for model_name.
+
+    :param model_name: the model name.
     :type model_name: str
+    :returns: the stats for the model
+    :rtype: Dict[str, Any]
+    """
+    return ModelConnectionStats.setdefault(model_name, {
+        'connects': 0,
+        'reconnects': 0,
+        'failures': 0,
+        'connect_time': 0.0,
+        'reconnect_time': 0.0,
+        'last_latency': None,
+        'max_latency': 0.0})
+
+
+def _record_model_connect(model_name, latency, reconnect=False):
+    """Record a connection to model_name in ModelConnectionStats.
+
+    :param model_name: the model that was connected to.
+    :type model_name: str
+    :param latency: how long (seconds) the connection took.
+    :type latency: float
+    :param reconnect: True if this replaced a dropped connection.
+    :type reconnect: bool
+    """
+    stats = _model_connection_stats(model_name)
+    if reconnect:
+        stats['reconnects'] += 1
+        stats['reconnect_time'] += latency
+    else:
+        stats['connects'] += 1
+        stats['connect_time'] += latency
+    stats['last_latency'] = latency
+    stats['max_latency'] = max(stats['max_latency'], latency)
+    logging.debug("Model %s %s in %.3fs", model_name,
+                  "reconnected" if reconnect else "connected", latency)
+
+
+def get_model_connection_stats(model_name=None):
+    """Return the connection counts and latencies for the memoed models.
+
+    The stats for each model are a dictionary of 'connects', 'reconnects' and
+    'failures' counts, and 'connect_time',
+    'reconnect_time' (totals), 'last_latency' and 'max_latency' in seconds.
+
+    :param model_name: the model to return stats for; None for all models.
+    :type model_name: Optional[str]
+    :returns: the stats for model_name, or a dictionary of model name to stats
+    :rtype: Dict[str, Any]
+    """
+    if model_name is not None:
+        return dict(ModelConnectionStats.get(model_name, {}))
+    return {k: dict(v) for k, v in ModelConnectionStats.items()}
+
+
+async def _async_connect_model(model_name, model=None):
+    """Connect a libjuju Model object to model_name.
+
+    If model is passed, then it is a dropped connection that is reconnected in
+    place, retrying with exponential backoff up to MODEL_RECONNECT_ATTEMPTS
+    times.  Otherwise a new Model object is connected.
+
+    :param model_name: the model name to connect to.
+    :type model_name: str
+    :param model: the Model object to reconnect.
+    :type model: Optional[juju.model.Model]
     :returns: juju.model.Model
     """
-    model = None
-    if model_name in ModelRefs:
-        model = ModelRefs[model_name]
-        if is_model_disconnected(model):
-            try:
-                await model.disconnect()
-            except Exception:
-                pass
-            model = None
-            del ModelRefs[model_name]
+    reconnect = model is not None
     if model is None:
         # NOTE(tinwood): Due to
         # https://github.com/juju/python-libjuju/issues/458 set the max frame
         # size to something big to stop "RPC: Connection closed, reconnecting"
         # messages and then failures.
         model = Model(max_frame_size=JUJU_MAX_FRAME_SIZE)
-        await model.connect(model_name)
-        ModelRefs[model_name] = model
+    attempts = MODEL_RECONNECT_ATTEMPTS if reconnect else 1
+    backoff = MODEL_RECONNECT_BACKOFF
+    for attempt in range(1, attempts + 1):
+        start = time.time()
+        try:
+            if reconnect:
+                try:
+                    # clean up anything left over from the dropped
+                    # connection, e.g. the watcher task.
+                    await model.disconnect()
+                except Exception:
+                    pass
+                await model.connect_model(model_name)
+            else:
+                await model.connect(model_name)
+        except asyncio.CancelledError:
+            # e.g. the model memo was removed while connecting.
+            try:
+                await model.disconnect()
+            except Exception:
+                pass
+            raise
+        except Exception as e:
+            _model_connection_stats(model_name)['failures'] += 1
+            if attempt == attempts:
+                raise
+            logging.warning(
+                "Connecting to model %s failed (attempt %s of %s): %s; "
+                "retrying in %.1fs", model_name, attempt, attempts, e, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MODEL_RECONNECT_BACKOFF_MAX)
+            continue
+        _record_model_connect(model_name, time.time() - start,
+                              reconnect=reconnect)
+        return model
+
+
+async def _async_reconnect_model(model_name):
+    """Connect the memoed model for model_name, or reconnect it if dropped.
+
+    A dropped connection is reconnected in place, so that callers holding the
+    Model object (and the state keyed by it, such as change subscriptions)
+    carry on with the same object.
+
+    :param model_name: the model name to get a Model for.
+    :type model_name: str
+    :returns: juju.model.Model
+    """
+    model = await _async_connect_model(model_name,
+                                       model=ModelRefs.get(model_name))
+    ModelRefs[model_name] = model
+    _schedule_model_keepalive(model_name)
     return model
 
 
+def _schedule_model_keepalive(model_name):
+    """Schedule a health check of the memoed model connection.
+
+    :param model_name: the model name to check.
+    :type model_name: str
+    """
+    handle = _model_keepalive_handles.pop(model_name, None)
+    if handle is not None:
+        handle.cancel()
+    if MODEL_KEEPALIVE_INTERVAL:
+        _model_keepalive_handles[model_name] = (
+            asyncio.get_event_loop().call_later(
+                MODEL_KEEPALIVE_INTERVAL, _model_keepalive, model_name))
+
+
+def _model_keepalive(model_name):
+    """Check a memoed model, and reconnect it in the background if needed.
+
+    :param model_name: the model name to check.
+    :type model_name: str
+    """
+    _model_keepalive_handles.pop(model_name, None)
+    model = ModelRefs.get(model_name)
+    if model is None:
+        return
+    if not is_model_disconnected(model):
+        _schedule_model_keepalive(model_name)
+        return
+    logging.warning("model: %s has disconnected, reconnecting in the "
+                    "background", model_name)
+
+    async def _reconnect():
+        try:
+            await get_model_memo(model_name)
+        except Exception as e:
+            logging.error("Reconnecting to model %s failed: %s",
+                          model_name, e)
+
+    asyncio.ensure_future(_reconnect())
+
+
+async def get_model_memo(model_name):
+    """Get the libjuju Model object for a name.
+
+    This is memoed as the model is maintained as running in a separate
+    background thread.  Thus, essentially this is a singleton for each of
+    the model names.
+
+    If the memoed model has disconnected then it is reconnected in place,
+    retrying with exponential backoff.  Concurrent callers share the same
+    (re)connection.
+
+    :param model_name: the model name to get a Model for.
+    :type model_name: str
+    :returns: juju.model.Model
+    """
+    model = ModelRefs.get(model_name)
+    if model is not None and not is_model_disconnected(model):
+        return model
+    return await _async_shared_reconnect_model(model_name)
+
+
+async def _async_shared_reconnect_model(model_name):
+    """(Re)connect the memoed model, sharing a connection already in flight.
+
+    :param model_name: the model name to get a Model for.
+    :type model_name: str
+    :returns: juju.model.Model
+    """
+    future = _model_connect_futures.get(model_name)
+    if future is None or future.done():
+        future = asyncio.ensure_future(_async_reconnect_model(model_name))
+        _model_connect_futures[model_name] = future
+
+        def _done(f):
+            if _model_connect_futures.get(model_name) is f:
+                del _model_connect_futures[model_name]
+
+        future.add_done_callback(_done)
+    return await asyncio.shield(future)
+
+
 async def get_model(model_name=None):
     """Get (or create) the current model for `model_name`.
 
@@ -256,9 +460,20 @@ async def remove_model_memo(model_name):
     :param model_name: the model name to remove a Model object.
     :type model_name: str
     """
+    handle = _model_keepalive_handles.pop(model_name, None)
+    if handle is not None:
+        handle.cancel()
+    view = _model_status_views.pop(model_name, None)
+    if view is not None:
+        view.close()
+    # a (re)connect still in flight mustn't put the model back afterwards.
+    future = _model_connect_futures.pop(model_name, None)
+    if future is not None:
+        future.cancel()
     try:
         model = ModelRefs[model_name]
         del ModelRefs[model_name]
+        _forget_model(model)
         await model.disconnect()
     except Exception:
         pass
@@ -266,8 +481,7 @@ async def remove_model_memo(model_name):
 
 async def remove_models_memo():
     """Remove all the models that are memoed."""
-    model_names = list(ModelRefs.keys())
-    for model_name in model_names:
+    for model_name in list(ModelRefs.keys()):
         await remove_model_memo(model_name)
 
 
@@ -321,12 +535,18 @@ def is_model_disconnected(model):
 async def ensure_model_connected(model):
     """Ensure that the model is connected.
 
-    If model is disconnected then reconnect it.
+    If model is disconnected then reconnect it.  A memoed model is
+    reconnected as get_model_memo() does, so that concurrent waiters share the
+    one reconnection.
 
     :param model: the model to check
     :type model: :class:'juju.Model'
     """
     if is_model_disconnected(model):
+        for model_name, memoed in list(ModelRefs.items()):
+            if memoed is model:
+                await _async_shared_reconnect_model(model_name)
+                return
         model_name = model.info.name
         logging.warning(
             "model: %s has disconnected, forcing full disconnection "
@@ -341,14 +561,154 @@ async def ensure_model_connected(model):
             # model.connection().is_open may be false
             pass
         logging.warning("Attempting to reconnect model %s", model_name)
+        start = time.time()
         await model.connect_model(model_name)
+        _record_model_connect(model_name, time.time() - start,
+                              reconnect=True)
+
+
+# The longest a subscribed waiter goes without re-evaluating its conditions
+# if no deltas arrive for the entities it is waiting on.
+WAITER_FALLBACK_PERIOD = 5.0
+# A map of models <-> the set of ModelChangeSubscriptions on that model.
+_model_change_subscriptions = {}
+
+
+class ModelChangeSubscription:
+    """Wake a waiter when libjuju delivers deltas for particular entities.
+
+    The entities are (entity_type, entity_id) tuples, e.g. ('unit', 'app/0'),
+    ('application', 'app') or ('machine', '0'); an entity_id of None matches
+    every entity of that type.  With no entities, wait() is just a sleep.
+    """
+
+    def __init__(self, entities=None):
+        """Initialise the subscription.
+
+        :param entities: the entities to be woken for.
+        :type entities: Optional[Iterable[Tuple[str, Optional[str]]]]
+        """
+        self.entities = set(entities or [])
+        self.entity_types = set(t for t, _ in self.entities)
+        self._changed = asyncio.Event()
+
+    def notify(self, delta):
+        """Note the delta if it is for one of the subscribed entities.
+
+        :param delta: the delta from the AllWatcher
+        :type delta: juju.delta.EntityDelta
+        """
+        if delta.entity not in self.entity_types:
+            return
+        if ((delta.entity, None) in self.entities or
+                (delta.entity, delta.get_id()) in self.entities):
+            self._changed.set()
+
+    async def wait(self, timeout):
+        """Wait until a subscribed entity changes, or timeout seconds pass.
+
+        Changes that arrived since the last wait() return immediately.
+
+        :param timeout: the fallback poll period.
+        :type timeout: float
+        :returns: True if woken by a change, False if timeout expired.
+        :rtype: bool
+        """
+        if not self.entities:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            changed = True
+        except asyncio.TimeoutError:
+            changed = False
+        self._changed.clear()
+        return changed
+
+
+def _remove_model_observer(model, callable_):
+    """Stop calling callable_ for the model's deltas.
+
+    libjuju has no counterpart to model.add_observer(), so the observers that
+    call callable_ are dropped from the model directly.
+
+    :param model: the model observed
+    :type model: :class:'juju.Model()'
+    :param callable_: the callable passed to model.add_observer()
+    :type callable_: Callable
+    """
+    observers = getattr(model, '_observers', None)
+    if not isinstance(observers, dict):
+        return
+    for observer, observer_callable in list(observers.items()):
+        if observer_callable == callable_:
+            del observers[observer]
+
+
+async def _notify_model_change_subscriptions(delta, old_obj, new_obj, model):
+    """Notify the subscriptions to a model of a delta from its AllWatcher.
+
+    :param delta: the delta
+    :type delta: juju.delta.EntityDelta
+    :param model: the model the delta is for
+    :type model: :class:'juju.Model()'
+    """
+    for subscription in list(_model_change_subscriptions.get(model, ())):
+        subscription.notify(delta)
+
+
+def _forget_model(model):
+    """Drop the per-model state that is keyed by a Model object.
+
+    The model's leader index is closed, and the subscriptions to its changes
+    stop being notified.
+
+    :param model: the model being removed
+    :type model: :class:'juju.Model()'
+    """
+    index = _model_leader_indexes.pop(model, None)
+    if index is not None:
+        index.close()
+    _model_change_subscriptions.pop(model, None)
+    _remove_model_observer(model, _notify_model_change_subscriptions)
+
+
+@contextlib.contextmanager
+def subscribe_model_changes(model, entities=None):
+    """Subscribe to deltas for entities in the model, for a block of code.
+
+    The model's AllWatcher observer is added on the first subscription to the
+    model, and then shared by all the subscriptions to it.
+
+    :param model: the model to watch
+    :type model: :class:'juju.Model()'
+    :param entities: the entities to be woken for; see
+        ModelChangeSubscription.
+    :type entities: Optional[Iterable[Tuple[str, Optional[str]]]]
+    :returns: the subscription to wait() on.
+    :rtype: Iterator[ModelChangeSubscription]
+    """
+    subscription = ModelChangeSubscription(entities)
+    if not subscription.entities:
+        yield subscription
+        return
+    subscriptions = _model_change_subscriptions.get(model)
+    if subscriptions is None:
+        subscriptions = _model_change_subscriptions[model] = set()
+        model.add_observer(_notify_model_change_subscriptions)
+    subscriptions.add(subscription)
+    try:
+        yield subscription
+    finally:
+        subscriptions.discard(subscription)
 
 
 async def block_until_auto_reconnect_model(*conditions,
                                            model=None,
                                            aconditions=None,
                                            timeout=None,
-                                           wait_period=0.5):
+                                           wait_period=None,
+                                           entities=None):
     """Async block on the model until conditions met.
 
     This function doesn't use model.block_until() which unfortunately raises
@@ -375,13 +735,21 @@ async def block_until_auto_reconnect_model(*conditions,
     :param timeout: the timeout to wait for the block on.
     :type timeout: float
     :param wait_period: The time to sleep between checking the conditions.
-    :type wait_period: float
+        If entities are passed, this is the fallback poll period.  Defaults
+        to 0.5 seconds, or WAITER_FALLBACK_PERIOD if entities are passed.
+    :type wait_period: Optional[float]
+    :param entities: if passed, only re-check the conditions when libjuju
+        delivers a delta for one of these entities (or every wait_period);
+        see ModelChangeSubscription.
+    :type entities: Optional[List[Tuple[str, Optional[str]]]]
     :raises: TimeoutError if the conditions never match (assuming timeout is
         not None).
     """
     assert model is not None, ("model can't be None in "
                                "block_until_auto_reconnect_model()")
     aconditions = aconditions or []
+    if wait_period is None:
+        wait_period = WAITER_FALLBACK_PERIOD if entities else 0.5
 
     def _done():
         return all(c() for c in conditions)
@@ -397,16 +765,17 @@ async def block_until_auto_reconnect_model(*conditions,
         return all(evaluated)
 
     async def _block():
-        while True:
-            # reconnect if disconnected, as the conditions still need to be
-            # checked.
-            await ensure_model_connected(model)
-            result = _done()
-            aresult = await _adone()
-            if all((not is_model_disconnected(model), result, aresult)):
-                return
-            else:
-                await asyncio.sleep(wait_period)
+        with subscribe_model_changes(model, entities) as changes:
+            while True:
+                # reconnect if disconnected, as the conditions still need to
+                # be checked.
+                await ensure_model_connected(model)
+                result = _done()
+                aresult = await _adone()
+                if all((not is_model_disconnected(model), result, aresult)):
+                    return
+                else:
+                    await changes.wait(wait_period)
 
     # finally wait for all the conditions to be true
     await asyncio.wait_for(_block(), timeout)
@@ -430,10 +799,27 @@ async def async_get_model_info(model_name=None):
 get_model_info = sync_wrapper(async_get_model_info)
 
 
+# Whether async_scp_to_unit() skips pushing a file that it has already pushed,
+# with the same content, to the same place on a unit.  The remote copy is
+# checked with sha256sum before skipping.
+SCP_PUSH_CACHE = False
+
+# The files pushed by async_scp_to_unit(), as model name ->
+# {(unit name, destination, user, proxy, scp_opts): sha256}, and the cache
+# hits and misses, as model name -> {'hits': int, 'misses': int}.
+ScpPushCache = {}
+ScpPushCacheStats = {}
+
+
 async def async_scp_to_unit(unit_name, source, destination, model_name=None,
                             user='ubuntu', proxy=False, scp_opts=''):
     """Transfer files to unit_name in model_name.
 
+    If source is a single file that has already been pushed, with the same
+    content, to the same destination on the unit, with the same options (and
+    SCP_PUSH_CACHE is set) then it is only transferred again if `sha256sum` on
+    the unit shows that the remote copy has changed.
+
     :param model_name: Name of model unit is in
     :type model_name: str
     :param unit_name: Name of unit to scp to
@@ -449,19 +835,154 @@ async def async_scp_to_unit(unit_name, source, destination, model_name=None,
     :param scp_opts: Additional options to the scp command
     :type scp_opts: str
     """
+    source_sha256 = _local_sha256(source) if SCP_PUSH_CACHE else None
+    if source_sha256 is not None and not model_name:
+        model_name = await async_get_juju_model()
     model = await get_model(model_name)
     unit = await async_get_unit_from_name(unit_name, model)
+    if source_sha256 is not None:
+        # the options are part of the key, as they may change where (or as
+        # whom) the file is written.
+        key = (unit_name, destination, user, proxy, scp_opts)
+        cache = ScpPushCache.setdefault(model_name, {})
+        stats = ScpPushCacheStats.setdefault(model_name,
+                                             {'hits': 0, 'misses': 0})
+        if cache.get(key) == source_sha256:
+            # This file was pushed here before; check it is still there.
+            remote_sha256 = await _async_remote_sha256(
+                unit, source, destination, user=user)
+            if remote_sha256 == source_sha256:
+                stats['hits'] += 1
+                logging.debug("{} already has {} at {}, skipping"
+                              .format(unit_name, source, destination))
+                return
+        stats['misses'] += 1
+        cache.pop(key, None)
     await unit.scp_to(source, destination, user=user, proxy=proxy,
                       scp_opts=scp_opts)
+    if source_sha256 is not None:
+        cache[key] = source_sha256
 
 scp_to_unit = sync_wrapper(async_scp_to_unit)
 
 
+def get_scp_push_cache_stats(model_name=None):
+    """Return the hit and miss counts of the scp push cache.
+
+    A hit is a file that async_scp_to_unit() didn't transfer, because the
+    same content had already been pushed to the same place on the unit.  A
+    miss is a file that was transferred.
+
+    :param model_name: the model to return stats for; None for all models.
+    :type model_name: Optional[str]
+    :returns: the stats for model_name, or a dictionary of model name to stats
+    :rtype: Dict[str, Any]
+    """
+    if model_name is not None:
+        return dict(ScpPushCacheStats.get(model_name, {}))
+    return {k: dict(v) for k, v in ScpPushCacheStats.items()}
+
+
+def clear_scp_push_cache(model_name=None):
+    """Forget the files that have been pushed to units.
+
+    :param model_name: the model to forget files for; None for all models.
+    :type model_name: Optional[str]
+    """
+    if model_name is not None:
+        ScpPushCache.pop(model_name, None)
+    else:
+        ScpPushCache.clear()
+
+
+# The default number of units that async_scp_to_all_units() transfers files to
+# at the same time.
+SCP_CONCURRENCY = 10
+
+# A failed transfer to a unit is retried up to SCP_RETRIES times (by default
+# not at all), waiting SCP_RETRY_BACKOFF seconds before the first retry,
+# doubling each time.
+SCP_RETRIES = 0
+SCP_RETRY_BACKOFF = 2.0
+
+
+def _local_sha256(path):
+    """Return the sha256 hex digest of a local file.
+
+    :param path: Local path of the file
+    :type path: str
+    :returns: The digest, or None if path isn't a regular file
+    :rtype: Optional[str]
+    """
+    if not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remote_path(source, destination, user):
+    """Return the shell quoted remote path that scp would write source to.
+
+    A relative destination is relative to the home directory of user, as it
+    is for scp, and if the destination is a directory then the file is
+    written into it.
+
+    :param source: Local path of the file to transfer
+    :type source: str
+    :param destination: Remote destination of the transfer
+    :type destination: str
+    :param user: Remote username
+    :type user: str
+    :returns: A shell expression for the path of the file on the unit
+    :rtype: str
+    """
+    path = shlex.quote(destination)
+    if not destination.startswith('/'):
+        path = '~{}/{}'.format(user, path)
+    return '"$(if [ -d {path} ]; then echo {path}/{name}; ' \
+           'else echo {path}; fi)"'.format(
+               path=path, name=shlex.quote(os.path.basename(source)))
+
+
+async def _async_remote_sha256(unit, source, destination, user='ubuntu'):
+    """Return the sha256 hex digest of the file scp would write on a unit.
+
+    :param unit: The unit to check
+    :type unit: juju.unit.Unit
+    :param source: Local path of the file to transfer
+    :type source: str
+    :param destination: Remote destination of the transfer
+    :type destination: str
+    :param user: Remote username
+    :type user: str
+    :returns: The digest, or None if the file doesn't exist (or can't be read)
+    :rtype: Optional[str]
+    """
+    action = await generic_utils.unit_run(
+        unit,
+        'sha256sum {}'.format(_remote_path(source, destination, user)))
+    action = _normalise_action_object(action)
+    results = _normalise_action_results(action.data.get('results'))
+    if str(results.get('Code')) != '0' or not results.get('Stdout'):
+        return None
+    return results['Stdout'].split()[0]
+
+
 async def async_scp_to_all_units(application_name, source, destination,
                                  model_name=None, user='ubuntu', proxy=False,
-                                 scp_opts=''):
+                                 scp_opts='', concurrency=None, retries=None,
+                                 skip_identical=False):
     """Transfer files to all units of an application.
 
+    The files are transferred to up to concurrency units at the same time.  A
+    transfer that fails can be retried, with backoff, up to retries times.
+    The transfers to the other units carry on regardless; once they are all
+    done, the failure of the first unit (in the application's unit order)
+    that could not be transferred to is raised, and the others are logged.
+
     :param model_name: Name of model unit is in
     :type model_name: str
     :param application_name: Name of application to scp file to
@@ -476,12 +997,66 @@ async def async_scp_to_all_units(application_name, source, destination,
     :type proxy: bool
     :param scp_opts: Additional options to the scp command
     :type scp_opts: str
+    :param concurrency: The maximum number of units to transfer to at the same
+                        time, defaults to SCP_CONCURRENCY
+    :type concurrency: Optional[int]
+    :param retries: The number of times to retry a failed transfer, defaults
+                    to SCP_RETRIES
+    :type retries: Optional[int]
+    :param skip_identical: If source is a single file, don't transfer it to a
+                           unit that already has a file with the same sha256
+                           at the destination.
+    :type skip_identical: bool
     """
     model = await get_model(model_name)
-    for unit in model.applications[application_name].units:
-        # FIXME: Should scp in parallel
-        await unit.scp_to(source, destination, user=user, proxy=proxy,
-                          scp_opts=scp_opts)
+    semaphore = asyncio.Semaphore(concurrency or SCP_CONCURRENCY)
+    if retries is None:
+        retries = SCP_RETRIES
+    source_sha256 = _local_sha256(source) if skip_identical else None
+
+    async def _scp_to_unit(unit):
+        async with semaphore:
+            if source_sha256 is not None:
+                try:
+                    remote_sha256 = await _async_remote_sha256(
+                        unit, source, destination, user=user)
+                except Exception as e:
+                    # the check is only an optimisation; transfer anyway.
+                    logging.warning(
+                        "Couldn't get the sha256 of {} on {} ({}), "
+                        "transferring it".format(destination, unit.entity_id,
+                                                 e))
+                    remote_sha256 = None
+                if remote_sha256 == source_sha256:
+                    logging.debug("{} already has {} at {}, skipping"
+                                  .format(unit.entity_id, source,
+                                          destination))
+                    return
+            backoff = SCP_RETRY_BACKOFF
+            for attempt in range(retries + 1):
+                try:
+                    await unit.scp_to(source, destination, user=user,
+                                      proxy=proxy, scp_opts=scp_opts)
+                    return
+                except Exception as e:
+                    if attempt == retries:
+                        raise
+                    logging.warning(
+                        "scp of {} to {} failed ({}), retrying in {}s"
+                        .format(source, unit.entity_id, e, backoff))
+                await asyncio.sleep(backoff)
+                backoff *= 2
+
+    units = list(model.applications[application_name].units)
+    outcomes = await asyncio.gather(
+        *(_scp_to_unit(unit) for unit in units), return_exceptions=True)
+    errors = [(unit, outcome) for unit, outcome in zip(units, outcomes)
+              if isinstance(outcome, Exception)]
+    for unit, error in errors:
+        logging.error("scp of {} to {} failed: {}"
+                      .format(source, unit.entity_id, error))
+    if errors:
+        raise errors[0][1]
 
 scp_to_all_units = sync_wrapper(async_scp_to_all_units)
 
@@ -575,6 +1150,68 @@ async def async_run_on_unit(unit_name, command, model_name=None, timeout=None):
 run_on_unit = sync_wrapper(async_run_on_unit)
 
 
+# The default number of units that async_run_on_units() runs a command on at
+# the same time.
+RUN_ON_UNITS_CONCURRENCY = 10
+
+# The outcome of running a command on one unit with async_run_on_units().
+# results is as returned by async_run_on_unit() (None if the run failed),
+# error is the exception raised by the run (None if it succeeded) and duration
+# is how long, in seconds, the run took.
+UnitRunResult = collections.namedtuple(
+    "UnitRunResult", ["results", "error", "duration"])
+
+
+async def async_run_on_units(unit_names, command, model_name=None,
+                             timeout=None, concurrency=None):
+    """Juju run the same command on several units, concurrently.
+
+    Up to concurrency commands are running at any one time.  A run that fails
+    (e.g. the unit isn't found, or the run times out) doesn't stop the runs on
+    the other units; its exception is returned in the unit's result instead.
+    Note that a command that runs, but exits non-zero, is not a failure; check
+    the 'Code' in the results.
+
+    :param unit_names: Names of the units to run the command on
+    :type unit_names: List[str]
+    :param command: Command to execute
+    :type command: str
+    :param model_name: Name of model units are in
+    :type model_name: str
+    :param timeout: How long in seconds to wait for each command to complete
+    :type timeout: int
+    :param concurrency: The maximum number of units to run the command on at
+                        the same time, defaults to RUN_ON_UNITS_CONCURRENCY
+    :type concurrency: Optional[int]
+    :returns: map of unit name to the outcome of the run on that unit
+    :rtype: Dict[str, UnitRunResult]
+    """
+    model = await get_model(model_name)
+    semaphore = asyncio.Semaphore(concurrency or RUN_ON_UNITS_CONCURRENCY)
+
+    async def _run_on_unit(unit_name):
+        async with semaphore:
+            start = time.time()
+            try:
+                unit = await async_get_unit_from_name(unit_name, model)
+                action = await generic_utils.unit_run(unit, command, timeout)
+                action = _normalise_action_object(action)
+                results = _normalise_action_results(
+                    action.data.get('results'))
+            except Exception as e:
+                logging.warning("Running '{}' on {} failed: {}"
+                                .format(command, unit_name, e))
+                return UnitRunResult(None, e, time.time() - start)
+            return UnitRunResult(results, None, time.time() - start)
+
+    unit_names = list(unit_names)
+    outcomes = await asyncio.gather(
+        *(_run_on_unit(unit_name) for unit_name in unit_names))
+    return dict(zip(unit_names, outcomes))
+
+run_on_units = sync_wrapper(async_run_on_units)
+
+
 async def async_run_on_leader(application_name, command, model_name=None,
                               timeout=None):
     """Juju run on leader unit.
@@ -591,13 +1228,12 @@ async def async_run_on_leader(application_name, command, model_name=None,
     :rtype: dict
     """
     model = await get_model(model_name)
-    for unit in model.applications[application_name].units:
-        is_leader = await unit.is_leader_from_status()
-        if is_leader:
-            action = await generic_utils.unit_run(unit, command, timeout)
-            action = _normalise_action_object(action)
-            results = action.data.get('results')
-            return _normalise_action_results(results)
+    unit = await _async_find_lead_unit(application_name, model=model)
+    if unit is not None:
+        action = await generic_utils.unit_run(unit, command, timeout)
+        action = _normalise_action_object(action)
+        results = action.data.get('results')
+        return _normalise_action_results(results)
 
 run_on_leader = sync_wrapper(async_run_on_leader)
 
@@ -655,6 +1291,51 @@ get_systemd_service_active_time = sync_wrapper(
     async_get_systemd_service_active_time)
 
 
+def _service_start_time_command(service, pgrep_full=False):
+    """Return the command that prints the start time of a service.
+
+    :param service: Name of service to check is running
+    :type service: str
+    :param pgrep_full: Should pgrep be used rather than pidof to identify
+                       a service.
+    :type  pgrep_full: bool
+    :returns: The command; it prints nothing if the service isn't running
+    :rtype: str
+    """
+    if pgrep_full:
+        pid_cmd = r"pgrep -o -f '{}'".format(service)
+        return "stat -c %Y /proc/$({})".format(pid_cmd)
+    pid_cmd = r"pidof -x '{}'".format(service)
+    return pid_cmd + (
+        "| "
+        r"tr -d '\n' | "
+        "xargs -d' ' -I {} stat -c %Y /proc/{}  | "
+        "sort -n |"
+        " head -1")
+
+
+def _service_start_times_command(services, pgrep_full=False):
+    """Return the command that prints the start times of several services.
+
+    The command prints a JSON list with the start time of each of the
+    services, in order, and null for a service that isn't running.
+
+    :param services: Names of the services
+    :type services: List[str]
+    :param pgrep_full: Should pgrep be used rather than pidof to identify
+                       a service.
+    :type  pgrep_full: bool
+    :returns: The command
+    :rtype: str
+    """
+    assignments = [
+        "s{}=$({})".format(i, _service_start_time_command(service, pgrep_full))
+        for i, service in enumerate(services)]
+    values = ", ".join(
+        "${{s{}:-null}}".format(i) for i in range(len(services)))
+    return "; ".join(assignments + ['echo "[{}]"'.format(values)])
+
+
 async def async_get_unit_service_start_time(unit_name, service,
                                             model_name=None, timeout=None,
                                             pgrep_full=False):
@@ -684,17 +1365,7 @@ async def async_get_unit_service_start_time(unit_name, service,
     :rtype: int
     :raises: ServiceNotRunning
     """
-    if pgrep_full:
-        pid_cmd = r"pgrep -o -f '{}'".format(service)
-        cmd = "stat -c %Y /proc/$({})".format(pid_cmd)
-    else:
-        pid_cmd = r"pidof -x '{}'".format(service)
-        cmd = pid_cmd + (
-            "| "
-            r"tr -d '\n' | "
-            "xargs -d' ' -I {} stat -c %Y /proc/{}  | "
-            "sort -n |"
-            " head -1")
+    cmd = _service_start_time_command(service, pgrep_full)
     out = await async_run_on_unit(
         unit_name=unit_name,
         command=cmd,
@@ -784,10 +1455,9 @@ async def async_get_lead_unit(application_name, model_name=None):
     :raises: zaza.utilities.exceptions.JujuError
     """
     model = await get_model(model_name)
-    for unit in model.applications[application_name].units:
-        is_leader = await unit.is_leader_from_status()
-        if is_leader:
-            return unit
+    unit = await _async_find_lead_unit(application_name, model=model)
+    if unit is not None:
+        return unit
     raise zaza_exceptions.JujuError("No leader found for application {}"
                                     .format(application_name))
 
@@ -860,12 +1530,86 @@ async def async_get_unit_public_address__libjuju(unit, model_name=None):
     return await unit.get_public_address()
 
 
+# How long (seconds) the public addresses found for a model are used for by
+# async_get_unit_public_address__fallback().
+PUBLIC_ADDRESS_TTL = 10.0
+
+# A map of model names <-> PublicAddresses for that model.
+_public_address_tables = {}
+PublicAddresses = collections.namedtuple(
+    "PublicAddresses", ["time", "addresses", "from_cli"])
+
+
+def _public_addresses_from_status(status):
+    """Return the public address of every unit in a FullStatus.
+
+    :param status: The status of the model
+    :type status: juju.client.client.FullStatus
+    :returns: map of unit name to public address (if it has one)
+    :rtype: Dict[str, str]
+    """
+    addresses = {}
+    for app_status in (status.applications or {}).values():
+        for unit_name, unit_status in (app_status.units or {}).items():
+            if unit_status.public_address:
+                addresses[unit_name] = unit_status.public_address
+            for sub_name, sub_status in (
+                    unit_status.subordinates or {}).items():
+                if sub_status.public_address:
+                    addresses[sub_name] = sub_status.public_address
+    return addresses
+
+
+async def _async_get_public_addresses(model_name, from_cli=False):
+    """Return the public addresses of the units in a model.
+
+    The addresses are fetched once and shared for PUBLIC_ADDRESS_TTL seconds.
+    They come from the API (via async_get_status()) unless from_cli is set,
+    when `juju status --format=yaml` is used instead.
+
+    :param model_name: Name of model to query.
+    :type model_name: str
+    :param from_cli: Use the juju CLI rather than the API.
+    :type from_cli: bool
+    :returns: the addresses found for the model
+    :rtype: PublicAddresses
+    """
+    table = _public_address_tables.get(model_name)
+    if (table is not None and
+            time.time() - table.time <= PUBLIC_ADDRESS_TTL and
+            (table.from_cli or not from_cli)):
+        return table
+    addresses = {}
+    if from_cli:
+        cmd = "juju status --format=yaml -m {}".format(model_name)
+        result = await generic_utils.check_output(
+            cmd.split(), log_stderr=False, log_stdout=False)
+        status = yaml.safe_load(result['Stdout'])
+        for app_status in (status.get('applications') or {}).values():
+            for unit_name, unit_status in (
+                    app_status.get('units') or {}).items():
+                if unit_status.get('public-address'):
+                    addresses[unit_name] = unit_status['public-address']
+                for sub_name, sub_status in (
+                        unit_status.get('subordinates') or {}).items():
+                    if sub_status.get('public-address'):
+                        addresses[sub_name] = sub_status['public-address']
+    else:
+        addresses = _public_addresses_from_status(
+            await async_get_status(model_name, refresh=False))
+    table = PublicAddresses(time.time(), addresses, from_cli)
+    _public_address_tables[model_name] = table
+    return table
+
+
 async def async_get_unit_public_address__fallback(unit, model_name=None):
-    """Get the public address of a unit via juju status shell command.
+    """Get the public address of a unit from the model's status.
 
-    Due to bug [1], this function calls juju status and extracts the public
-    address as provided by the juju go client, as libjuju is unreliable.
-    This is a stop-gap solution to work around the bug.  If the IP address
+    Due to bug [1], this function reads the public address from the model's
+    full status, as libjuju's unit.public_address is unreliable.  The
+    addresses of all the units in the model are fetched at once and shared for
+    PUBLIC_ADDRESS_TTL seconds.  If the API doesn't have an address for the
+    unit then, as a last resort, `juju status` is used.  If the IP address
     can't be found, then None is returned.
 
     [1]: https://github.com/juju/python-libjuju/issues/615
@@ -877,14 +1621,11 @@ async def async_get_unit_public_address__fallback(unit, model_name=None):
     """
     if model_name is None:
         model_name = await async_get_juju_model()
-    cmd = "juju status --format=yaml -m {}".format(model_name)
-    result = await generic_utils.check_output(
-        cmd.split(), log_stderr=False, log_stdout=False)
-    status = yaml.safe_load(result['Stdout'])
+    table = await _async_get_public_addresses(model_name)
+    if unit.name not in table.addresses:
+        table = await _async_get_public_addresses(model_name, from_cli=True)
     try:
-        app = unit.name.split('/')[0]
-        return (
-            status['applications'][app]['units'][unit.name]['public-address'])
+        return table.addresses[unit.name]
     except KeyError:
         logging.warn("Public address not found for %s", unit.name)
         return None
@@ -1019,35 +1760,447 @@ async def async_get_status(model_name=None, interval=4.0, refresh=True):
     key = str(model_name)
     model = None
 
-    async def _update_status_result(key):
-        nonlocal model
-        if model is None:
-            model = await get_model(model_name)
-        status = StatusResult(time.time(), await model.get_status())
-        _GET_STATUS_TIMES[key] = status
-        return status.result
+    async def _update_status_result(key):
+        nonlocal model
+        if model is None:
+            model = await get_model(model_name)
+        status = StatusResult(time.time(), await model.get_status())
+        _GET_STATUS_TIMES[key] = status
+        return status.result
+
+    try:
+        last = _GET_STATUS_TIMES[key]
+    except KeyError:
+        return await _update_status_result(key)
+    now = time.time()
+    if last.time + interval <= now:
+        # we need to refresh the status time, so let's do that.
+        return await _update_status_result(key)
+    # otherwise, if we need a refreshed version, then we have to wait;
+    if refresh:
+        # wait until the min interval is exceeded, and then grab a copy.
+        await asyncio.sleep((last.time + interval) - now)
+        # now get the status.
+        # By passing refresh=False, this WILL return a cached status if another
+        # co-routine has already refreshed it.
+        return await async_get_status(model_name, interval, refresh=False)
+    # Not refreshing, so return the cached version
+    return last.result
+
+
+get_status = sync_wrapper(async_get_status)
+
+
+# Whether async_get_watched_status() reads from a ModelStatusView, or falls
+# back to polling async_get_status().
+MODEL_STATUS_FROM_WATCHER = True
+# A map of model names <-> the ModelStatusView for that model.
+_model_status_views = {}
+
+
+def _detailed_status(data):
+    """Convert a status from an AllWatcher delta into a DetailedStatus.
+
+    :param data: the status dict from the delta, e.g. 'workload-status'
+    :type data: Optional[Dict[str, Any]]
+    :returns: the status as it would appear in a FullStatus
+    :rtype: juju.client.client.DetailedStatus
+    """
+    data = data or {}
+    return juju.client.client.DetailedStatus(
+        status=data.get('current'),
+        info=data.get('message'),
+        since=data.get('since'),
+        version=data.get('version'),
+        data=data.get('data') or {})
+
+
+class ModelStatusView:
+    """The status of a model, kept up to date by libjuju's AllWatcher.
+
+    The view is a FullStatus object (the same shape as returned by
+    model.get_status()) that is seeded from the model's current state, and
+    then updated in place, one entity at a time, as deltas arrive.  Reading it
+    doesn't make a FullStatus call to the controller.
+
+    Only the fields that can be derived from the deltas are filled in; notably
+    units don't have 'leader' set and applications have no 'relations'.
+    Subordinate units are nested under their principal unit's 'subordinates'
+    and 'subordinate-to' is derived from the container scoped relations, as it
+    is for a FullStatus.
+    """
+
+    ENTITY_TYPES = ('machine', 'application', 'relation', 'unit')
+
+    def __init__(self, model):
+        """Initialise the view for a model; call start() to populate it.
+
+        :param model: the model to watch
+        :type model: juju.model.Model
+        """
+        self.model = model
+        self.status = juju.client.client.FullStatus()
+        self.status.applications = {}
+        self.status.machines = {}
+        self.closed = False
+        # containers for units and machines are shared between the objects in
+        # the status and these maps, so entities can arrive in any order.
+        self._app_units = {}
+        self._subordinates = {}
+        self._containers = {}
+        self._placement = {}
+        self._subordinate_apps = set()
+        self._container_relations = {}
+
+    def start(self):
+        """Populate the view from the model's state and observe deltas."""
+        for entity_type in self.ENTITY_TYPES:
+            entities = self.model.state.state.get(entity_type, {})
+            for entity_id, history in entities.items():
+                if history[-1] is not None:
+                    self.apply(entity_type, entity_id, history[-1])
+        self.model.add_observer(self._on_delta)
+
+    def close(self):
+        """Stop applying deltas to the view."""
+        self.closed = True
+        _remove_model_observer(self.model, self._on_delta)
+
+    async def _on_delta(self, delta, old_obj, new_obj, model):
+        """Apply a delta from the model's AllWatcher.
+
+        :param delta: the delta
+        :type delta: juju.delta.EntityDelta
+        """
+        if self.closed or delta.entity not in self.ENTITY_TYPES:
+            return
+        if delta.type == 'remove':
+            self.remove(delta.entity, delta.get_id())
+        else:
+            self.apply(delta.entity, delta.get_id(), delta.data)
+
+    def apply(self, entity_type, entity_id, data):
+        """Add or update an entity in the view.
+
+        :param entity_type: one of ENTITY_TYPES
+        :type entity_type: str
+        :param entity_id: the id of the entity
+        :type entity_id: str
+        :param data: the entity's data from the delta
+        :type data: Dict[str, Any]
+        """
+        getattr(self, '_apply_{}'.format(entity_type))(entity_id, data)
+
+    def remove(self, entity_type, entity_id):
+        """Remove an entity from the view.
+
+        :param entity_type: one of ENTITY_TYPES
+        :type entity_type: str
+        :param entity_id: the id of the entity
+        :type entity_id: str
+        """
+        if entity_type == 'application':
+            self.status.applications.pop(entity_id, None)
+            self._subordinate_apps.discard(entity_id)
+        elif entity_type == 'relation':
+            self._container_relations.pop(entity_id, None)
+            self._update_subordinate_to()
+        else:
+            container = self._placement.pop((entity_type, entity_id), None)
+            if container is not None:
+                container.pop(entity_id, None)
+
+    def _place(self, entity_type, entity_id, container, obj):
+        old = self._placement.get((entity_type, entity_id))
+        if old is not None and old is not container:
+            old.pop(entity_id, None)
+        container[entity_id] = obj
+        self._placement[(entity_type, entity_id)] = container
+
+    def _apply_machine(self, machine_id, data):
+        addresses = data.get('addresses') or []
+        public = [a['value'] for a in addresses if a.get('scope') == 'public']
+        machine = juju.client.client.MachineStatus(
+            id_=machine_id,
+            agent_status=_detailed_status(data.get('agent-status')),
+            instance_status=_detailed_status(data.get('instance-status')),
+            instance_id=data.get('instance-id'),
+            series=data.get('series'),
+            hostname=data.get('hostname'),
+            dns_name=(public or [a['value'] for a in addresses] or [None])[0],
+            ip_addresses=[a['value'] for a in addresses],
+            jobs=data.get('jobs') or [])
+        machine.containers = self._containers.setdefault(machine_id, {})
+        if '/' in machine_id:
+            parent = machine_id.split('/')[0]
+            container = self._containers.setdefault(parent, {})
+        else:
+            container = self.status.machines
+        self._place('machine', machine_id, container, machine)
+
+    def _apply_application(self, name, data):
+        application = juju.client.client.ApplicationStatus(
+            charm=data.get('charm-url'),
+            charm_channel=data.get('charm-channel'),
+            exposed=data.get('exposed'),
+            life=data.get('life'),
+            status=_detailed_status(data.get('status')),
+            workload_version=data.get('workload-version'))
+        application.units = self._app_units.setdefault(name, {})
+        if data.get('subordinate'):
+            self._subordinate_apps.add(name)
+        else:
+            self._subordinate_apps.discard(name)
+        self.status.applications[name] = application
+        self._update_subordinate_to()
+
+    def _apply_relation(self, relation_id, data):
+        endpoints = data.get('endpoints') or []
+        if any(e['relation'].get('scope') == 'container' for e in endpoints):
+            self._container_relations[relation_id] = [
+                e['application-name'] for e in endpoints]
+            self._update_subordinate_to()
+
+    def _update_subordinate_to(self):
+        subordinate_to = collections.defaultdict(list)
+        for apps in self._container_relations.values():
+            for app in apps:
+                if app not in self._subordinate_apps:
+                    continue
+                for other in apps:
+                    if (other != app and
+                            other not in subordinate_to[app]):
+                        subordinate_to[app].append(other)
+        for name, application in self.status.applications.items():
+            application.subordinate_to = sorted(subordinate_to.get(name, []))
+
+    def _apply_unit(self, name, data):
+        unit = juju.client.client.UnitStatus(
+            agent_status=_detailed_status(data.get('agent-status')),
+            workload_status=_detailed_status(data.get('workload-status')),
+            machine=data.get('machine-id'),
+            public_address=data.get('public-address'),
+            address=data.get('private-address'),
+            charm=data.get('charm-url'),
+            workload_version=data.get('workload-version'))
+        principal = data.get('principal')
+        if principal:
+            container = self._subordinates.setdefault(principal, {})
+        else:
+            unit.subordinates = self._subordinates.setdefault(name, {})
+            container = self._app_units.setdefault(
+                data.get('application') or name.split('/')[0], {})
+        self._place('unit', name, container, unit)
+
+
+async def async_get_watched_status(model_name=None, interval=4.0,
+                                   refresh=True):
+    """Return the status of the model without polling the controller.
+
+    The status is a ModelStatusView which libjuju's AllWatcher keeps up to
+    date, and so is cheap to call repeatedly, as waiters do.  It has the same
+    shape as the status returned by async_get_status(), but without the
+    fields that the AllWatcher doesn't provide; see ModelStatusView.  The
+    same object is returned (and updated in place) between calls, so callers
+    must not modify it.
+
+    If MODEL_STATUS_FROM_WATCHER is False then async_get_status() is used.
+
+    :param model_name: Name of model to query.
+    :type model_name: str
+    :param interval: passed to async_get_status() when falling back to it.
+    :type interval: float
+    :param refresh: passed to async_get_status() when falling back to it.
+    :type refresh: bool
+    :returns: the status of the model
+    :rtype: juju.client.client.FullStatus
+    """
+    if not MODEL_STATUS_FROM_WATCHER:
+        return await async_get_status(
+            model_name, interval=interval, refresh=refresh)
+    if not model_name:
+        model_name = await async_get_juju_model()
+    model = await get_model_memo(model_name)
+    view = _model_status_views.get(model_name)
+    if view is None or view.model is not model:
+        if view is not None:
+            view.close()
+        view = ModelStatusView(model)
+        view.start()
+        _model_status_views[model_name] = view
+    return view.status
+
+
+async def _async_get_watched_status_copy(*args, **kwargs):
+    """Return a copy of async_get_watched_status(), taken on the loop thread.
+
+    The view returned by async_get_watched_status() is updated in place as
+    deltas arrive, so it mustn't be handed to the sync thread.
+    """
+    return copy.deepcopy(await async_get_watched_status(*args, **kwargs))
+
+get_watched_status = sync_wrapper(_async_get_watched_status_copy)
+
+
+# How long (seconds) a leader found by async_get_lead_unit() is remembered for.
+# The remembered leader is still checked before it is returned, as not all
+# controllers say which unit is the leader in the deltas.
+LEADER_CACHE_TTL = 30.0
+# A map of models <-> the LeaderIndex for that model.
+_model_leader_indexes = {}
+
+
+class LeaderIndex:
+    """The leader unit of each application in a model, as last looked up.
+
+    Finding a leader costs a FullStatus call per unit (see
+    juju.unit.Unit.is_leader_from_status()), so the leader found is remembered
+    for LEADER_CACHE_TTL seconds, and then only that unit is checked.  If a
+    unit delta has the unit's 'leader' flag the index is updated from it.
+    Otherwise, an application's leader is forgotten early if its leader unit
+    goes away, or a unit of the application runs a leader hook (which it does
+    when leadership changes).
+    """
+
+    def __init__(self, model):
+        """Initialise the index for a model; call start() to observe deltas.
+
+        :param model: the model to index
+        :type model: juju.model.Model
+        """
+        self.model = model
+        self.leaders = {}
+        self.closed = False
+
+    def start(self):
+        """Observe the model's deltas."""
+        self.model.add_observer(self._on_delta)
+
+    def close(self):
+        """Stop observing deltas."""
+        self.closed = True
+        _remove_model_observer(self.model, self._on_delta)
+
+    def get(self, application_name):
+        """Return the name of the application's leader, if known.
+
+        :param application_name: Name of application
+        :type application_name: str
+        :returns: the name of the leader unit, or None if not (still) known
+        :rtype: Optional[str]
+        """
+        try:
+            unit_name, found = self.leaders[application_name]
+        except KeyError:
+            return None
+        if time.time() - found > LEADER_CACHE_TTL:
+            del self.leaders[application_name]
+            return None
+        return unit_name
+
+    def set(self, application_name, unit_name):
+        """Record the application's leader.
+
+        :param application_name: Name of application
+        :type application_name: str
+        :param unit_name: Name of the leader unit
+        :type unit_name: str
+        """
+        self.leaders[application_name] = (unit_name, time.time())
+
+    def invalidate(self, application_name=None):
+        """Forget the application's leader, or all the leaders if None.
+
+        :param application_name: Name of application
+        :type application_name: Optional[str]
+        """
+        if application_name is None:
+            self.leaders.clear()
+        else:
+            self.leaders.pop(application_name, None)
+
+    async def _on_delta(self, delta, old_obj, new_obj, model):
+        """Forget leaders that may have changed because of a delta.
+
+        :param delta: the delta
+        :type delta: juju.delta.EntityDelta
+        """
+        if self.closed:
+            return
+        if delta.entity == 'application':
+            if delta.type == 'remove':
+                self.invalidate(delta.get_id())
+        elif delta.entity == 'unit':
+            application_name = delta.data.get('application')
+            leader = delta.data.get('leader')
+            if leader and delta.type != 'remove':
+                self.set(application_name, delta.get_id())
+                return
+            if application_name not in self.leaders:
+                return
+            if (leader is not None and
+                    delta.get_id() == self.leaders[application_name][0]):
+                self.invalidate(application_name)
+                return
+            if delta.type == 'remove':
+                if delta.get_id() == self.leaders[application_name][0]:
+                    self.invalidate(application_name)
+                return
+            message = (delta.data.get('agent-status') or {}).get('message')
+            if message and 'leader' in message:
+                self.invalidate(application_name)
+
 
-    try:
-        last = _GET_STATUS_TIMES[key]
-    except KeyError:
-        return await _update_status_result(key)
-    now = time.time()
-    if last.time + interval <= now:
-        # we need to refresh the status time, so let's do that.
-        return await _update_status_result(key)
-    # otherwise, if we need a refreshed version, then we have to wait;
-    if refresh:
-        # wait until the min interval is exceeded, and then grab a copy.
-        await asyncio.sleep((last.time + interval) - now)
-        # now get the status.
-        # By passing refresh=False, this WILL return a cached status if another
-        # co-routine has already refreshed it.
-        return await async_get_status(model_name, interval, refresh=False)
-    # Not refreshing, so return the cached version
-    return last.result
+def _get_leader_index(model):
+    """Return the LeaderIndex for a model, creating it if needed.
+
+    :param model: the model
+    :type model: juju.model.Model
+    :returns: the model's leader index
+    :rtype: LeaderIndex
+    """
+    index = _model_leader_indexes.get(model)
+    if index is None:
+        index = LeaderIndex(model)
+        index.start()
+        _model_leader_indexes[model] = index
+    return index
 
 
-get_status = sync_wrapper(async_get_status)
+async def _async_find_lead_unit(application_name, model_name=None,
+                                model=None):
+    """Return the leader unit of an application, using the LeaderIndex.
+
+    :param application_name: Name of application
+    :type application_name: str
+    :param model_name: Name of model to query.
+    :type model_name: str
+    :param model: Model to query, rather than by model_name.
+    :type model: Optional[juju.model.Model]
+    :returns: the leader unit, or None if there isn't one
+    :rtype: Optional[juju.unit.Unit]
+    :raises: KeyError if the application doesn't exist
+    """
+    if model is None:
+        model = await get_model(model_name)
+    index = _get_leader_index(model)
+    leader_name = index.get(application_name)
+    checked = None
+    if leader_name is not None:
+        checked = model.units.get(leader_name)
+        # confirm the remembered leader, as leadership can move without a
+        # delta saying so; this is one status call rather than one per unit.
+        if checked is not None and await checked.is_leader_from_status():
+            return checked
+        index.invalidate(application_name)
+    for unit in model.applications[application_name].units:
+        if unit is checked:
+            continue
+        is_leader = await unit.is_leader_from_status()
+        if is_leader:
+            index.set(application_name, unit.entity_id)
+            return unit
+    return None
 
 
 class ActionFailed(Exception):
@@ -1200,32 +2353,43 @@ async def async_run_action_on_leader(application_name, action_name,
         action_params = {}
 
     model = await get_model(model_name)
-    for unit in model.applications[application_name].units:
-        is_leader = await unit.is_leader_from_status()
-        if is_leader:
-            action_obj = await unit.run_action(action_name,
-                                               **action_params)
-            await action_obj.wait()
-            action_obj = _normalise_action_object(action_obj)
-            await async_update_unknown_action_status(model, action_obj)
-            if raise_on_failure and action_obj.data['status'] != 'completed':
-                try:
-                    output = await model.get_action_output(action_obj.id)
-                except KeyError:
-                    output = None
-                raise ActionFailed(action_obj, output=output)
-            return action_obj
+    unit = await _async_find_lead_unit(application_name, model=model)
+    if unit is not None:
+        action_obj = await unit.run_action(action_name, **action_params)
+        await action_obj.wait()
+        action_obj = _normalise_action_object(action_obj)
+        await async_update_unknown_action_status(model, action_obj)
+        if raise_on_failure and action_obj.data['status'] != 'completed':
+            try:
+                output = await model.get_action_output(action_obj.id)
+            except KeyError:
+                output = None
+            raise ActionFailed(action_obj, output=output)
+        return action_obj
 
 run_action_on_leader = sync_wrapper(async_run_action_on_leader)
 
 
+# The outcome of running an action on one unit with
+# async_run_action_on_units().  action is the action object (None if the unit
+# wasn't found), error is an ActionFailed if the action didn't complete
+# successfully, an asyncio.TimeoutError if it didn't finish in time or a
+# UnitNotFound if there is no such unit (None if the action completed) and
+# duration is how long, in seconds, the action took.
+UnitActionResult = collections.namedtuple(
+    "UnitActionResult", ["action", "error", "duration"])
+
+
 async def async_run_action_on_units(units, action_name, action_params=None,
                                     model_name=None, raise_on_failure=False,
                                     timeout=600):
     """Run action on list of unit in parallel.
 
-    The action is run on all units first without waiting for the action to
-    complete. Then block until they are done.
+    The action is enqueued on all the units at once, and each action is then
+    waited for separately (woken by libjuju's deltas for that action), so this
+    takes about as long as the slowest action.  An action that fails, times
+    out or whose unit can't be found doesn't stop the others; it is reported
+    in its unit's result.
 
     :param units: List of unit names
     :type units: List[str]
@@ -1235,40 +2399,57 @@ async def async_run_action_on_units(units, action_name, action_params=None,
     :type action_params: dict
     :param model_name: Name of model to query.
     :type model_name: str
-    :param raise_on_failure: Raise ActionFailed exception on failure
+    :param raise_on_failure: Once all the actions are done, raise the
+                             error of the first unit whose action failed,
+                             if any.
     :type raise_on_failure: bool
-    :param timeout: Time to wait for actions to complete
+    :param timeout: Time to wait for each action to complete
     :type timeout: int
-    :returns: Action object
-    :rtype: juju.action.Action
-    :raises: ActionFailed
+    :returns: map of unit name to the outcome of the action on that unit
+    :rtype: Dict[str, UnitActionResult]
+    :raises: ActionFailed, asyncio.TimeoutError, UnitNotFound (only with
+             raise_on_failure)
     """
     if action_params is None:
         action_params = {}
 
     model = await get_model(model_name)
-    actions = []
-    for unit_name in units:
-        unit = await async_get_unit_from_name(unit_name, model)
-        action_obj = await unit.run_action(action_name, **action_params)
-        actions.append(action_obj)
 
-    async def _check_actions():
-        for action_obj in actions:
-            if action_obj.data['status'] in ['running', 'pending']:
-                return False
-        return True
+    async def _run_action(unit_name):
+        start = time.time()
+        action_obj = None
+        try:
+            unit = await async_get_unit_from_name(unit_name, model)
+            action_obj = await unit.run_action(action_name, **action_params)
 
-    await async_block_until(_check_actions, timeout=timeout)
+            async def _check_action():
+                return action_obj.data['status'] not in ['running', 'pending']
 
-    for action_obj in actions:
+            await async_block_until(_check_action, timeout=timeout,
+                                    model_name=model_name,
+                                    entities=[('action', action_obj.id)])
+        except (asyncio.TimeoutError, UnitNotFound) as e:
+            return UnitActionResult(action_obj, e, time.time() - start)
         await async_update_unknown_action_status(model, action_obj)
-        if raise_on_failure and action_obj.data['status'] != 'completed':
+        error = None
+        if action_obj.data['status'] != 'completed':
             try:
                 output = await model.get_action_output(action_obj.id)
             except KeyError:
                 output = None
-            raise ActionFailed(action_obj, output=output)
+            error = ActionFailed(action_obj, output=output)
+        return UnitActionResult(action_obj, error, time.time() - start)
+
+    outcomes = await asyncio.gather(
+        *(_run_action(unit_name) for unit_name in units))
+    results = dict(zip(units, outcomes))
+    for unit_name, result in results.items():
+        if result.error is not None:
+            logging.warning("Action {} failed on {}"
+                            .format(action_name, unit_name))
+            if raise_on_failure:
+                raise result.error
+    return results
 
 run_action_on_units = sync_wrapper(async_run_action_on_units)
 
@@ -1296,6 +2477,10 @@ async def async_remove_application(application_name, model_name=None,
 remove_application = sync_wrapper(async_remove_application)
 
 
+# Machine states that should halt a deployment.
+MACHINE_ERRORS = ['provisioning error']
+
+
 class UnitError(Exception):
     """Exception raised for units in error state."""
 
@@ -1394,7 +2579,8 @@ async def async_resolve_units(application_name=None, wait=True, timeout=60,
             await block_until_auto_reconnect_model(
                 lambda: not unit.workload_status == 'error',
                 model=model,
-                timeout=timeout)
+                timeout=timeout,
+                entities=[('unit', unit.entity_id)])
 
 resolve_units = sync_wrapper(async_resolve_units)
 
@@ -1425,7 +2611,6 @@ def check_model_for_hard_errors(model):
 
     :raises: Union[UnitError, MachineError]
     """
-    MACHINE_ERRORS = ['provisioning error']
     errored_units = units_with_wl_status_state(model, 'error')
     if errored_units:
         raise UnitError(errored_units)
@@ -1434,6 +2619,45 @@ def check_model_for_hard_errors(model):
         raise MachineError(errored_machines)
 
 
+class ModelSnapshot:
+    """An index of a model's units, and its hard errors, at a point in time.
+
+    Building the snapshot walks the model's units once.  Looking up an
+    application's units, or checking for hard errors (as
+    check_model_for_hard_errors() does), is then cheap, rather than each
+    re-scanning every unit and machine in the model.  The units themselves
+    are the live libjuju objects.
+    """
+
+    def __init__(self, model):
+        """Build the snapshot.
+
+        :param model: Model object to index
+        :type model: juju.Model
+        """
+        self.units = collections.defaultdict(list)
+        self.errored_units = []
+        self.errored_machines = []
+        machines = model.machines
+        for unit in model.units.values():
+            self.units[unit.application].append(unit)
+            if unit.workload_status == 'error':
+                self.errored_units.append(unit)
+            machine = machines.get((unit.data or {}).get('machine-id'))
+            if machine and machine.status in MACHINE_ERRORS:
+                self.errored_machines.append(machine)
+
+    def check_for_hard_errors(self):
+        """Check the snapshot for any hard errors.
+
+        :raises: Union[UnitError, MachineError]
+        """
+        if self.errored_units:
+            raise UnitError(self.errored_units)
+        if self.errored_machines:
+            raise MachineError(self.errored_machines)
+
+
 def check_unit_workload_status(model, unit, states):
     """Check that the units workload status matches the supplied state.
 
@@ -1484,6 +2708,28 @@ def check_unit_workload_status_message(model,
     :rtype: bool
     """
     check_model_for_hard_errors(model)
+    return workload_status_message_matches(
+        unit, message=message, prefixes=prefixes, regex=regex)
+
+
+def workload_status_message_matches(unit, message=None, prefixes=None,
+                                    regex=None):
+    """Check the units workload status message, without checking the model.
+
+    See check_unit_workload_status_message() for the matching rules.
+
+    :param unit: Unit to check wl status of
+    :type unit: juju.Unit
+    :param message: Expected message text
+    :type message: Optiona[str]
+    :param prefixes: Prefixes to match message against
+    :type prefixes: Optional[List[str]]
+    :param regex: A regular expression against which to test the message
+    :type regex: Optional[str]
+    :raises: ValueError
+    :returns: Whether message matches desired string
+    :rtype: bool
+    """
     if message is not None:
         return unit.workload_status_message == message
     elif regex is not None:
@@ -1529,7 +2775,8 @@ async def async_wait_for_agent_status(model_name=None, status='executing',
     await block_until_auto_reconnect_model(
         lambda: one_agent_status(model, status),
         model=model,
-        timeout=timeout)
+        timeout=timeout,
+        entities=[('unit', None)])
 
 wait_for_agent_status = sync_wrapper(async_wait_for_agent_status)
 
@@ -1566,6 +2813,161 @@ def is_unit_errored_from_install_hook(unit):
         unit.workload_status_message == 'hook failed: "install"'
 
 
+class ApplicationStateMatcher:
+    """The compiled form of one application's entry in the target states.
+
+    See async_wait_for_application_states() for the keys of the entry.  The
+    approved workload statuses, the message prefixes, the message regex and
+    the expected number of units are worked out (and the regex compiled) once,
+    rather than on every check of every unit.
+    """
+
+    APPROVED_STATUSES = ('active', )
+    APPROVED_MESSAGE_PREFIXES = ('ready', 'Ready', 'Unit is ready')
+
+    def __init__(self, state=None):
+        """Compile the matcher.
+
+        :param state: The application's entry in the target states.
+        :type state: Optional[Dict[str, Any]]
+        :raises: re.error if the workload-status-message-regex is invalid
+        """
+        state = state or {}
+        self.workload_statuses = list(self.APPROVED_STATUSES)
+        if state.get('workload-status') is not None:
+            self.workload_statuses.append(state['workload-status'])
+        self.uses_deprecated_message = (
+            state.get('workload-status-message') is not None)
+        # preferentially try the newer -prefix first, before falling back to
+        # the older key without a -prefix
+        message_prefix = state.get(
+            'workload-status-message-prefix',
+            state.get('workload-status-message'))
+        self.prefixes = list(self.APPROVED_MESSAGE_PREFIXES)
+        if message_prefix is not None:
+            self.prefixes.append(message_prefix)
+        self._prefixes = tuple(self.prefixes)
+        self.regex = None
+        if state.get('workload-status-message-regex') is not None:
+            self.regex = re.compile(state['workload-status-message-regex'])
+        self.num_expected_units = state.get('num-expected-units')
+
+    def unit_count_matches(self, units):
+        """Check that the application has the expected number of units.
+
+        With no 'num-expected-units', at least one unit is expected.
+
+        :param units: The units of the application
+        :type units: List[juju.Unit]
+        :returns: Whether the number of units matches
+        :rtype: bool
+        """
+        if self.num_expected_units is not None:
+            return len(units) == self.num_expected_units
+        return len(units) > 0
+
+    def workload_status_matches(self, unit):
+        """Check the unit's workload status.
+
+        :param unit: Unit to check
+        :type unit: juju.Unit
+        :returns: Whether the workload status is one of the approved ones
+        :rtype: bool
+        """
+        return unit.workload_status in self.workload_statuses
+
+    def workload_status_message_matches(self, unit):
+        """Check the unit's workload status message.
+
+        As for workload_status_message_matches(), the regex is preferred to
+        the prefixes.
+
+        :param unit: Unit to check
+        :type unit: juju.Unit
+        :returns: Whether the workload status message matches
+        :rtype: bool
+        """
+        if self.regex is not None:
+            return self.regex.search(unit.workload_status_message) is not None
+        return unit.workload_status_message.startswith(self._prefixes)
+
+    @property
+    def approved_messages(self):
+        """Describe the workload status messages that match.
+
+        :returns: The regex pattern, if there is one, otherwise the prefixes
+        :rtype: Union[str, List[str]]
+        """
+        if self.regex is not None:
+            return self.regex.pattern
+        return self.prefixes
+
+
+class ApplicationStates:
+    """The compiled form of a target states dictionary.
+
+    Use compile_application_states() to get one, so that the same states
+    (e.g. the target_deploy_status from tests.yaml) aren't compiled again for
+    every wait.
+    """
+
+    def __init__(self, states=None):
+        """Compile the matchers for each application.
+
+        :param states: States to look for, as for
+                       async_wait_for_application_states()
+        :type states: Optional[Dict[str, Dict[str, Any]]]
+        """
+        self.states = states or {}
+        self.default = ApplicationStateMatcher()
+        self.matchers = {
+            application: ApplicationStateMatcher(state)
+            for application, state in self.states.items()}
+
+    def get(self, application):
+        """Return the matcher for an application.
+
+        :param application: Name of the application
+        :type application: str
+        :returns: The application's matcher, or the default matcher if the
+                  application has no entry in the states.
+        :rtype: ApplicationStateMatcher
+        """
+        return self.matchers.get(application, self.default)
+
+
+# A map of the (serialised) target states <-> their ApplicationStates.  Only
+# the APPLICATION_STATES_MEMO_SIZE most recently used are kept.
+APPLICATION_STATES_MEMO_SIZE = 32
+_APPLICATION_STATES = collections.OrderedDict()
+
+
+def compile_application_states(states=None):
+    """Return the ApplicationStates for states, compiling them if not recent.
+
+    :param states: States to look for, as for
+                   async_wait_for_application_states().  If already an
+                   ApplicationStates, then it is returned as is.
+    :type states: Optional[Union[Dict[str, Dict[str, Any]],
+                                 ApplicationStates]]
+    :returns: The compiled states
+    :rtype: ApplicationStates
+    """
+    if isinstance(states, ApplicationStates):
+        return states
+    key = json.dumps(states or {}, sort_keys=True, default=str)
+    try:
+        _APPLICATION_STATES.move_to_end(key)
+        return _APPLICATION_STATES[key]
+    except KeyError:
+        pass
+    compiled = ApplicationStates(states)
+    _APPLICATION_STATES[key] = compiled
+    while len(_APPLICATION_STATES) > APPLICATION_STATES_MEMO_SIZE:
+        _APPLICATION_STATES.popitem(last=False)
+    return compiled
+
+
 async def async_wait_for_application_states(model_name=None, states=None,
                                             timeout=2700, max_resolve_count=0,
                                             ignore_hard_errors=False):
@@ -1613,10 +3015,13 @@ async def async_wait_for_application_states(model_name=None, states=None,
     the application should be passed in the :param:states parameter with a
     'num-expected-units' of 0 for the app in question.
 
+    The states are compiled with compile_application_states(), which
+    may also be used to compile them ahead of time.
+
     :param model_name: Name of model to query.
     :type model_name: str
     :param states: States to look for
-    :type states: dict
+    :type states: Union[dict, ApplicationStates]
     :param timeout: Time to wait for status to be achieved
     :type timeout: int
     :param max_resolve_count: Maximum number of times a unit can be resolved
@@ -1633,36 +3038,30 @@ async def async_wait_for_application_states(model_name=None, states=None,
     # websockets.exceptions.ConnectionClosed if it detects that the connection
     # is closed.  What we want to do then, is re-open the connection, and try
     # again, hence this function uses block_until_auto_reconnect_model
-    approved_message_prefixes = ['ready', 'Ready', 'Unit is ready']
-    approved_statuses = ['active']
-
-    if not states:
-        states = {}
+    matchers = compile_application_states(states)
     model = await get_model(model_name)
-    if not ignore_hard_errors:
-        check_model_for_hard_errors(model)
     logging.info("Waiting for an application to be present")
     await block_until_auto_reconnect_model(
         lambda: len(model.units) > 0,
-        model=model)
+        model=model,
+        entities=[('unit', None)])
 
     timeout_msg = (
         "Timed out waiting for '{unit_name}'. The {gate_attr} "
         "is '{unit_state}' which is not one of '{approved_states}'")
-    # Loop checking status every few seconds, waiting on applications to
-    # reach the approved states.  `applications_left` are the applications
-    # still to check.  If the timeout is exceeded we fail.  Note that there
-    # are other async futures in libjuju that make progress when this
-    # future sleeps.  We also need to check if the model has disconnected,
-    # and if so, clean up and reconnect.
+    unit_count_msg = (
+        "Timed out waiting for '{application}'. Expected {expected} "
+        "unit(s) but found {found}")
+    # Loop checking status, waiting on applications to reach the approved
+    # states.  `applications_left` are the applications still to check.  If
+    # the timeout is exceeded we fail.  We also need to check if the model has
+    # disconnected, and if so, clean up and reconnect.
     start = time.time()
     applications_left = set(model.applications.keys())
 
     # print deprecation notices for apps that use "workload-status-message"
     for application in applications_left:
-        if (states
-                .get(application, {})
-                .get('workload-status-message', None) is not None):
+        if matchers.get(application).uses_deprecated_message:
             logging.warning(
                 "DEPRECATION: Application %s uses "
                 "'workload-status-message'; please use "
@@ -1675,149 +3074,150 @@ async def async_wait_for_application_states(model_name=None, states=None,
     # then this will fail hard.
     resolve_counts = collections.defaultdict(int)
     last_report = time.time()
-    while True:
-        # now we sleep to allow progress to be made in the libjuju futures
-        await asyncio.sleep(0.5)
-
-        await ensure_model_connected(model)
-        timed_out = int(time.time() - start) > timeout
-        issues = []
-        for application in applications_left.copy():
-            check_info = states.get(application, {})
-            app_data = model.applications.get(application, None)
-            units = list(app_data.units)
-
-            # if there are no units then the application may not be ready.
-            # However, if the caller explicitly allows that situation then
-            # we gate on that.
-            num_expected = check_info.get('num-expected-units', None)
-            if num_expected is not None:
-                if len(units) != num_expected:
-                    continue
-            else:
-                # num_expected is None, so 0 units means we are still
-                # waiting
-                if len(units) == 0:
+    # Re-check whenever libjuju delivers a change to a unit, application or
+    # machine (or every WAITER_FALLBACK_PERIOD seconds if nothing changes).
+    # Note that other async futures in libjuju make progress while waiting.
+    with subscribe_model_changes(model, [('unit', None),
+                                         ('application', None),
+                                         ('machine', None)]) as changes:
+        while True:
+            await ensure_model_connected(model)
+            timed_out = int(time.time() - start) > timeout
+            issues = []
+            # Index the units, and find the hard errors, once for this check
+            # rather than for every unit.
+            snapshot = ModelSnapshot(model)
+            for application in applications_left.copy():
+                matcher = matchers.get(application)
+                units = snapshot.units.get(application, [])
+
+                # if there are no units then the application may not be ready.
+                # However, if the caller explicitly allows that situation then
+                # the matcher gates on that.
+                if not matcher.unit_count_matches(units):
+                    if timed_out:
+                        issues.append(
+                            unit_count_msg.format(
+                                application=application,
+                                expected=(
+                                    matcher.num_expected_units
+                                    if matcher.num_expected_units is not None
+                                    else 'at least 1'),
+                                found=len(units)))
                     continue
 
-            # all_okay is a Boolean of the current state.  It starts as
-            # True, but if False by the end of the checks, then the
-            # application is not ready.
-            all_okay = True
-            check_wl_statuses = approved_statuses.copy()
-            app_wls = check_info.get('workload-status', None)
-            if app_wls is not None:
-                check_wl_statuses.append(app_wls)
-            # preferentially try the newer -prefix first, before
-            # falling back to the older key without a -prefix
-            check_msg = check_info.get(
-                'workload-status-message-prefix',
-                check_info.get('workload-status-message', None))
-            check_regex = check_info.get(
-                'workload-status-message-regex', None)
-            prefixes = approved_message_prefixes.copy()
-            if check_msg is not None:
-                prefixes.append(check_msg)
-
-            # check all the units; any not in status, we continue
-            for unit in units:
-                # if a unit isn't idle, then not ready yet.
-                ok = is_unit_idle(unit)
-                all_okay = all_okay and ok
-                if not ok and timed_out:
-                    issues.append(
-                        timeout_msg.format(
-                            unit_name=unit.entity_id,
-                            gate_attr="unit status",
-                            unit_state="not idle",
-                            approved_states=["idle"]))
-                    continue
+                # all_okay is a Boolean of the current state.  It starts as
+                # True, but if False by the end of the checks, then the
+                # application is not ready.
+                all_okay = True
 
-                try:
-                    ok = check_unit_workload_status(
-                        model, unit, check_wl_statuses)
+                # check all the units; any not in status, we continue
+                for unit in units:
+                    # if a unit isn't idle, then not ready yet.
+                    ok = is_unit_idle(unit)
                     all_okay = all_okay and ok
                     if not ok and timed_out:
                         issues.append(
                             timeout_msg.format(
                                 unit_name=unit.entity_id,
-                                gate_attr='workload status',
-                                unit_state=unit.workload_status,
-                                approved_states=check_wl_statuses))
-                    ok = check_unit_workload_status_message(
-                        model, unit, prefixes=prefixes, regex=check_regex)
-                    all_okay = all_okay and ok
-                    if not ok and timed_out:
-                        issues.append(
-                            timeout_msg.format(
-                                unit_name=unit.entity_id,
-                                gate_attr='workload status message',
-                                unit_state=unit.workload_status_message,
-                                approved_states=prefixes))
-                except UnitError as e:
-                    # Check to see if this error is "resolvable" and try
-                    # again.
-                    # Note: since the UnitError can be raised for any unit
-                    # in any of the calls to the check_unit_* invocations
-                    # (which in turn call check_model_for_hard_errors),
-                    # we need to check all the units captured in the
-                    # UnitError as the current unit may not be the one in
-                    # error
-                    if ignore_hard_errors:
-                        logging.warning(
-                            "Units {} in error state. ".format(e.units))
-                        all_okay = False
-                    else:
-                        for u in e.units:
-                            if not is_unit_errored_from_install_hook(u):
-                                raise
-
-                            resolve_counts[u.name] += 1
-                            if resolve_counts[u.name] > max_resolve_count:
-                                raise
-
-                            logging.warning("Unit %s is in error state. "
-                                            "Attempt number %d to resolve" %
-                                            (u.name, resolve_counts[u.name]))
-                            await async_resolve_units(
-                                application_name=unit.application,
-                                erred_hook='install'
-                            )
-                            # wait until the unit is executing. 60 seconds
-                            # seems like a reasonable timeout
-                            await async_block_until_unit_wl_status(
-                                u.name, 'error', model_name, negate_match=True,
-                                timeout=60
-                            )
-
-                        all_okay = False
-
-            # if not all states are okay, continue to the next one.
-            if not all_okay:
-                continue
+                                gate_attr="unit status",
+                                unit_state="not idle",
+                                approved_states=["idle"]))
+                        continue
+
+                    try:
+                        snapshot.check_for_hard_errors()
+                        ok = matcher.workload_status_matches(unit)
+                        all_okay = all_okay and ok
+                        if not ok and timed_out:
+                            issues.append(
+                                timeout_msg.format(
+                                    unit_name=unit.entity_id,
+                                    gate_attr='workload status',
+                                    unit_state=unit.workload_status,
+                                    approved_states=matcher.workload_statuses))
+                        ok = matcher.workload_status_message_matches(unit)
+                        all_okay = all_okay and ok
+                        if not ok and timed_out:
+                            issues.append(
+                                timeout_msg.format(
+                                    unit_name=unit.entity_id,
+                                    gate_attr='workload status message',
+                                    unit_state=unit.workload_status_message,
+                                    approved_states=(
+                                        matcher.approved_messages)))
+                    except UnitError as e:
+                        # Check to see if this error is "resolvable" and try
+                        # again.
+                        # Note: the UnitError is raised for any unit in the
+                        # model that is in error, so we need to check all the
+                        # units captured in the UnitError as the current unit
+                        # may not be the one in error
+                        if ignore_hard_errors:
+                            logging.warning(
+                                "Units {} in error state. ".format(e.units))
+                            all_okay = False
+                        else:
+                            for u in e.units:
+                                if not is_unit_errored_from_install_hook(u):
+                                    raise
+
+                                resolve_counts[u.name] += 1
+                                if resolve_counts[u.name] > max_resolve_count:
+                                    raise
+
+                                logging.warning(
+                                    "Unit %s is in error state. "
+                                    "Attempt number %d to resolve" %
+                                    (u.name, resolve_counts[u.name]))
+                                await async_resolve_units(
+                                    application_name=unit.application,
+                                    erred_hook='install'
+                                )
+                                # wait until the unit is executing. 60 seconds
+                                # seems like a reasonable timeout
+                                await async_block_until_unit_wl_status(
+                                    u.name, 'error', model_name,
+                                    negate_match=True, timeout=60
+                                )
+
+                            # the units have changed, so the hard errors
+                            # need finding again.
+                            snapshot = ModelSnapshot(model)
+                            all_okay = False
+
+                # if not all states are okay, continue to the next one.
+                if not all_okay:
+                    continue
 
-            applications_left.remove(application)
-            logging.info("Application %s is ready.", application)
+                applications_left.remove(application)
+                logging.info("Application %s is ready.", application)
 
-        delta_last_report = time.time() - last_report
-        if applications_left and delta_last_report > APPS_LEFT_INTERVAL:
-            last_report = time.time()
-            logging.info("Applications left: %s", ", ".join(applications_left))
+            delta_last_report = time.time() - last_report
+            if applications_left and delta_last_report > APPS_LEFT_INTERVAL:
+                last_report = time.time()
+                logging.info("Applications left: %s",
+                             ", ".join(applications_left))
 
-        if not applications_left:
-            logging.info("All applications reached approved status, "
-                         "number of units (where relevant), and workload"
-                         " status message checks.")
-            return
+            if not applications_left:
+                logging.info("All applications reached approved status, "
+                             "number of units (where relevant), and workload"
+                             " status message checks.")
+                return
+
+            # check if we've timed-out, if so record the problem charms to the
+            # log and raise a ModelTimeout
+            if timed_out:
+                logging.info("TIMEOUT: Workloads didn't reach acceptable "
+                             "status:")
+                for issue in issues:
+                    logging.info(issue)
+                raise ModelTimeout("Work state not achieved within timeout.")
 
-        # check if we've timed-out, if so record the problem charms to the
-        # log and raise a ModelTimeout
-        if timed_out:
-            logging.info("TIMEOUT: Workloads didn't reach acceptable "
-                         "status:")
-            for issue in issues:
-                logging.info(issue)
-            raise ModelTimeout("Work state not achieved within timeout.")
+            # don't sleep past the timeout (checked in whole seconds above)
+            # waiting for a change that doesn't come.
+            remaining = int(timeout) + 1 - (time.time() - start)
+            await changes.wait(min(WAITER_FALLBACK_PERIOD, max(remaining, 0)))
 
 
 wait_for_application_states = sync_wrapper(async_wait_for_application_states)
@@ -1844,7 +3244,8 @@ async def async_block_until_all_units_idle(model_name=None, timeout=2700,
         lambda: units_with_wl_status_state(
             model, 'error') or model.all_units_idle(),
         model=model,
-        timeout=timeout)
+        timeout=timeout,
+        entities=[('unit', None)])
     errored_units = units_with_wl_status_state(model, 'error')
     if errored_units:
         if ignore_hard_errors:
@@ -1873,12 +3274,16 @@ async def async_block_until_unit_count(application, target_count,
     :type timeout: float
     """
     async def _check_unit():
-        model_status = await async_get_status(model_name)
+        model_status = await async_get_watched_status(model_name)
         unit_count = len(model_status.applications[application]['units'])
         return unit_count == target_count
 
     assert target_count == int(target_count), "target_count not an int"
-    await async_block_until(_check_unit, timeout=timeout)
+    await async_block_until(
+        _check_unit,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('application', application), ('unit', None)])
 
 block_until_unit_count = sync_wrapper(async_block_until_unit_count)
 
@@ -1901,11 +3306,15 @@ async def async_block_until_charm_url(application, target_url,
     :type timeout: float
     """
     async def _check_charm_url():
-        model_status = await async_get_status(model_name)
+        model_status = await async_get_watched_status(model_name)
         charm_url = model_status.applications[application]['charm']
         return charm_url == target_url
 
-    await async_block_until(_check_charm_url, timeout=timeout)
+    await async_block_until(
+        _check_charm_url,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('application', application)])
 
 
 block_until_charm_url = sync_wrapper(async_block_until_charm_url)
@@ -2030,7 +3439,8 @@ async def async_get_current_model():
 get_current_model = sync_wrapper(async_get_current_model)
 
 
-async def async_block_until(*conditions, timeout=None, wait_period=0.5):
+async def async_block_until(*conditions, timeout=None, wait_period=None,
+                            model_name=None, entities=None):
     """Return only after all async conditions are true.
 
     Based on juju.utils.block_until which currently does not support
@@ -2040,19 +3450,34 @@ async def async_block_until(*conditions, timeout=None, wait_period=0.5):
     :type conditions: functions
     :param timeout: Timeout in seconds
     :type timeout: float
-    :param wait_period: Time to wait between re-assessing conditions.
-    :type wait_period: float
+    :param wait_period: Time to wait between re-assessing conditions.  If
+        entities are passed, this is the fallback poll period.  Defaults to
+        0.5 seconds, or WAITER_FALLBACK_PERIOD if entities are passed.
+    :type wait_period: Optional[float]
+    :param model_name: Name of the model that entities are in.
+    :type model_name: str
+    :param entities: if passed, only re-assess the conditions when libjuju
+        delivers a delta for one of these entities (or every wait_period);
+        see ModelChangeSubscription.
+    :type entities: Optional[List[Tuple[str, Optional[str]]]]
     """
+    model = None
+    if entities:
+        model = await get_model(model_name)
+    if wait_period is None:
+        wait_period = WAITER_FALLBACK_PERIOD if entities else 0.5
+
     async def _block():
-        while True:
-            evaluated = []
-            for c in conditions:
-                result = await c()
-                evaluated.append(result)
-            if all(evaluated):
-                return
-            else:
-                await asyncio.sleep(wait_period)
+        with subscribe_model_changes(model, entities) as changes:
+            while True:
+                evaluated = []
+                for c in conditions:
+                    result = await c()
+                    evaluated.append(result)
+                if all(evaluated):
+                    return
+                else:
+                    await changes.wait(wait_period)
     await asyncio.wait_for(_block(), timeout)
 
 
@@ -2113,28 +3538,78 @@ async def async_block_until_machine_status_is(
     :type refresh: bool
     """
     async def _check_machine_status():
-        _status = await async_get_status(model_name=model_name,
-                                         interval=interval,
-                                         refresh=refresh)
+        _status = await async_get_watched_status(model_name=model_name,
+                                                 interval=interval,
+                                                 refresh=refresh)
         equals = _status["machines"][machine].agent_status["status"] == status
         return not equals if invert_check else equals
 
-    await async_block_until(_check_machine_status, timeout=timeout)
+    await async_block_until(
+        _check_machine_status,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('machine', machine)])
 
 
 block_until_machine_status_is = sync_wrapper(
     async_block_until_machine_status_is)
 
 
+# How long, in seconds, async_block_until_file_ready() waits before probing
+# the units that haven't converged again.  The wait doubles after each probe
+# that makes no progress, up to FILE_PROBE_MAX_INTERVAL, and drops back to
+# FILE_PROBE_INTERVAL whenever another unit converges.
+FILE_PROBE_INTERVAL = 0.5
+FILE_PROBE_MAX_INTERVAL = 8.0
+
+# Whether async_block_until_file_ready() (and the functions built on it)
+# probe a file's checksum first and only fetch the file when the checksum has
+# changed since the last probe, by default.
+FILE_PROBE_HASH = False
+
+
+def _check_unit_run_outcomes(outcomes):
+    """Drop the units whose run hit a JujuError from the outcomes.
+
+    libjuju throws a generic error for connection failure. So we cannot
+    differentiate between a connectivity issue and a target file not existing
+    error. For now just assume the latter, and the unit is left to be probed
+    again.  Any other error is raised.
+
+    :param outcomes: map of unit name to the outcome of the run on that unit
+    :type outcomes: Dict[str, UnitRunResult]
+    :returns: map of unit name to the Stdout of the run on that unit
+    :rtype: Dict[str, str]
+    :raises: Exception
+    """
+    stdouts = {}
+    for unit_name, outcome in outcomes.items():
+        if isinstance(outcome.error, JujuError):
+            continue
+        elif outcome.error is not None:
+            raise outcome.error
+        stdouts[unit_name] = outcome.results.get('Stdout', '')
+    return stdouts
+
+
 async def async_block_until_file_ready(application_name, remote_file,
                                        check_function, model_name=None,
-                                       timeout=2700):
+                                       timeout=2700, probe_hash=None):
     """Block until the check_function passes against.
 
     Block until the check_function passes against the provided file. It is
     unlikely that a test would call this function directly, rather it is
     provided as scaffolding for tests with a more specialised purpose.
 
+    The units are probed concurrently.  Once a unit's file passes the
+    check_function the unit is not probed again; only the outstanding units
+    are re-probed, backing off between probes (see FILE_PROBE_INTERVAL).
+
+    If probe_hash is set then each probe only fetches the sha256sum of the
+    file; the file itself is fetched, and the check_function run against it,
+    only when the checksum differs from the one seen on the previous probe of
+    that unit.  This saves shipping a large file back on every probe.
+
     :param model_name: Name of model to query.
     :type model_name: str
     :param application_name: Name of application
@@ -2146,36 +3621,60 @@ async def async_block_until_file_ready(application_name, remote_file,
     :type check_function: function
     :param timeout: Time to wait for contents to appear in file
     :type timeout: float
+    :param probe_hash: Whether to probe the file's checksum before fetching
+                       it, defaults to FILE_PROBE_HASH
+    :type probe_hash: Optional[bool]
     """
     model = await get_model(model_name)
+    if probe_hash is None:
+        probe_hash = FILE_PROBE_HASH
+    command = 'cat {}'.format(remote_file)
+    hash_command = 'sha256sum {}'.format(remote_file)
+    # The units whose file has passed the check_function; they aren't probed
+    # again.
+    converged = set()
+    # The checksum of each unit's file when it was last fetched.
+    last_hashes = {}
 
     async def _check_file():
-        units = model.applications[application_name].units
-        for unit in units:
-            try:
-                output = await generic_utils.unit_run(
-                    unit, 'cat {}'.format(remote_file))
-                results = {}
-                try:
-                    results = output.results
-                except (AttributeError, KeyError):
-                    results = output.data.get('results', {})
-                contents = results.get('Stdout', results.get('stdout', ''))
-                if inspect.iscoroutinefunction(check_function):
-                    if not await check_function(contents):
-                        return False
-                elif not check_function(contents):
-                    return False
-            # libjuju throws a generic error for connection failure. So we
-            # cannot differentiate between a connectivity issue and a
-            # target file not existing error. For now just assume the
-            # latter.
-            except JujuError:
-                return False
-        else:
-            return True
+        unit_names = [
+            unit.entity_id
+            for unit in model.applications[application_name].units
+            if unit.entity_id not in converged]
+        fetch = unit_names
+        if probe_hash:
+            hashes = _check_unit_run_outcomes(await async_run_on_units(
+                unit_names, hash_command, model_name=model_name))
+            fetch = [
+                unit_name for unit_name, file_hash in hashes.items()
+                if last_hashes.get(unit_name) != file_hash]
+        contents = _check_unit_run_outcomes(await async_run_on_units(
+            fetch, command, model_name=model_name))
+        progressed = False
+        for unit_name, unit_contents in contents.items():
+            if probe_hash:
+                last_hashes[unit_name] = hashes[unit_name]
+            if inspect.iscoroutinefunction(check_function):
+                ok = await check_function(unit_contents)
+            else:
+                ok = check_function(unit_contents)
+            if ok:
+                converged.add(unit_name)
+                progressed = True
+        return converged.issuperset(unit_names), progressed
+
+    async def _block():
+        interval = FILE_PROBE_INTERVAL
+        while True:
+            done, progressed = await _check_file()
+            if done:
+                return
+            if progressed:
+                interval = FILE_PROBE_INTERVAL
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, FILE_PROBE_MAX_INTERVAL)
 
-    await async_block_until(_check_file, timeout=timeout)
+    await asyncio.wait_for(_block(), timeout)
 
 
 block_until_file_ready = sync_wrapper(async_block_until_file_ready)
@@ -2183,7 +3682,8 @@ block_until_file_ready = sync_wrapper(async_block_until_file_ready)
 
 async def async_block_until_file_has_contents(application_name, remote_file,
                                               expected_contents,
-                                              model_name=None, timeout=2700):
+                                              model_name=None, timeout=2700,
+                                              probe_hash=None):
     """Block until the expected_contents are present on all units.
 
     Block until the given string (expected_contents) is present in the file
@@ -2208,6 +3708,9 @@ async def async_block_until_file_has_contents(application_name, remote_file,
     :type model_name: str
     :param timeout: Time to wait for contents to appear in file
     :type timeout: float
+    :param probe_hash: Whether to probe the file's checksum before fetching
+                       it, see async_block_until_file_ready()
+    :type probe_hash: Optional[bool]
     """
     def f(x):
         return expected_contents in x
@@ -2216,7 +3719,8 @@ async def async_block_until_file_has_contents(application_name, remote_file,
         remote_file,
         f,
         timeout=timeout,
-        model_name=model_name)
+        model_name=model_name,
+        probe_hash=probe_hash)
 
 block_until_file_has_contents = sync_wrapper(
     async_block_until_file_has_contents)
@@ -2229,6 +3733,7 @@ async def async_block_until_file_matches_re(
     re_flags=re.MULTILINE,
     model_name=None,
     timeout=2700,
+    probe_hash=None,
 ):
     """Block until a file matches a pattern.
 
@@ -2247,6 +3752,9 @@ async def async_block_until_file_matches_re(
     :type re_flags: re.RegexFlag (int flag constants from the re module)
     :param timeout: Time to wait for contents to appear in file
     :type timeout: float
+    :param probe_hash: Whether to probe the file's checksum before fetching
+                       it, see async_block_until_file_ready()
+    :type probe_hash: Optional[bool]
     """
     if isinstance(pattern, str):
         pattern = re.compile(pattern, flags=re_flags)
@@ -2259,19 +3767,68 @@ async def async_block_until_file_matches_re(
         remote_file,
         f,
         timeout=timeout,
-        model_name=model_name
+        model_name=model_name,
+        probe_hash=probe_hash,
     )
 
 
 block_until_file_matches_re = sync_wrapper(async_block_until_file_matches_re)
 
 
+def _as_list(items):
+    """Return items as a list, if it is a collection, else a list of items.
+
+    Anything but a list, tuple or set (e.g. a str, an int machine id or a
+    pathlib.Path) is a single item.
+
+    :param items: the item(s)
+    :type items: Union[Any, List[Any], Tuple[Any], Set[Any]]
+    :returns: the items
+    :rtype: List[Any]
+    """
+    if isinstance(items, (list, tuple, set)):
+        return list(items)
+    return [items]
+
+
+def _files_missing_command(paths):
+    """Return the command that tests whether each of the paths exists.
+
+    The command prints, for each of the paths in order, 0 if the path exists
+    and 1 if it doesn't.
+
+    :param paths: The file names to check for.
+    :type paths: List[str]
+    :returns: The command
+    :rtype: str
+    """
+    return '; '.join('test -e "{}"; echo $?'.format(path) for path in paths)
+
+
+def _files_missing(paths, stdout):
+    """Return whether the output of _files_missing_command says all are gone.
+
+    :param paths: The file names that were checked for.
+    :type paths: List[str]
+    :param stdout: The output of the _files_missing_command(paths) command
+    :type stdout: str
+    :returns: True if none of the paths exist
+    :rtype: bool
+    """
+    return stdout.split() == ['1'] * len(paths)
+
+
 async def async_block_until_file_missing(
         app, path, model_name=None, timeout=2700):
     """Block until the file at path is not there.
 
     Block until the file at the param 'path' is not present on the file system
-    for all units on a given application.
+    for all units on a given application.  'path' may also be a list of file
+    names, in which case block until none of them are present.
+
+    Each poll runs a single command on each of the units, concurrently, that
+    tests all of the paths.  A unit where all of the paths are gone isn't
+    polled again.
 
     An example accessing this function via its sync wrapper::
 
@@ -2282,32 +3839,29 @@ async def async_block_until_file_missing(
 
     :param app: the application name
     :type app: str
-    :param path: the file name to check for.
-    :type path: str
+    :param path: the file name(s) to check for.
+    :type path: Union[str, List[str]]
     :param model_name: Name of model to query.
     :type model_name: str
     :param timeout: Time to wait for contents to appear in file
     :type timeout: float
     """
+    paths = _as_list(path)
+    command = _files_missing_command(paths)
+    # The units where all of the paths are gone; they aren't polled again.
+    missing = set()
+
     async def _check_for_file(model):
-        units = model.applications[app].units
-        results = []
-        for unit in units:
-            try:
-                output = await generic_utils.unit_run(
-                    unit, 'test -e "{}"; echo $?'.format(path))
-                output = _normalise_action_object(output)
-                output_result = _normalise_action_results(
-                    output.data.get('results', {}))
-                contents = output_result.get('Stdout', '')
-                results.append("1" in contents)
-            # libjuju throws a generic error for connection failure. So we
-            # cannot differentiate between a connectivity issue and a
-            # target file not existing error. For now just assume the
-            # latter.
-            except JujuError:
-                results.append(False)
-        return all(results)
+        unit_names = [
+            unit.entity_id
+            for unit in model.applications[app].units
+            if unit.entity_id not in missing]
+        outputs = _check_unit_run_outcomes(await async_run_on_units(
+            unit_names, command, model_name=model_name))
+        for unit_name, output in outputs.items():
+            if _files_missing(paths, output):
+                missing.add(unit_name)
+        return missing.issuperset(unit_names)
 
     model = await get_model(model_name)
     await async_block_until(lambda: _check_for_file(model),
@@ -2321,6 +3875,12 @@ async def async_block_until_file_missing_on_machine(
         machine, path, model_name=None, timeout=2700):
     """Block until the file at 'path' is not present for a machine.
 
+    'machine' may also be a list of machines and 'path' a list of file names,
+    in which case block until none of the paths are present on any of the
+    machines.  Each poll runs a single command on each of the machines,
+    concurrently, that tests all of the paths.  A machine where all of the
+    paths are gone isn't polled again.
+
     An example accessing this function via its sync wrapper::
 
         block_until_file_missing_on_machine(
@@ -2328,29 +3888,39 @@ async def async_block_until_file_missing_on_machine(
             '/some/path/name')
 
 
-    :param machine: the machine
-    :type machine: str
-    :param path: the file name to check for.
-    :type path: str
+    :param machine: the machine(s)
+    :type machine: Union[str, List[str]]
+    :param path: the file name(s) to check for.
+    :type path: Union[str, List[str]]
     :param model_name: Name of model to query.
     :type model_name: str
     :param timeout: Time to wait for until file is missing on a machine.
     :type timeout: float
     """
-    async def _check_for_file(model):
+    machines = _as_list(machine)
+    paths = _as_list(path)
+    command = _files_missing_command(paths)
+    # The machines where all of the paths are gone; they aren't polled again.
+    missing = set()
+
+    async def _check_machine(machine):
         try:
             output = await async_run_on_machine(
-                machine, 'test -e "{}"; echo $?'.format(path),
-                model_name)
-            contents = output.get('Stdout', "")
-            return "1" in contents
+                machine, command, model_name)
+            if _files_missing(paths, output.get('Stdout', "")):
+                missing.add(machine)
         # libjuju throws a generic error for connection failure. So we
         # cannot differentiate between a connectivity issue and a
         # target file not existing error. For now just assume the
         # latter.
         except JujuError:
             pass
-        return False
+
+    async def _check_for_file(model):
+        await asyncio.gather(*(
+            _check_machine(machine)
+            for machine in machines if machine not in missing))
+        return missing.issuperset(machines)
 
     model = await get_model(model_name)
     await async_block_until(lambda: _check_for_file(model), timeout=timeout)
@@ -2372,7 +3942,7 @@ async def async_block_until_units_on_machine_are_idle(
     :type timeout: float
     """
     async def _ready():
-        _status = await async_get_status(model_name)
+        _status = await async_get_watched_status(model_name)
         apps = set()
         units = []
         statuses = []
@@ -2398,18 +3968,63 @@ async def async_block_until_units_on_machine_are_idle(
         # return ready if all the statuses were idle
         return all(statuses)
 
-    await async_block_until(_ready, timeout=timeout)
+    await async_block_until(
+        _ready,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('unit', None)])
 
 
 block_until_units_on_machine_are_idle = sync_wrapper(
     async_block_until_units_on_machine_are_idle)
 
 
+# Memo of the sections parsed by parse_oslo_config(), keyed by the sha256 of
+# the config file's contents.  Only the OSLO_CONFIG_MEMO_SIZE most recently
+# used are kept.
+OSLO_CONFIG_MEMO_SIZE = 64
+_OSLO_CONFIG_SECTIONS = collections.OrderedDict()
+
+
+def parse_oslo_config(contents, filename='<string>'):
+    """Parse the contents of an oslo.config style file.
+
+    The contents are parsed in memory by oslo.config's own parser, and the
+    result is memoised on the sha256 of the contents, so recently seen contents
+    aren't parsed again.  The returned dict is shared, so don't modify it.
+
+    :param contents: The contents of the config file
+    :type contents: str
+    :param filename: The name of the file, used in parse errors
+    :type filename: str
+    :returns: map of section to map of key to the list of values for the key
+              e.g. {'DEFAULT': {'debug': ['False']}}
+    :rtype: Dict[str, Dict[str, List[str]]]
+    :raises: oslo_config.iniparser.ParseError
+    """
+    key = hashlib.sha256(contents.encode()).hexdigest()
+    try:
+        _OSLO_CONFIG_SECTIONS.move_to_end(key)
+        return _OSLO_CONFIG_SECTIONS[key]
+    except KeyError:
+        pass
+    sections = {}
+    parser = cfg.ConfigParser(filename, sections)
+    # ConfigParser.parse() reads the lines from filename; the base parser
+    # takes the lines directly.
+    iniparser.BaseParser.parse(parser, contents.splitlines())
+    _OSLO_CONFIG_SECTIONS[key] = sections
+    while len(_OSLO_CONFIG_SECTIONS) > OSLO_CONFIG_MEMO_SIZE:
+        _OSLO_CONFIG_SECTIONS.popitem(last=False)
+    return sections
+
+
 async def async_block_until_oslo_config_entries_match(application_name,
                                                       remote_file,
                                                       expected_contents,
                                                       model_name=None,
-                                                      timeout=2700):
+                                                      timeout=2700,
+                                                      probe_hash=None):
     """Block until dict is represented in the file using oslo.config parser.
 
     Block until the expected_contents are in the given file on all units of
@@ -2448,20 +4063,17 @@ async def async_block_until_oslo_config_entries_match(application_name,
     :type model_name: str
     :param timeout: Time to wait for contents to appear in file
     :type timeout: float
+    :param probe_hash: Whether to probe the file's checksum before fetching
+                       it, see async_block_until_file_ready()
+    :type probe_hash: Optional[bool]
 
     """
     def f(x):
-        # Writing out the file that was just read is suboptimal
-        with tempfile.NamedTemporaryFile(mode='w', delete=True) as fp:
-            fp.write(x)
-            fp.seek(0)
-            sections = {}
-            parser = cfg.ConfigParser(fp.name, sections)
-            parser.parse()
-            for section, entries in expected_contents.items():
-                for key, value in entries.items():
-                    if sections.get(section, {}).get(key) != value:
-                        return False
+        sections = parse_oslo_config(x, filename=remote_file)
+        for section, entries in expected_contents.items():
+            for key, value in entries.items():
+                if sections.get(section, {}).get(key) != value:
+                    return False
         return True
 
     return await async_block_until_file_ready(
@@ -2469,7 +4081,8 @@ async def async_block_until_oslo_config_entries_match(application_name,
         remote_file,
         f,
         timeout=timeout,
-        model_name=model_name)
+        model_name=model_name,
+        probe_hash=probe_hash)
 
 
 block_until_oslo_config_entries_match = sync_wrapper(
@@ -2481,6 +4094,10 @@ async def async_block_until_services_restarted(application_name, mtime,
                                                timeout=2700, pgrep_full=False):
     """Block until the given services have a start time later then mtime.
 
+    Each poll runs a single command on each of the units, concurrently, that
+    returns the start times of all of the services.  A unit whose services
+    have all restarted isn't queried again.
+
     For example to check that the glance-api service has been restarted::
 
         block_until_services_restarted(
@@ -2503,22 +4120,30 @@ async def async_block_until_services_restarted(application_name, mtime,
                        a service.
     :type  pgrep_full: bool
     """
+    command = _service_start_times_command(services, pgrep_full)
+    # The units whose services have all restarted; they aren't queried again.
+    restarted = set()
+
     async def _check_service(model):
-        units = model.applications[application_name].units
-        for unit in units:
-            for service in services:
-                try:
-                    svc_mtime = await async_get_unit_service_start_time(
-                        unit.entity_id,
-                        service,
-                        timeout=timeout,
-                        model_name=model_name,
-                        pgrep_full=pgrep_full)
-                except ServiceNotRunning:
-                    return False
-                if svc_mtime < mtime:
-                    return False
-        return True
+        unit_names = [
+            unit.entity_id
+            for unit in model.applications[application_name].units
+            if unit.entity_id not in restarted]
+        outcomes = await async_run_on_units(
+            unit_names, command, model_name=model_name, timeout=timeout)
+        for unit_name, outcome in outcomes.items():
+            if outcome.error is not None:
+                raise outcome.error
+            try:
+                start_times = json.loads(outcome.results.get('Stdout', ''))
+            except ValueError:
+                # e.g. stray output on the unit; look again next time.
+                logging.debug("Unexpected output from {}: {!r}".format(
+                    unit_name, outcome.results.get('Stdout')))
+                continue
+            if all(t is not None and t >= mtime for t in start_times):
+                restarted.add(unit_name)
+        return restarted.issuperset(unit_names)
 
     model = await get_model(model_name)
     await async_block_until(lambda: _check_service(model), timeout=timeout)
@@ -2561,7 +4186,7 @@ async def async_block_until_unit_wl_status(unit_name, status, model_name=None,
     """
     async def _unit_status():
         app = unit_name.split("/")[0]
-        model_status = await async_get_status(model_name)
+        model_status = await async_get_watched_status(model_name)
         try:
             v = model_status.applications[app]['units'][unit_name][
                 'workload-status']['status']
@@ -2596,7 +4221,11 @@ async def async_block_until_unit_wl_status(unit_name, status, model_name=None,
         else:
             return v == status
 
-    await async_block_until(_unit_status, timeout=timeout)
+    await async_block_until(
+        _unit_status,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('unit', unit_name)])
 
 block_until_unit_wl_status = sync_wrapper(
     async_block_until_unit_wl_status)
@@ -2621,7 +4250,7 @@ async def async_block_until_wl_status_info_starts_with(
     :type timeout: float
     """
     async def _unit_status():
-        model_status = await async_get_status(model_name)
+        model_status = await async_get_watched_status(model_name)
         wl_infos = [v['workload-status']['info']
                     for k, v in model_status.applications[app]['units'].items()
                     if k.split('/')[0] == app]
@@ -2631,7 +4260,11 @@ async def async_block_until_wl_status_info_starts_with(
         else:
             return all(g)
 
-    await async_block_until(_unit_status, timeout=timeout)
+    await async_block_until(
+        _unit_status,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('unit', None)])
 
 
 block_until_wl_status_info_starts_with = sync_wrapper(
@@ -2659,7 +4292,7 @@ async def async_block_until_unit_wl_message_match(
         model_name=model_name)
 
     async def _unit_status():
-        model_status = await async_get_status(model_name)
+        model_status = await async_get_watched_status(model_name)
         app = unit.split('/')[0]
         if principle_unit:
             principle_app = principle_unit.split('/')[0]
@@ -2673,7 +4306,11 @@ async def async_block_until_unit_wl_message_match(
         else:
             return bool(re.match(status_pattern, status))
 
-    await async_block_until(_unit_status, timeout=timeout)
+    await async_block_until(
+        _unit_status,
+        timeout=timeout,
+        model_name=model_name,
+        entities=[('unit', unit)])
 
 
 block_until_unit_wl_message_match = sync_wrapper(
@@ -2689,7 +4326,7 @@ async def async_get_principle_sub_map(model_name=None):
     :returns: Name of unit
     :rtype: Dict[str, [str]]
     """
-    model_status = await async_get_status(model_name)
+    model_status = await async_get_watched_status(model_name)
     return {
         unit: list(detail['units'][unit].get('subordinates', {}).keys())
         for name, detail in model_status.applications.items()
@@ -3125,7 +4762,8 @@ async def async_wait_for_unit_idle(
     try:
         await async_block_until(
             _unit_idle(app, unit_name),
-            timeout=timeout)
+            timeout=timeout,
+            entities=[('unit', None)])
     except concurrent.futures._base.TimeoutError:
         raise ModelTimeout("Zaza has timed out waiting on {} to "
                            "reach idle state.".format(unit_name))
@@ -3144,7 +4782,7 @@ async def async_get_agent_status(app, unit_name):
     :returns: The agent status, either active / idle, returned by Juju
     :rtype: str
     """
-    return (await async_get_status()). \
+    return (await async_get_watched_status()). \
         applications[app]['units'][unit_name]['agent-status']['status']
 
 
@@ -3161,7 +4799,7 @@ async def async_check_if_subordinates_idle(app, unit_name):
     :returns: The agent status, either active / idle, returned by Juju
     :rtype: str
     """
-    status = await async_get_status()
+    status = await async_get_watched_status()
     subordinates = status.applications[app]['units'][unit_name].get(
         'subordinates', [])
     if not subordinates:
@@ -25,8 +25,9 @@ of plugin configure functions.  e.g.
       - zaza.plugins.events.configure
 
 The configure function is called with a utils.EnvironmentDeploy which has a
-'name', 'model_deploys' and 'run_in_series' attributes.  model_deploys are
-utils.ModelDeploy which have a "model_alias", 'model_name' and 'bundle'.
+'name', 'model_deploys', 'run_in_series' and 'unordered' attributes.
+model_deploys are utils.ModelDeploy which have a "model_alias", 'model_name'
+and 'bundle'.
 
 The 'configure_plugins' method here must be called AFTER config is available in
 the zaza.global_options module (currently filled by a call to
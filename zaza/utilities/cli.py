@@ -40,17 +40,26 @@ def parse_arg(options, arg, multiargs=False):
         return getattr(options, arg)
 
 
-def setup_logging(log_level='INFO'):
+def setup_logging(log_level='INFO', prefix=None):
     """Do setup for logging.
 
+    :param log_level: the level to log at.
+    :type log_level: str
+    :param prefix: Optional prefix for each log line (e.g. the bundle name
+                   when several bundles are run in parallel).
+    :type prefix: Optional[str]
     :returns: Nothing: This fucntion is executed for its sideffect
     :rtype: None
     """
     level = getattr(logging, log_level.upper(), None)
     if not isinstance(level, int):
         raise ValueError('Invalid log level: "{}"'.format(log_level))
+    fmt = "%(asctime)s [%(levelname)s] %(message)s"
+    if prefix:
+        fmt = "%(asctime)s [%(levelname)s] [{}] %(message)s".format(
+            prefix.replace('%', '%%'))
     logFormatter = logging.Formatter(
-        fmt="%(asctime)s [%(levelname)s] %(message)s",
+        fmt=fmt,
         datefmt="%Y-%m-%d %H:%M:%S")
     rootLogger = logging.getLogger()
     rootLogger.setLevel(level)
@@ -196,3 +196,9 @@ class DestroyModelFailed(Exception):
     """The controller.destroy_model() failed in some interesting way."""
 
     pass
+
+
+class EnvironmentDeploysFailed(Exception):
+    """One or more environment deploys run in worker processes failed."""
+
+    pass
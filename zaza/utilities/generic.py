@@ -15,6 +15,7 @@
 """Collection of functions that did not fit anywhere else."""
 
 import asyncio
+import collections
 import logging
 import os
 import subprocess
@@ -562,13 +563,45 @@ def get_process_id_list(unit_name, process_name,
     :returns: List of process IDs
     :raises: zaza_exceptions.ProcessIdsFailed
     """
+    cmd = _process_id_list_command(process_name, expect_success, pgrep_full)
+    results = model.run_on_unit(unit_name=unit_name, command=cmd)
+    return _process_id_list_from_results(unit_name, cmd, results)
+
+
+def _process_id_list_command(process_name, expect_success=True,
+                             pgrep_full=False):
+    """Return the command that get_process_id_list() runs on a unit.
+
+    :param process_name: Process name
+    :type process_name: str
+    :param expect_success: If False, expect the PID to be missing.
+    :type expect_success: bool
+    :param pgrep_full: Should pgrep be used rather than pidof.
+    :type  pgrep_full: bool
+    :returns: The command
+    :rtype: str
+    """
     if pgrep_full:
         cmd = 'pgrep -f "{}"'.format(process_name)
     else:
         cmd = 'pidof -x "{}"'.format(process_name)
     if not expect_success:
         cmd += " || exit 0 && exit 1"
-    results = model.run_on_unit(unit_name=unit_name, command=cmd)
+    return cmd
+
+
+def _process_id_list_from_results(unit_name, cmd, results):
+    """Return the process ID(s) from the results of the command on a unit.
+
+    :param unit_name: The unit the command was run on
+    :type unit_name: str
+    :param cmd: The command from _process_id_list_command()
+    :type cmd: str
+    :param results: The results of running the command
+    :type results: Dict[str, str]
+    :returns: List of process IDs
+    :raises: zaza_exceptions.ProcessIdsFailed
+    """
     code = results.get("Code", 1)
     try:
         code = int(code)
@@ -597,13 +630,21 @@ def get_unit_process_ids(unit_processes, expect_success=True):
         of process names to PIDs.
     :raises: zaza_exceptions.ProcessIdsFailed
     """
-    pid_dict = {}
+    pid_dict = {unit_name: {} for unit_name in unit_processes}
+    # Look up each process on all of the units that run it at once.
+    process_units = collections.defaultdict(list)
     for unit_name, process_list in unit_processes.items():
-        pid_dict[unit_name] = {}
         for process in process_list:
-            pids = get_process_id_list(
-                unit_name, process, expect_success=expect_success)
-            pid_dict[unit_name].update({process: pids})
+            process_units[process].append(unit_name)
+    for process, unit_names in process_units.items():
+        cmd = _process_id_list_command(process, expect_success=expect_success)
+        outcomes = model.run_on_units(unit_names, cmd)
+        for unit_name in unit_names:
+            outcome = outcomes[unit_name]
+            if outcome.error is not None:
+                raise outcome.error
+            pid_dict[unit_name][process] = _process_id_list_from_results(
+                unit_name, cmd, outcome.results)
     return pid_dict
 
 
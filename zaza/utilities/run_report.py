@@ -76,6 +76,15 @@ def get_copy_of_metadata():
     return copy.deepcopy(get_run_data())[ReportKeys.METADATA]
 
 
+def get_copy_of_metrics():
+    """Return a copy of the metrics recorded for this run.
+
+    :returns: Dictionary of metrics.
+    :rtype: dict
+    """
+    return copy.deepcopy(get_run_data()).get(ReportKeys.METRICS, {})
+
+
 class EnumToStrDumper(yaml.SafeDumper):
     """Convert Enums to str when dumping."""
 
@@ -91,6 +100,7 @@ class ReportKeys(enum.Enum):
 
     METADATA = 'Metadata'
     EVENTS = 'Events'
+    METRICS = 'Metrics'
     PCT_OF_RUNTIME = 'PCT Of Run Time'
     ELAPSED_TIME = 'Elapsed Time'
 
@@ -167,6 +177,18 @@ def register_metadata(cloud_name=None, model_name=None, target_bundle=None):
         run_data[ReportKeys.METADATA]['target_bundle'] = target_bundle
 
 
+def register_metric(metric_name, value):
+    """Record a metric about this run.
+
+    :param metric_name: Name of metric
+    :type metric_name: str
+    :param value: Value of the metric.
+    :type value: Any
+    """
+    run_data = get_run_data()
+    run_data.setdefault(ReportKeys.METRICS, {})[metric_name] = value
+
+
 def get_events_start_stop_time(events):
     """Return the time of the first event and the last.
 